@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化包装脚本性能基准
+在临时 npm 全局目录中注入汉化，用桩程序代替真实的 Codex 二进制文件，
+测量 codex.js 的启动时间、翻译吞吐量、每块延迟和内存占用，并与透明传递对比；
+Linux 上同时安装快速启动器，测量不经过 Node.js 的透明传递启动时间；
+另以数百 MB 的输出和间歇停顿的读取端检查背压生效、内存占用不随输出总量增长。
+不需要网络，也不需要安装真实的 Codex CLI（仅支持 Linux / macOS）
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from codex_paths import APP_DIR_NAME, TELEMETRY_FILE_NAME
+from translation_engine import TranslationTrie
+
+PROJECT_ROOT = Path(__file__).parent.parent
+INJECTOR = PROJECT_ROOT / "inject-chinese-final-dedup.js"
+DICTIONARY_PATH = PROJECT_ROOT / "codex-translations-compiled.json"
+BASELINE_PATH = Path(__file__).parent / "benchmarks" / "baseline.json"
+
+BENCH_VERSION = 1
+CODEX_VERSION = "0.40.0"
+
+# codex.js 按平台选择的二进制文件名
+TARGET_TRIPLES = {
+    ("Linux", "x86_64"): "x86_64-unknown-linux-musl",
+    ("Linux", "aarch64"): "aarch64-unknown-linux-musl",
+    ("Darwin", "x86_64"): "x86_64-apple-darwin",
+    ("Darwin", "arm64"): "aarch64-apple-darwin",
+}
+
+# 桩程序：按块输出指定的样本文件（重复 CODEX_BENCH_REPEAT 次）
+STUB_SOURCE = '''#!{python}
+import os
+import sys
+
+with open(os.environ["CODEX_BENCH_FIXTURE"], "rb") as f:
+    data = f.read()
+chunk = int(os.environ.get("CODEX_BENCH_CHUNK", "16384"))
+for _ in range(int(os.environ.get("CODEX_BENCH_REPEAT", "1"))):
+    for i in range(0, len(data), chunk):
+        os.write(1, data[i:i + chunk])
+'''
+
+# 越小越好的指标；其余（吞吐量）越大越好
+LOWER_IS_BETTER = ('startup_ms', 'seconds', 'rss_mb', 'p50', 'p99')
+
+SCENARIOS = ('help', 'logs', 'ansi')
+
+# 大输出检查：读取端每读取 STREAM_STALL_EVERY 字节停顿 STREAM_STALL_SECONDS 秒，模拟慢速终端或分页程序。
+# V8 在输出的前几十 MB 内会阶梯式扩大堆，收到 STREAM_WARMUP_MB 后内存应已稳定；
+# 之后峰值内存的增长不得超过这段输出量的 STREAM_MAX_GROWTH 倍（缓存全部输出时增长至少与输出量相当）；
+# 读取端较慢时，没有背压的实现在预热结束前就已缓存了全部输出，因此开始输出以来峰值内存的增长
+# 也不得超过输出总量的 STREAM_MAX_BUFFERED 倍。
+# 输出总量至少为预热量的两倍，结果与 --stream 的取值和垃圾回收时机无关
+STREAM_FIXTURE_MB = 1
+STREAM_STALL_EVERY = 16 * 1024 * 1024
+STREAM_STALL_SECONDS = 0.2
+STREAM_WARMUP_MB = 64
+STREAM_MAX_GROWTH = 0.25
+STREAM_MAX_BUFFERED = 0.5
+
+
+def load_phrases():
+    """读取词典中的英文短语，用于生成能命中翻译的样本"""
+    with open(DICTIONARY_PATH, 'r', encoding='utf-8') as f:
+        return [entry[0] for entry in json.load(f)['translations']]
+
+
+def generate_fixture(kind, size, rng, phrases):
+    """生成指定类型和大小（字节）的样本输出"""
+    lines = []
+    total = 0
+    n = 0
+    while total < size:
+        n += 1
+        if kind == 'help':
+            line = f"  {rng.choice(phrases)}"
+            if rng.random() < 0.3:
+                line = f"  -{chr(97 + n % 26)}, --option-{n % 97} <VALUE>  {rng.choice(phrases)}"
+        elif kind == 'logs':
+            line = (f"2025-09-25T12:{n // 60 % 60:02d}:{n % 60:02d}.{n % 1000:03d}Z INFO "
+                    f"codex_core::exec: running command id={n} cwd=/tmp/work/{n % 17} "
+                    f"status={rng.choice(('ok', 'pending', 'retry'))}")
+        else:
+            # 颜色控制序列包裹短语，部分插在短语中间
+            phrase = rng.choice(phrases)
+            cut = rng.randint(0, len(phrase))
+            line = (f"\x1b[1m\x1b[3{n % 8}m{phrase[:cut]}\x1b[22m{phrase[cut:]}\x1b[0m"
+                    f" \x1b]8;;https://example.com/{n}\x1b\\link\x1b]8;;\x1b\\")
+        lines.append(line)
+        total += len(line.encode('utf-8')) + 1
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def get_npm_root(env):
+    """获取（临时）npm 全局目录"""
+    npm = shutil.which('npm')
+    if not npm:
+        raise RuntimeError("未找到 npm")
+    result = subprocess.run([npm, 'root', '-g'], env=env, capture_output=True, text=True, check=True)
+    return Path(result.stdout.strip())
+
+
+def setup_sandbox(root, chunk):
+    """在临时目录中准备 npm 全局目录、桩程序并执行汉化注入
+
+    返回 (运行环境, codex.js 路径, 快速启动器生效后的 <前缀>/bin/codex；不支持时为 None)
+    """
+    triple = TARGET_TRIPLES.get((platform.system(), platform.machine()))
+    if not triple:
+        raise RuntimeError(f"不支持的平台: {platform.system()} ({platform.machine()})")
+
+    env = dict(os.environ)
+    env['npm_config_prefix'] = str(root / 'prefix')
+    env['XDG_CACHE_HOME'] = str(root / 'cache')
+    env['CODEX_BENCH_CHUNK'] = str(chunk)
+    for name in ('CODEX_ZH_TELEMETRY', 'CODEX_ZH_STATS', 'CODEX_ZH_TUI'):
+        env.pop(name, None)
+    # 各场景的样本不同而参数相同，关闭帮助输出缓存，每次都真正翻译
+    env['CODEX_ZH_HELP_CACHE'] = '0'
+
+    package_dir = get_npm_root(env) / '@openai' / 'codex'
+    bin_dir = package_dir / 'bin'
+    bin_dir.mkdir(parents=True)
+    (package_dir / 'package.json').write_text(
+        json.dumps({'name': '@openai/codex', 'version': CODEX_VERSION, 'type': 'module'}), encoding='utf-8')
+    (bin_dir / 'codex.js').write_text('#!/usr/bin/env node\n', encoding='utf-8')
+
+    stub = bin_dir / f'codex-{triple}'
+    stub.write_text(STUB_SOURCE.format(python=sys.executable), encoding='utf-8')
+    stub.chmod(0o755)
+
+    # 与 npm 全局安装一样创建 <前缀>/bin/codex 符号链接，快速启动器安装时会改为指向启动器
+    link = root / 'prefix' / 'bin' / 'codex'
+    link.parent.mkdir(parents=True)
+    link.symlink_to(os.path.relpath(bin_dir / 'codex.js', link.parent))
+
+    subprocess.run(['node', str(INJECTOR), 'inject', '--launcher'], env=env, capture_output=True, check=True)
+    launcher = link if link.resolve().name == 'codex-zh-launcher' else None
+    return env, bin_dir / 'codex.js', launcher
+
+
+def wrapper_command(wrapper):
+    """codex.js 由 node 运行，快速启动器直接执行"""
+    return ['node', str(wrapper)] if Path(wrapper).suffix == '.js' else [str(wrapper)]
+
+
+def watch_peak_rss(pid, peak, done):
+    """Linux 下轮询 /proc 中的 VmHWM（只统计 node 自身，不含 fork 前父进程的内存）"""
+    path = f'/proc/{pid}/status'
+    while not done.is_set():
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        peak[0] = max(peak[0], int(line.split()[1]) / 1024)
+                        break
+        except OSError:
+            return
+        done.wait(0.005)
+
+
+def run_wrapper(wrapper, args, env, fixture, output):
+    """运行一次 codex.js（或快速启动器），返回 (耗时秒数, 峰值内存 MB)"""
+    env = dict(env, CODEX_BENCH_FIXTURE=str(fixture))
+    peak = [0.0]
+    done = threading.Event()
+    with open(output, 'wb') as out:
+        start = time.perf_counter()
+        process = subprocess.Popen([*wrapper_command(wrapper), *args], env=env, stdout=out, stderr=subprocess.DEVNULL)
+        watcher = None
+        if sys.platform.startswith('linux'):
+            watcher = threading.Thread(target=watch_peak_rss, args=(process.pid, peak, done), daemon=True)
+            watcher.start()
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+    done.set()
+    if watcher:
+        watcher.join()
+    process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"codex.js 退出码 {process.returncode}: {' '.join(args)}")
+    if watcher:
+        return elapsed, peak[0]
+    # ru_maxrss 在 macOS 上以字节为单位
+    return elapsed, usage.ru_maxrss / (1024 * 1024)
+
+
+def run_stream_check(wrapper, env, fixture, repeat):
+    """输出 repeat 遍样本，读取端间歇停顿
+
+    返回 (耗时秒数, 开始输出时的峰值内存 MB, 预热结束时的峰值内存 MB, 峰值内存 MB, 收到的字节数)
+    """
+    env = dict(env, CODEX_BENCH_FIXTURE=str(fixture), CODEX_BENCH_REPEAT=str(repeat))
+    peak = [0.0]
+    done = threading.Event()
+    start = time.perf_counter()
+    process = subprocess.Popen(['node', str(wrapper), '--help'], env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    watcher = None
+    if sys.platform.startswith('linux'):
+        watcher = threading.Thread(target=watch_peak_rss, args=(process.pid, peak, done), daemon=True)
+        watcher.start()
+    received = 0
+    warmup = STREAM_WARMUP_MB * 1024 * 1024
+    start_peak = None
+    warm_peak = None
+    next_stall = STREAM_STALL_EVERY
+    while True:
+        data = process.stdout.read(65536)
+        if not data:
+            break
+        if start_peak is None:
+            start_peak = peak[0]
+        received += len(data)
+        if warm_peak is None and received >= warmup:
+            warm_peak = peak[0]
+        if received >= next_stall:
+            next_stall += STREAM_STALL_EVERY
+            time.sleep(STREAM_STALL_SECONDS)
+    process.stdout.close()
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    done.set()
+    if watcher:
+        watcher.join()
+    if not os.WIFEXITED(status) or os.WEXITSTATUS(status) != 0:
+        raise RuntimeError("codex.js 在大输出检查中异常退出")
+    if not watcher:
+        # 无法中途采样时，以常规场景的内存作为参照
+        return elapsed, None, None, usage.ru_maxrss / (1024 * 1024), received
+    return elapsed, start_peak or 0.0, warm_peak or 0.0, peak[0], received
+
+
+def expected_output_size(wrapper, data, repeat):
+    """用 Python 版翻译引擎计算译文的字节数（样本以换行结尾，重复拼接不会产生跨样本的短语）"""
+    with open(Path(wrapper).parent / 'codex-zh-translations.json', 'r', encoding='utf-8') as f:
+        trie = TranslationTrie.from_compiled(json.load(f))
+    output, rest = trie.translate_terminal_text(data.decode('utf-8'), True)
+    return len((output + rest).encode('utf-8')) * repeat
+
+
+def measure_stream(wrapper, env, fixture, data, count, fallback_rss=0.0):
+    """大输出检查：输出 count 遍样本 data，读取端间歇停顿，返回结果和未通过的检查项
+
+    无法中途采样内存时，以 fallback_rss 作为开始输出和预热结束时的峰值内存
+    """
+    fixture.write_bytes(data)
+    seconds, start_rss, warm_rss, rss, received = run_stream_check(wrapper, env, fixture, count)
+    if warm_rss is None:
+        start_rss = warm_rss = fallback_rss
+    output_mb = received / (1024 * 1024)
+    # 预热之后每 MB 输出带来的峰值内存增长
+    growth = max(0.0, rss - warm_rss) / max(1.0, output_mb - STREAM_WARMUP_MB)
+    # 开始输出以来峰值内存的增长占输出总量的比例
+    buffered = max(0.0, rss - start_rss) / max(1.0, output_mb)
+    stream = {
+        'seconds': seconds,
+        'mb_s': len(data) * count / (1024 * 1024) / seconds,
+        'rss_mb': rss,
+        'start_rss_mb': start_rss,
+        'warm_rss_mb': warm_rss,
+        'growth': growth,
+        'buffered': buffered,
+        'input_bytes': len(data) * count,
+        'output_bytes': received,
+        'expected_bytes': expected_output_size(wrapper, data, count),
+        'flat': growth <= STREAM_MAX_GROWTH and buffered <= STREAM_MAX_BUFFERED,
+    }
+    stream['problems'] = stream_problems(stream)
+    return stream
+
+
+def stream_problems(stream):
+    """大输出检查未通过的项目：内存随输出增长、译文字节数不符"""
+    problems = []
+    if not stream['flat']:
+        problems.append('stream.flat')
+    if stream['output_bytes'] != stream['expected_bytes']:
+        problems.append('stream.output_bytes')
+    return problems
+
+
+def read_chunk_latency(env):
+    """读取最近一次运行的翻译统计记录中的每块耗时"""
+    path = Path(env['XDG_CACHE_HOME']) / APP_DIR_NAME / TELEMETRY_FILE_NAME
+    with open(path, 'r', encoding='utf-8') as f:
+        record = json.loads(f.read().splitlines()[-1])
+    return {'chunks': record['chunks'], 'p50': record['chunkMs']['p50'], 'p99': record['chunkMs']['p99']}
+
+
+def run_benchmarks(size_mb, chunk, repeat, startup_runs, seed, stream_mb):
+    """运行全部基准，返回结果"""
+    rng = random.Random(seed)
+    phrases = load_phrases()
+    # --help 触发翻译，exec 走透明传递（桩程序忽略参数）
+    modes = {'translated': ['--help'], 'passthrough': ['exec']}
+
+    with tempfile.TemporaryDirectory(prefix='codex-zh-bench-') as tmp:
+        root = Path(tmp)
+        env, wrapper, launcher = setup_sandbox(root, chunk)
+        output = root / 'output.txt'
+        node_version = subprocess.run(['node', '--version'], capture_output=True, text=True).stdout.strip()
+
+        results = {
+            'version': BENCH_VERSION,
+            'environment': {
+                'node': node_version,
+                'python': platform.python_version(),
+                'platform': f"{platform.system()} {platform.machine()}",
+            },
+            'config': {'size_mb': size_mb, 'chunk': chunk, 'repeat': repeat, 'seed': seed, 'stream_mb': stream_mb},
+            'startup_ms': {},
+            'scenarios': {},
+        }
+
+        print(f"⏱️ 启动时间（{startup_runs} 次取中位数）...", file=sys.stderr)
+        startup = root / 'startup.txt'
+        startup.write_bytes(generate_fixture('help', 4096, rng, phrases))
+        for mode, args in modes.items():
+            times = [run_wrapper(wrapper, args, env, startup, output)[0] for _ in range(startup_runs)]
+            results['startup_ms'][mode] = statistics.median(times) * 1000
+        # 帮助输出缓存命中：先运行一次写入缓存，之后不再启动桩程序
+        cached_env = dict(env, CODEX_ZH_HELP_CACHE='1')
+        run_wrapper(wrapper, modes['translated'], cached_env, startup, output)
+        times = [run_wrapper(wrapper, modes['translated'], cached_env, startup, output)[0] for _ in range(startup_runs)]
+        results['startup_ms']['cached'] = statistics.median(times) * 1000
+        # 快速启动器：透明传递的命令直接 exec 桩程序，差值即为 Node.js 中间进程的开销
+        if launcher:
+            times = [run_wrapper(launcher, modes['passthrough'], env, startup, output)[0] for _ in range(startup_runs)]
+            results['startup_ms']['launcher'] = statistics.median(times) * 1000
+
+        for kind in SCENARIOS:
+            print(f"📦 场景 {kind}（{size_mb} MB）...", file=sys.stderr)
+            fixture = root / f'{kind}.txt'
+            data = generate_fixture(kind, int(size_mb * 1024 * 1024), rng, phrases)
+            fixture.write_bytes(data)
+            scenario = {}
+            for mode, args in modes.items():
+                runs = [run_wrapper(wrapper, args, env, fixture, output) for _ in range(repeat)]
+                seconds = min(elapsed for elapsed, _ in runs)
+                scenario[mode] = {
+                    'seconds': seconds,
+                    'mb_s': len(data) / (1024 * 1024) / seconds,
+                    'rss_mb': max(rss for _, rss in runs),
+                }
+            # 每块延迟单独测一次，避免统计开销影响吞吐量
+            run_wrapper(wrapper, modes['translated'], dict(env, CODEX_ZH_TELEMETRY='1'), fixture, output)
+            scenario['chunk_ms'] = read_chunk_latency(env)
+            results['scenarios'][kind] = scenario
+
+        if stream_mb > 0:
+            if stream_mb < STREAM_WARMUP_MB * 2:
+                print(f"   ⚠️ 大输出检查至少需要 {STREAM_WARMUP_MB * 2} MB，已从 {stream_mb} MB 调整", file=sys.stderr)
+                stream_mb = results['config']['stream_mb'] = STREAM_WARMUP_MB * 2
+            print(f"🌊 大输出检查（{stream_mb} MB，读取端间歇停顿）...", file=sys.stderr)
+            data = generate_fixture('help', STREAM_FIXTURE_MB * 1024 * 1024, rng, phrases)
+            count = max(1, round(stream_mb / STREAM_FIXTURE_MB))
+            results['stream'] = measure_stream(wrapper, env, root / 'stream.txt', data, count,
+                                               results['scenarios']['help']['translated']['rss_mb'])
+    return results
+
+
+def iter_metrics(results):
+    """展开为 (名称, 指标, 数值) 列表"""
+    for mode, value in results['startup_ms'].items():
+        yield f"startup.{mode}", 'startup_ms', value
+    for kind, scenario in results['scenarios'].items():
+        for mode in ('translated', 'passthrough'):
+            for metric in ('mb_s', 'seconds', 'rss_mb'):
+                yield f"{kind}.{mode}.{metric}", metric, scenario[mode][metric]
+        for metric in ('p50', 'p99'):
+            yield f"{kind}.chunk_ms.{metric}", metric, scenario['chunk_ms'][metric]
+    if 'stream' in results:
+        for metric in ('mb_s', 'rss_mb'):
+            yield f"stream.{metric}", metric, results['stream'][metric]
+
+
+def print_results(results, baseline, threshold):
+    """打印结果，与基线对比，返回退步的指标列表"""
+    previous = {name: value for name, _, value in iter_metrics(baseline)} if baseline else {}
+    regressions = []
+    print(f"\n📊 {results['environment']['platform']}，Node.js {results['environment']['node']}")
+    for name, metric, value in iter_metrics(results):
+        line = f"   {name:<34} {value:>10.3f}"
+        old = previous.get(name)
+        if old:
+            change = (value - old) / old
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            line += f"   基线 {old:>10.3f}  {change:+7.1%}"
+            # 透明传递只作为参照，不计入退步
+            if worse and '.passthrough.' not in name:
+                line += "  ⚠️"
+                regressions.append(name)
+        print(line)
+
+    startup = results['startup_ms']
+    if 'launcher' in startup:
+        print(f"   快速启动器: 透明传递启动 {startup['passthrough']:.1f} ms → {startup['launcher']:.1f} ms"
+              f"（节省 {startup['passthrough'] - startup['launcher']:.1f} ms）")
+    for kind, scenario in results['scenarios'].items():
+        ratio = scenario['translated']['seconds'] / scenario['passthrough']['seconds']
+        print(f"   {kind}: 翻译耗时为透明传递的 {ratio:.2f} 倍")
+    check_stream(results)
+    return regressions
+
+
+def check_stream(results):
+    """打印大输出检查的结果：内存是否保持平稳、译文是否完整"""
+    stream = results.get('stream')
+    if not stream:
+        return
+    size_mb = results['config']['stream_mb']
+    detail = (f"开始输出时 {stream['start_rss_mb']:.1f} MB，预热 {STREAM_WARMUP_MB} MB 后 {stream['warm_rss_mb']:.1f} MB，"
+              f"每 MB 输出增长 {stream['growth']:.3f} MB，增长占输出量 {stream['buffered']:.3f}")
+    if stream['flat']:
+        print(f"   ✅ {size_mb} MB 输出峰值内存 {stream['rss_mb']:.1f} MB（{detail}），背压生效")
+    else:
+        print(f"   ❌ {size_mb} MB 输出峰值内存 {stream['rss_mb']:.1f} MB（{detail}），"
+              f"超过 {STREAM_MAX_GROWTH} / {STREAM_MAX_BUFFERED}，背压没有生效")
+    if stream['output_bytes'] != stream['expected_bytes']:
+        print(f"   ❌ 译文不完整: 收到 {stream['output_bytes']} 字节，应为 {stream['expected_bytes']} 字节")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Codex CLI 汉化包装脚本性能基准")
+    parser.add_argument('--size', type=float, default=8, help="每个场景的输出大小（MB）")
+    parser.add_argument('--chunk', type=int, default=16384, help="桩程序每次写入的字节数")
+    parser.add_argument('--repeat', type=int, default=3, help="每个场景的重复次数（取最快一次）")
+    parser.add_argument('--startup-runs', type=int, default=10, help="启动时间的测量次数")
+    parser.add_argument('--seed', type=int, default=1, help="样本生成的随机种子")
+    parser.add_argument('--stream', type=float, default=256, help="大输出检查的输出大小（MB），0 表示跳过")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="基线文件路径")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基线")
+    parser.add_argument('--threshold', type=float, default=0.25, help="判定退步的相对变化")
+    parser.add_argument('--check', action='store_true', help="有指标退步时返回非零退出码")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args(argv)
+
+    if sys.platform == 'win32':
+        print("❌ 基准测试需要以脚本作为桩程序，暂不支持 Windows", file=sys.stderr)
+        return 1
+
+    results = run_benchmarks(args.size, args.chunk, args.repeat, args.startup_runs, args.seed, args.stream)
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    # --json 时标准输出只有 JSON，其余提示写到标准错误
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        regressions = []
+    else:
+        regressions = print_results(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        print(f"✅ 已保存基线: {baseline_path}", file=sys.stderr)
+
+    if regressions:
+        print(f"⚠️ {len(regressions)} 项指标超过基线 {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+    # 大输出检查未通过时总是返回非零退出码；指标退步只在 --check 时如此
+    problems = results.get('stream', {}).get('problems', [])
+    if problems:
+        print(f"❌ 大输出检查未通过: {', '.join(problems)}", file=sys.stderr)
+        return 1
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
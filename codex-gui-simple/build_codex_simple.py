@@ -11,17 +11,54 @@ import sys
 import shutil
 import subprocess
 import json
+import time
+import datetime
+import hashlib
+import argparse
+import filecmp
+import tempfile
 from pathlib import Path
 
+from codex_paths import get_cache_dir
+
+EXE_NAME = "Codex CLI汉化工具.exe"
+
+# 打包入口脚本，Nuitka 从它开始跟随导入
+ENTRY_SCRIPT = "codex_gui.py"
+
+# 打包方式
+# onefile：单文件，每次启动都要把 Python 运行时、Tk 和 scripts 解压到临时目录
+# onefile-cached：单文件，解压到按构建哈希命名的本地缓存目录，之后的启动直接复用
+# standalone：目录形式，无需解压，发布整个目录
+BUILD_PROFILES = ("onefile", "onefile-cached", "standalone")
+
+# 测量启动时间的次数（取中位数）
+STARTUP_RUNS = 3
+
+# 打包程序自检的超时秒数
+SELF_TEST_TIMEOUT = 120
+
+# 上次编译的输入指纹和结果，输入未变化时跳过编译
+BUILD_RECORD_NAME = "build-record.json"
+
 class CodexSimpleBuilder:
-    def __init__(self):
+    def __init__(self, profile="onefile", force=False):
         self.project_root = Path(__file__).parent.parent
         self.gui_dir = Path(__file__).parent
         self.release_dir = self.gui_dir / "release_codex_simple"
+        self.profile = profile
+        self.force = force
+        self.build_hash = ""
+        self.input_fingerprint = ""
+        self.nuitka_version = ""
+        self.startup_times = None
+        self.self_test = None
+        self.stage_times = []
         
         print("🚀 Codex CLI 汉化工具 - 简化版打包脚本")
         print("=" * 65)
         print("🎯 目标：打包简化版GUI，专注汉化功能")
+        print(f"📦 打包方式: {profile}")
         print("")
         
     def check_nuitka(self):
@@ -31,6 +68,7 @@ class CodexSimpleBuilder:
                                   capture_output=True, text=True)
             if result.returncode == 0:
                 version = result.stdout.strip().split('\n')[0]
+                self.nuitka_version = result.stdout.strip()
                 print(f"✅ Nuitka: {version}")
                 return True
             else:
@@ -42,6 +80,18 @@ class CodexSimpleBuilder:
             print(f"❌ Nuitka检查失败: {e}")
             return False
     
+    def compile_translations(self):
+        """合并并编译汉化词典，保证打包的词典是最新的"""
+        print("\n" + "=" * 65)
+        print("📚 编译汉化词典...")
+        
+        try:
+            import compile_translations
+            return compile_translations.main([]) == 0
+        except Exception as e:
+            print(f"❌ 词典编译失败: {e}")
+            return False
+    
     def check_scripts(self):
         """检查所有必要的汉化脚本文件"""
         print("\n" + "=" * 65)
@@ -49,7 +99,11 @@ class CodexSimpleBuilder:
         
         required_scripts = [
             "inject-chinese-final-dedup.js",
-            "codex-translations-extended.json"
+            "codex-translations-extended.json",
+            "codex-translations-compiled.json",
+            "codex-wrapper.template.js",
+            "codex-launcher.template.sh",
+            "translation-packs"
         ]
         
         found_count = 0
@@ -57,7 +111,12 @@ class CodexSimpleBuilder:
         
         for script in required_scripts:
             script_path = self.project_root / script
-            if script_path.exists():
+            if script_path.is_dir():
+                count = len(list(script_path.glob("*.json")))
+                desc = self.get_script_description(script)
+                print(f"   ✅ {script}/ ({count} 个文件) - {desc}")
+                found_count += 1
+            elif script_path.exists():
                 size = script_path.stat().st_size
                 desc = self.get_script_description(script)
                 print(f"   ✅ {script} ({size} bytes) - {desc}")
@@ -74,11 +133,27 @@ class CodexSimpleBuilder:
         
         return True
     
+    def get_pack_versions(self):
+        """已有翻译包的 Codex CLI 版本（从旧到新）"""
+        from translation_packs import PACKS_DIR_NAME, load_packs, sorted_versions
+        return sorted_versions(load_packs(self.project_root / PACKS_DIR_NAME))
+    
+    def describe_supported_versions(self):
+        """支持的 Codex CLI 版本：不低于最旧翻译包的版本都会选用对应的翻译包"""
+        versions = self.get_pack_versions()
+        if not versions:
+            return "Codex CLI 任意版本（仅使用基础词典）"
+        return f"Codex CLI {versions[0]} 及以上（翻译包: {'、'.join(versions)}）"
+    
     def get_script_description(self, script_name):
         """获取脚本描述"""
         descriptions = {
             "inject-chinese-final-dedup.js": "Codex CLI主汉化脚本",
-            "codex-translations-extended.json": "Codex CLI扩展翻译文件"
+            "codex-translations-extended.json": "Codex CLI扩展翻译文件",
+            "codex-translations-compiled.json": "合并去重后的汉化词典",
+            "codex-wrapper.template.js": "汉化版 codex.js 模板",
+            "codex-launcher.template.sh": "快速启动器模板",
+            "translation-packs": "按 Codex CLI 版本划分的翻译包"
         }
         return descriptions.get(script_name, "脚本文件")
     
@@ -87,55 +162,194 @@ class CodexSimpleBuilder:
         print("\n" + "=" * 65)
         print("📁 准备汉化脚本文件...")
         
-        # 在GUI目录创建scripts子目录
+        # 在GUI目录创建scripts子目录（保留上次复制的文件，只更新有变化的部分）
         scripts_dir = self.gui_dir / "scripts"
-        if scripts_dir.exists():
-            shutil.rmtree(scripts_dir)
-        scripts_dir.mkdir()
+        scripts_dir.mkdir(exist_ok=True)
         
         required_scripts = [
             "inject-chinese-final-dedup.js",
-            "codex-translations-extended.json"
+            "codex-translations-extended.json",
+            "codex-translations-compiled.json",
+            "codex-wrapper.template.js",
+            "codex-launcher.template.sh",
+            "translation-packs"
         ]
         
+        # 删除已不再打包的文件
+        for stale in scripts_dir.iterdir():
+            if stale.name not in required_scripts:
+                shutil.rmtree(stale) if stale.is_dir() else stale.unlink()
+        
         copied_count = 0
         for script in required_scripts:
             src_path = self.project_root / script
             dst_path = scripts_dir / script
             if src_path.exists():
-                shutil.copy2(src_path, dst_path)
-                print(f"   ✅ 复制: {script}")
+                changed = self.sync_path(src_path, dst_path)
+                suffix = "/" if src_path.is_dir() else ""
+                print(f"   ✅ {'复制' if changed else '未变化'}: {script}{suffix}")
                 copied_count += 1
             else:
                 print(f"   ❌ 缺失: {script}")
         
-        print(f"\n📊 成功复制 {copied_count} 个脚本文件到 {scripts_dir}")
+        print(f"\n📊 已准备 {copied_count} 个脚本文件: {scripts_dir}")
         return scripts_dir, copied_count == len(required_scripts)
     
-    def build_with_nuitka(self, scripts_dir):
-        """使用Nuitka构建EXE"""
-        print("\n" + "=" * 65)
-        print("🚀 开始Nuitka编译...")
-        print("⏳ 编译为原生C++代码，包含所有汉化脚本...")
-        
-        # Nuitka编译命令
-        nuitka_cmd = [
+    def sync_path(self, src, dst):
+        """把 src 同步到 dst，只复制内容有变化的文件，返回是否有文件变化"""
+        if src.is_dir():
+            dst.mkdir(exist_ok=True)
+            changed = False
+            names = {child.name for child in src.iterdir()}
+            for old in dst.iterdir():
+                if old.name not in names:
+                    shutil.rmtree(old) if old.is_dir() else old.unlink()
+                    changed = True
+            for child in sorted(src.iterdir()):
+                changed = self.sync_path(child, dst / child.name) or changed
+            return changed
+        if dst.exists() and filecmp.cmp(src, dst, shallow=False):
+            return False
+        shutil.copy2(src, dst)
+        return True
+    
+    def bundled_modules(self):
+        """入口脚本直接或间接导入的本地模块（含函数内的延迟导入，--follow-imports 会一并打包）
+
+        基准、性能分析等不会被打包的脚本不在其中，修改它们不会触发重新编译
+        """
+        import ast
+        found = set()
+        pending = [self.gui_dir / ENTRY_SCRIPT]
+        while pending:
+            path = pending.pop()
+            if path in found:
+                continue
+            found.add(path)
+            for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    names = [node.module]
+                else:
+                    continue
+                for name in names:
+                    module = self.gui_dir / f"{name.split('.')[0]}.py"
+                    if module.exists():
+                        pending.append(module)
+        return sorted(found)
+    
+    def source_files(self, scripts_dir):
+        """参与打包的文件：程序实际打包的源码和 scripts 目录中的脚本"""
+        return self.bundled_modules() + sorted(p for p in scripts_dir.rglob("*") if p.is_file())
+    
+    def hash_files(self, digest, paths):
+        """把文件的相对路径和内容加入哈希"""
+        for path in paths:
+            digest.update(path.relative_to(self.gui_dir).as_posix().encode('utf-8'))
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+    
+    def compute_build_hash(self, scripts_dir):
+        """计算构建内容的哈希：程序源码和打包的脚本文件，用于命名单文件的解压缓存目录"""
+        digest = hashlib.sha256()
+        self.hash_files(digest, self.source_files(scripts_dir))
+        return digest.hexdigest()[:12]
+    
+    def compute_input_fingerprint(self, scripts_dir, nuitka_cmd):
+        """计算编译输入的指纹：源码、脚本、图标、Python 和 Nuitka 版本以及编译参数"""
+        digest = hashlib.sha256()
+        self.hash_files(digest, self.source_files(scripts_dir) + [self.gui_dir / "app_icon.ico"])
+        digest.update(json.dumps({
+            'python': sys.version,
+            'nuitka': self.nuitka_version,
+            'command': nuitka_cmd,
+        }, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get_build_record_path(self):
+        return self.gui_dir / "dist_simple" / BUILD_RECORD_NAME
+    
+    def load_build_record(self):
+        """读取上次编译的记录，不存在或损坏时返回空字典"""
+        try:
+            with open(self.get_build_record_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_build_record(self, exe_path):
+        """记录本次编译的输入指纹、输出位置和启动时间"""
+        record = {
+            "input_fingerprint": self.input_fingerprint,
+            "profile": self.profile,
+            "build_hash": self.build_hash,
+            "exe": str(exe_path),
+            "startup": self.startup_times,
+            "self_test": self.self_test,
+        }
+        path = self.get_build_record_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+    
+    def find_cached_build(self):
+        """输入未变化且上次的输出仍然存在时返回上次的 EXE 路径"""
+        if self.force:
+            return None
+        record = self.load_build_record()
+        if record.get("input_fingerprint") != self.input_fingerprint:
+            return None
+        exe_path = Path(record.get("exe", ""))
+        if not exe_path.is_file():
+            return None
+        self.startup_times = record.get("startup")
+        self.self_test = record.get("self_test")
+        return exe_path
+    
+    def get_onefile_cache_dir(self):
+        """onefile-cached 方式的解压目录（与 --onefile-tempdir-spec 对应）"""
+        return get_cache_dir() / f"gui-{self.build_hash}"
+    
+    def get_profile_options(self):
+        """返回打包方式对应的 Nuitka 参数"""
+        if self.profile == "standalone":
+            return ['--standalone']
+        if self.profile == "onefile-cached":
+            # 解压到 {CACHE_DIR} 下按构建哈希命名的目录：不在临时目录中，退出后不会删除，
+            # 下次启动时直接复用；程序更新后哈希改变，自动使用新目录
+            return ['--onefile', f'--onefile-tempdir-spec={{CACHE_DIR}}/codex-zh/gui-{self.build_hash}']
+        return ['--onefile']
+    
+    def get_nuitka_command(self):
+        """返回 Nuitka 编译命令"""
+        return [
             sys.executable, '-m', 'nuitka',
-            '--onefile',  # 单文件
+            *self.get_profile_options(),
             '--windows-disable-console',  # 无控制台窗口
             '--windows-icon-from-ico=app_icon.ico',  # 图标
-            '--output-filename=Codex CLI汉化工具.exe',
-            '--output-dir=dist_simple',
-            '--remove-output',
+            f'--output-filename={EXE_NAME}',
+            '--output-dir=dist_simple',  # 保留 .build 目录，下次编译复用已生成的 C 代码和编译缓存
             '--assume-yes-for-downloads',
             '--show-progress',
             '--enable-plugin=tk-inter',  # tkinter插件
             '--include-data-dir=scripts=scripts',  # 包含整个scripts目录
             '--include-data-file=scripts/inject-chinese-final-dedup.js=scripts/inject-chinese-final-dedup.js',  # 确保汉化脚本包含
             '--include-data-file=scripts/codex-translations-extended.json=scripts/codex-translations-extended.json',  # 确保翻译文件包含
+            '--include-data-file=scripts/codex-translations-compiled.json=scripts/codex-translations-compiled.json',  # 合并后的词典
+            '--include-data-file=scripts/codex-wrapper.template.js=scripts/codex-wrapper.template.js',  # 包装脚本模板
+            '--include-data-file=scripts/codex-launcher.template.sh=scripts/codex-launcher.template.sh',  # 快速启动器模板
             '--follow-imports',
-            'codex_gui.py'
+            ENTRY_SCRIPT
         ]
+    
+    def build_with_nuitka(self, scripts_dir):
+        """使用Nuitka构建EXE"""
+        print("\n" + "=" * 65)
+        print("🚀 开始Nuitka编译...")
+        print("⏳ 编译为原生C++代码，包含所有汉化脚本...")
+        
+        nuitka_cmd = self.get_nuitka_command()
         
         try:
             # 切换到GUI目录
@@ -148,12 +362,19 @@ class CodexSimpleBuilder:
             # 执行Nuitka编译
             result = subprocess.run(nuitka_cmd, check=True)
             
-            exe_path = self.gui_dir / "dist_simple" / "Codex CLI汉化工具.exe"
+            if self.profile == "standalone":
+                # 目录形式输出到 <主脚本名>.dist
+                exe_path = self.gui_dir / "dist_simple" / "codex_gui.dist" / EXE_NAME
+            else:
+                exe_path = self.gui_dir / "dist_simple" / EXE_NAME
             if exe_path.exists():
-                size_mb = exe_path.stat().st_size / (1024 * 1024)
+                if self.profile == "standalone":
+                    size = sum(p.stat().st_size for p in exe_path.parent.rglob("*") if p.is_file())
+                else:
+                    size = exe_path.stat().st_size
                 print("✅ Nuitka编译成功！")
                 print(f"📁 EXE位置: {exe_path}")
-                print(f"📏 文件大小: {size_mb:.1f} MB")
+                print(f"📏 文件大小: {size / (1024 * 1024):.1f} MB")
                 return exe_path
             else:
                 print("❌ 编译完成但未找到EXE文件")
@@ -167,56 +388,116 @@ class CodexSimpleBuilder:
             return None
     
     def test_exe(self, exe_path):
-        """测试EXE文件"""
+        """运行打包程序的自检（--self-test，不创建窗口），等待其退出并读取结果"""
         print("\n" + "=" * 65)
         print(f"🧪 测试简化版EXE: {exe_path}")
         
-        try:
-            print("   🔍 测试程序启动...")
-            # 启动程序测试
-            process = subprocess.Popen([str(exe_path)], 
-                                     stdout=subprocess.PIPE, 
-                                     stderr=subprocess.PIPE)
-            
-            # 等待一小段时间
-            import time
-            time.sleep(3)
+        # 打包程序没有控制台，自检结果写入临时文件
+        with tempfile.TemporaryDirectory(prefix="codex-zh-build-") as tmp:
+            output = Path(tmp) / "self-test.json"
+            start = time.perf_counter()
+            try:
+                process = subprocess.run([str(exe_path), '--self-test', '--self-test-output', str(output)],
+                                         capture_output=True, timeout=SELF_TEST_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                print(f"   ❌ 自检超过 {SELF_TEST_TIMEOUT} 秒未结束")
+                return False
+            except OSError as e:
+                print(f"   ❌ 无法启动程序: {e}")
+                return False
+            elapsed_ms = (time.perf_counter() - start) * 1000
             
-            if process.poll() is None:
-                print("   ✅ 程序启动成功！")
-                print("   📋 程序正在运行中，请手动测试功能...")
-                process.terminate()
-                return True
-            else:
-                stdout, stderr = process.communicate()
-                print("   ❌ 程序启动失败")
+            try:
+                result = json.loads(output.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                print(f"   ❌ 程序退出（退出码 {process.returncode}），没有输出自检结果")
+                stderr = process.stderr.decode('utf-8', errors='ignore').strip()
                 if stderr:
-                    print(f"   错误: {stderr.decode('utf-8', errors='ignore')}")
+                    print(f"   错误: {stderr[-2000:]}")
                 return False
-                
-        except Exception as e:
-            print(f"   ❌ 测试失败: {e}")
-            return False
+        
+        for check in result['checks']:
+            if check.get('skipped'):
+                print(f"   ⏭️ {check['name']}: 已跳过")
+            elif check['success']:
+                print(f"   ✅ {check['name']} ({check['elapsed_ms']:.1f} ms)")
+            else:
+                print(f"   ❌ {check['name']}: {check['error']}")
+        print(f"   ⏱️ 自检 {result['elapsed_ms']:.0f} ms，包括程序启动共 {elapsed_ms:.0f} ms")
+        self.self_test = {
+            "success": result['success'],
+            "self_test_ms": round(result['elapsed_ms'], 1),
+            "total_ms": round(elapsed_ms, 1),
+        }
+        return result['success'] and process.returncode == 0
+    
+    def time_startup(self, exe_path):
+        """运行一次程序（--startup-probe：窗口显示后立即退出），返回耗时毫秒数"""
+        start = time.perf_counter()
+        subprocess.run([str(exe_path), '--startup-probe'], timeout=120,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return (time.perf_counter() - start) * 1000
+    
+    def measure_startup(self, exe_path):
+        """测量冷启动和热启动耗时
+        
+        冷启动：onefile-cached 先删除解压缓存，其余方式为构建后的第一次启动；
+        热启动：紧接着的若干次启动取中位数
+        """
+        print("\n" + "=" * 65)
+        print("⏱️ 测量启动时间...")
+        
+        try:
+            if self.profile == "onefile-cached":
+                shutil.rmtree(self.get_onefile_cache_dir(), ignore_errors=True)
+            cold_ms = self.time_startup(exe_path)
+            warm = sorted(self.time_startup(exe_path) for _ in range(STARTUP_RUNS))
+            warm_ms = warm[len(warm) // 2]
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"   ⚠️ 无法测量启动时间: {e}")
+            return None
+        
+        print(f"   冷启动: {cold_ms:.0f} ms")
+        print(f"   热启动: {warm_ms:.0f} ms（{STARTUP_RUNS} 次取中位数）")
+        self.startup_times = {
+            "cold_ms": round(cold_ms, 1),
+            "warm_ms": round(warm_ms, 1),
+            "warm_runs": STARTUP_RUNS,
+        }
+        return self.startup_times
     
     def create_release(self, exe_path):
         """创建发布包"""
         print("\n" + "=" * 65)
         print("📦 创建发布包...")
         
+        # 发布目录已由同一次编译生成时不再重建
+        try:
+            with open(self.release_dir / "version.json", 'r', encoding='utf-8') as f:
+                released = json.load(f)
+        except (OSError, ValueError):
+            released = {}
+        if not self.force and released.get("input_fingerprint") == self.input_fingerprint:
+            print(f"   ✅ 发布包未变化: {self.release_dir}/")
+            return True
+        
         # 创建发布目录
         target_dir = self.release_dir
         if target_dir.exists():
             try:
                 shutil.rmtree(target_dir)
             except Exception:
-                import datetime
                 ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
                 target_dir = self.gui_dir / f"release_codex_simple_{ts}"
         target_dir.mkdir(parents=True, exist_ok=True)
         
-        # 复制EXE文件
-        release_exe = target_dir / "Codex CLI汉化工具.exe"
-        shutil.copy2(exe_path, release_exe)
+        # 复制EXE文件（standalone 方式复制整个程序目录）
+        if self.profile == "standalone":
+            release_exe = target_dir / "Codex CLI汉化工具" / EXE_NAME
+            shutil.copytree(exe_path.parent, release_exe.parent)
+        else:
+            release_exe = target_dir / EXE_NAME
+            shutil.copy2(exe_path, release_exe)
         print(f"   ✅ EXE文件: {release_exe}")
         
         # 复制README文件
@@ -226,31 +507,33 @@ class CodexSimpleBuilder:
             shutil.copy2(readme_src, readme_dst)
             print(f"   ✅ README文件: {readme_dst}")
         
-        # 创建使用说明
-        usage_text = """🚀 Codex CLI 汉化工具 使用说明
+        # 创建使用说明（支持的版本来自翻译包）
+        versions = self.get_pack_versions()
+        supported = self.describe_supported_versions()
+        usage_text = f"""🚀 Codex CLI 汉化工具 使用说明
 
 📋 系统要求:
    • Windows 操作系统
    • Node.js 已安装 (用于执行汉化脚本)
-   • Codex CLI 0.40.0 版本 (npm install -g @openai/codex)
+   • {supported} (npm install -g @openai/codex)
 
 ✨ 功能特点:
    • 🔍 智能检测 Node.js 和 Codex CLI 安装状态
    • 🔄 自动检测最新版本并提供更新提示  
    • 🌍 一键汉化 Codex CLI 界面为中文
    • 🔄 快速恢复英文原版界面
-   • ⚡ 专为 Codex CLI 0.40.0 版本优化
+   • ⚡ 按安装的 Codex CLI 版本自动选择翻译包
    • 🎯 简洁界面，操作简便
 
 🚀 使用步骤:
    1. 双击运行 "Codex CLI汉化工具.exe"
    2. 点击 "检测安装" 按钮检查 Codex CLI 状态
-   3. 确保 Codex CLI 版本为 0.40.0
+   3. 确认检测到的 Codex CLI 版本在支持范围内
    4. 点击 "一键汉化" 开始汉化过程
    5. 如需恢复，点击 "恢复原版" 即可
 
 ⚠️ 重要提示:
-   本工具专为 Codex CLI 0.40.0 版本设计，请确保版本匹配。
+   本工具支持 {supported}；更旧的版本只使用基础词典，部分文本可能保持英文。
 
 📞 联系方式:
    • 作者微信: chaojigeti520
@@ -274,10 +557,15 @@ class CodexSimpleBuilder:
             "name": "Codex CLI汉化工具",
             "version": "1.0",
             "build_type": "简化版",
-            "build_date": str(Path().cwd()),
+            "build_date": datetime.datetime.now().isoformat(timespec='seconds'),
             "compiler": "Nuitka -> C++",
+            "build_profile": self.profile,
+            "build_hash": self.build_hash,
+            "input_fingerprint": self.input_fingerprint,
+            "startup": self.startup_times,
+            "self_test": self.self_test,
             "features": [
-                "Codex CLI 0.40.0汉化",
+                f"{supported}汉化",
                 "智能检测安装状态",
                 "一键汉化操作",
                 "快速恢复原版",
@@ -285,8 +573,9 @@ class CodexSimpleBuilder:
                 "原生C++编译",
                 "单文件部署"
             ],
-            "scripts_included": 2,
-            "codex_version": "0.40.0",
+            "scripts_included": len(self.bundled_modules()),
+            "codex_version": f">={versions[0]}" if versions else "*",
+            "translation_packs": versions,
             "supported_features": [
                 "一键汉化",
                 "恢复原版",
@@ -304,47 +593,71 @@ class CodexSimpleBuilder:
         self.release_dir = target_dir
         return True
     
-    def cleanup(self):
-        """清理临时文件"""
+    def run_stage(self, name, func, *args):
+        """执行一个构建阶段并记录耗时"""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stage_times.append((name, time.perf_counter() - start))
+    
+    def print_stage_times(self):
+        """打印各阶段耗时"""
         print("\n" + "=" * 65)
-        print("🧹 清理临时文件...")
-        
-        scripts_dir = self.gui_dir / "scripts"
-        if scripts_dir.exists():
-            shutil.rmtree(scripts_dir)
-            print(f"   ✅ 已删除临时目录: {scripts_dir}")
-        
-        return True
+        print("⏱️ 各阶段耗时:")
+        for name, seconds in self.stage_times:
+            print(f"   {seconds:>8.2f} s  {name}")
+        print(f"   {sum(seconds for _, seconds in self.stage_times):>8.2f} s  合计")
     
     def build(self):
-        """执行完整构建流程"""
-        if not self.check_nuitka():
+        """执行完整构建流程；输入未变化时跳过编译（--force 强制重新编译）"""
+        try:
+            return self.run_build()
+        finally:
+            self.print_stage_times()
+    
+    def run_build(self):
+        if not self.run_stage("检查 Nuitka", self.check_nuitka):
+            return False
+        
+        if not self.run_stage("编译词典", self.compile_translations):
             return False
             
-        if not self.check_scripts():
+        if not self.run_stage("检查脚本", self.check_scripts):
             return False
         
-        scripts_dir, success = self.prepare_data_files()
+        scripts_dir, success = self.run_stage("准备脚本", self.prepare_data_files)
         if not success:
             return False
         
-        exe_path = self.build_with_nuitka(scripts_dir)
-        if not exe_path:
-            return False
+        self.build_hash = self.compute_build_hash(scripts_dir)
+        self.input_fingerprint = self.compute_input_fingerprint(scripts_dir, self.get_nuitka_command())
+        print(f"\n🔑 构建哈希: {self.build_hash}，输入指纹: {self.input_fingerprint[:16]}")
+        
+        exe_path = self.find_cached_build()
+        if exe_path:
+            print("\n" + "=" * 65)
+            print(f"⏭️ 源码、脚本、图标和编译参数均未变化，跳过编译: {exe_path}")
+        else:
+            exe_path = self.run_stage("Nuitka 编译", self.build_with_nuitka, scripts_dir)
+            if not exe_path:
+                return False
+                
+            if not self.run_stage("自检", self.test_exe, exe_path):
+                print("❌ 打包程序自检失败，停止打包")
+                return False
             
-        if not self.test_exe(exe_path):
-            print("⚠️ EXE测试失败，但编译已完成，请手动测试")
+            self.run_stage("测量启动时间", self.measure_startup, exe_path)
+            self.save_build_record(exe_path)
         
-        if not self.create_release(exe_path):
+        if not self.run_stage("创建发布包", self.create_release, exe_path):
             return False
         
-        self.cleanup()
-        
         print("\n" + "=" * 65)
         print("🎉 Codex CLI汉化工具 - 简化版构建完成！")
         print(f"📦 发布位置: {self.release_dir}/")
         print("🎯 专注功能: 汉化")
-        print("✅ 支持版本: Codex CLI 0.40.0")
+        print(f"✅ 支持版本: {self.describe_supported_versions()}")
         print("\n🚀 简化版特点:")
         print("   ✅ 专注汉化功能")
         print("   ✅ 界面简洁美观")
@@ -358,7 +671,12 @@ class CodexSimpleBuilder:
         return True
 
 if __name__ == "__main__":
-    builder = CodexSimpleBuilder()
+    parser = argparse.ArgumentParser(description="打包 Codex CLI 汉化工具")
+    parser.add_argument('--profile', choices=BUILD_PROFILES, default="onefile",
+                        help="打包方式：onefile（默认）、onefile-cached（解压缓存）或 standalone（目录）")
+    parser.add_argument('--force', action='store_true', help="输入未变化时也重新编译并重建发布包")
+    args = parser.parse_args()
+    builder = CodexSimpleBuilder(args.profile, force=args.force)
     success = builder.build()
     sys.exit(0 if success else 1)
 
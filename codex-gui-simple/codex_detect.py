@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 安装检测
+直接读取 npm 全局目录中的 @openai/codex，不启动 codex 和 npm，
+检测结果按文件修改时间缓存在本地缓存目录中
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from codex_paths import get_cache_dir
+
+CACHE_FILE_NAME = "codex-detect.json"
+CACHE_VERSION = 2
+
+PACKAGE_PARTS = ("@openai", "codex")
+BACKUP_NAME = "codex.original.js"
+ARTIFACT_NAME = "codex-zh-translations.json"
+
+
+def prefix_to_root(prefix):
+    """npm 全局前缀对应的全局模块目录"""
+    prefix = Path(prefix)
+    if sys.platform == "win32":
+        return prefix / "node_modules"
+    return prefix / "lib" / "node_modules"
+
+
+def read_npmrc_prefix(path):
+    """读取 npmrc 中的 prefix 设置"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, sep, value = line.partition('=')
+                if sep and key.strip() == 'prefix':
+                    return os.path.expandvars(os.path.expanduser(value.strip().strip('"')))
+    except OSError:
+        pass
+    return None
+
+
+def candidate_roots():
+    """按可信程度列出可能的 npm 全局模块目录（不启动任何进程）"""
+    roots = []
+
+    # 1. 环境变量和用户 npmrc 中指定的前缀
+    prefix = os.environ.get('npm_config_prefix') or os.environ.get('NPM_CONFIG_PREFIX')
+    if not prefix:
+        userconfig = os.environ.get('npm_config_userconfig') or str(Path.home() / ".npmrc")
+        prefix = read_npmrc_prefix(userconfig)
+    if prefix:
+        roots.append(prefix_to_root(prefix))
+
+    # 2. PATH 中的 codex 命令：Unix 下是指向 bin/codex.js 的链接，Windows 下是前缀目录中的 codex.cmd
+    codex = shutil.which("codex")
+    if codex:
+        if sys.platform == "win32":
+            roots.append(Path(codex).parent / "node_modules")
+        else:
+            target = Path(os.path.realpath(codex))
+            if target.parent.name == "bin" and len(target.parents) > 4:
+                roots.append(target.parents[3])
+
+    # 3. node 所在的前缀（Windows 默认为 %APPDATA%\npm）
+    if sys.platform == "win32":
+        appdata = os.environ.get('APPDATA')
+        if appdata:
+            roots.append(Path(appdata) / "npm" / "node_modules")
+    node = shutil.which("node")
+    if node:
+        node_dir = Path(os.path.realpath(node)).parent
+        roots.append(prefix_to_root(node_dir if sys.platform == "win32" else node_dir.parent))
+
+    # 去重并保持顺序
+    unique = []
+    for root in roots:
+        if root not in unique:
+            unique.append(root)
+    return unique
+
+
+def query_npm_root():
+    """最后的办法：运行 npm root -g（较慢，结果会被缓存）"""
+    npm = shutil.which("npm")
+    if not npm:
+        return None
+    try:
+        result = subprocess.run([npm, "root", "-g"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    root = result.stdout.strip()
+    return Path(root) if result.returncode == 0 and root else None
+
+
+def first_install_root(roots):
+    """候选目录中第一个装有 Codex CLI 的目录（只检查文件是否存在），都没有时返回 None"""
+    for root in roots:
+        if (Path(root).joinpath(*PACKAGE_PARTS) / "bin" / "codex.js").exists():
+            return Path(root)
+    return None
+
+
+def file_stamp(path):
+    """文件的修改时间戳，不存在时为 None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def install_stamp(package_dir):
+    """缓存键：package.json、bin 目录和 codex.js 的修改时间（注入和恢复都会改变 bin 目录）"""
+    bin_dir = package_dir / "bin"
+    return [file_stamp(package_dir / "package.json"), file_stamp(bin_dir), file_stamp(bin_dir / "codex.js")]
+
+
+def empty_info(npm_root=None):
+    """未安装时的检测结果"""
+    return {
+        'installed': False,
+        'version': '',
+        'npm_root': str(npm_root) if npm_root else '',
+        'package_dir': str(Path(npm_root).joinpath(*PACKAGE_PARTS)) if npm_root else '',
+        'backup': False,
+        'artifact': False,
+        'patched': False,
+    }
+
+
+def read_install(npm_root):
+    """读取 npm 全局目录中的 Codex CLI 安装信息"""
+    package_dir = Path(npm_root).joinpath(*PACKAGE_PARTS)
+    info = empty_info(npm_root)
+    try:
+        with open(package_dir / "package.json", 'r', encoding='utf-8') as f:
+            package = json.load(f)
+    except (OSError, ValueError):
+        return info
+
+    bin_dir = package_dir / "bin"
+    info['installed'] = (bin_dir / "codex.js").exists()
+    info['version'] = str(package.get('version', ''))
+    info['backup'] = (bin_dir / BACKUP_NAME).exists()
+    info['artifact'] = (bin_dir / ARTIFACT_NAME).exists()
+    # 恢复原版后备份仍然保留，翻译数据会被删除
+    info['patched'] = info['backup'] and info['artifact']
+    return info
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if cache.get('version') == CACHE_VERSION else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    """写入缓存；缓存目录不可写时忽略"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def detect_codex(use_cache=True, cache_path=None):
+    """检测 Codex CLI 安装状态
+
+    返回 {'installed', 'version', 'npm_root', 'package_dir', 'backup', 'artifact', 'patched', 'source'}，
+    source 为 'cache'（缓存命中）、'scan'（读取文件）或 'npm'（运行了 npm root -g）
+    """
+    cache_path = Path(cache_path) if cache_path else get_cache_dir() / CACHE_FILE_NAME
+    cache = load_cache(cache_path) if use_cache else {}
+
+    # 缓存的安装目录仍是当前前缀、PATH 下第一个找到的安装，且文件未变化时直接返回；
+    # 候选目录都没有安装时，缓存的结果应来自 npm root -g
+    roots = candidate_roots()
+    cached = cache.get('result')
+    if cached and cached.get('installed'):
+        first = first_install_root(roots)
+        expected = str(first) if first else cache.get('npm_root')
+        package_dir = Path(cached['package_dir'])
+        if cached['npm_root'] == expected and install_stamp(package_dir) == cache.get('stamp'):
+            return dict(cached, source='cache')
+
+    source = 'scan'
+    info = None
+    for root in roots:
+        info = read_install(root)
+        if info['installed']:
+            break
+    else:
+        # 常见位置都没有找到，使用缓存的或重新查询的 npm root -g
+        npm_root = cache.get('npm_root') if use_cache else None
+        if not npm_root:
+            queried = query_npm_root()
+            npm_root = str(queried) if queried else None
+            source = 'npm'
+        if npm_root:
+            cache['npm_root'] = npm_root
+            info = read_install(npm_root)
+        elif info is None:
+            info = empty_info()
+
+    info['source'] = source
+    if use_cache and info['package_dir']:
+        cache.update({
+            'version': CACHE_VERSION,
+            'stamp': install_stamp(Path(info['package_dir'])),
+            'result': {key: value for key, value in info.items() if key != 'source'},
+        })
+        save_cache(cache_path, cache)
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="检测 Codex CLI 安装状态")
+    parser.add_argument('--no-cache', action='store_true', help="忽略并且不写入检测缓存")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出")
+    args = parser.parse_args(argv)
+
+    info = detect_codex(use_cache=not args.no_cache)
+    if args.json:
+        print(json.dumps(info, ensure_ascii=False, indent=2))
+        return 0 if info['installed'] else 1
+
+    if info['installed']:
+        print(f"✅ Codex CLI: v{info['version']}")
+        print(f"   安装目录: {info['package_dir']}")
+        print(f"   汉化状态: {'已汉化' if info['patched'] else '英文原版'}")
+    else:
+        print("❌ 未找到全局安装的 @openai/codex 包")
+        print(f"   npm 全局目录: {info['npm_root']}")
+    print(f"   检测方式: {info['source']}")
+    return 0 if info['installed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 批量汉化工具（无界面）
+对多个 npm 全局前缀（nvm 各版本、用户前缀、容器镜像层等）中的 Codex CLI
+并行执行注入、恢复或状态检查，输出 JSON 汇总，适合批量部署和 CI
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import codex_patcher
+from codex_detect import PACKAGE_PARTS, candidate_roots, prefix_to_root, read_install
+
+ACTIONS = ('inject', 'restore', 'status')
+
+
+def resolve_target(path):
+    """把命令行给出的路径解析为 @openai/codex 安装目录
+
+    支持 npm 全局前缀、全局模块目录（node_modules）和包目录本身
+    """
+    path = Path(path).expanduser()
+    if (path / "bin" / "codex.js").exists() and path.name == PACKAGE_PARTS[-1]:
+        return path
+    if path.joinpath(*PACKAGE_PARTS).exists():
+        return path.joinpath(*PACKAGE_PARTS)
+    return prefix_to_root(path).joinpath(*PACKAGE_PARTS)
+
+
+def discover_targets():
+    """查找本机常见位置中已安装的 Codex CLI：检测模块使用的全局目录和 nvm 管理的各个 Node.js 版本"""
+    roots = list(candidate_roots())
+    nvm_dir = Path(os.environ.get('NVM_DIR') or Path.home() / ".nvm")
+    if sys.platform == "win32":
+        nvm_dir = Path(os.environ.get('NVM_HOME') or nvm_dir)
+        roots.extend(prefix_to_root(p) for p in sorted(nvm_dir.glob("v*")))
+    else:
+        roots.extend(prefix_to_root(p) for p in sorted((nvm_dir / "versions" / "node").glob("*")))
+    return [Path(root).joinpath(*PACKAGE_PARTS) for root in roots if read_install(root)['installed']]
+
+
+def read_targets_file(path):
+    """读取目标列表文件：每行一个路径，忽略空行和 # 开头的注释"""
+    targets = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                targets.append(line)
+    return targets
+
+
+def run_target(action, package_dir, force=False, launcher=False):
+    """在工作进程中处理一个安装目录，返回结构化结果"""
+    package_dir = Path(package_dir)
+    info = read_install(package_dir.parent.parent)
+    if not info['installed']:
+        result = codex_patcher.new_result(action)
+        result['package_dir'] = str(package_dir)
+        result['error'] = f"未找到 {package_dir / 'bin' / 'codex.js'}"
+    elif action == 'inject':
+        result = codex_patcher.inject(package_dir, force=force, launcher=launcher)
+    elif action == 'restore':
+        result = codex_patcher.restore(package_dir)
+    else:
+        result = codex_patcher.status(package_dir)
+    result['version'] = info['version']
+    return result
+
+
+def run_fleet(action, targets, workers=None, force=False, launcher=False):
+    """并行处理所有目标，返回汇总结果（结果顺序与输入一致）"""
+    start = time.perf_counter()
+    # 同一个安装目录只处理一次（按解析符号链接后的真实路径判断），避免两个进程同时写同一个文件
+    package_dirs = []
+    seen = set()
+    for target in targets:
+        package_dir = resolve_target(target)
+        real_dir = package_dir.resolve()
+        if real_dir not in seen:
+            seen.add(real_dir)
+            package_dirs.append(str(package_dir))
+
+    results = []
+    if package_dirs:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(package_dirs)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_target, action, package_dir, force, launcher)
+                       for package_dir in package_dirs]
+            for package_dir, future in zip(package_dirs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    result = codex_patcher.new_result(action)
+                    result['package_dir'] = package_dir
+                    result['error'] = str(e)
+                    results.append(result)
+
+    return {
+        'action': action,
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['success']),
+        'failed': sum(1 for r in results if not r['success']),
+        'unchanged': sum(1 for r in results if r.get('unchanged')),
+        'elapsed_ms': (time.perf_counter() - start) * 1000,
+        'results': results,
+    }
+
+
+def print_summary(summary):
+    """打印可读的汇总"""
+    for result in summary['results']:
+        version = f"v{result['version']}" if result.get('version') else "未安装"
+        if not result['success']:
+            print(f"❌ {result['package_dir']} ({version}): {result['error']}")
+        elif result['action'] == 'status':
+            state = "已汉化" if result['backup'] and result['artifact'] else "英文原版"
+            print(f"📋 {result['package_dir']} ({version}): {state}")
+        elif result.get('unchanged'):
+            print(f"✅ {result['package_dir']} ({version}): 已是最新")
+        else:
+            print(f"✅ {result['package_dir']} ({version}): 完成，用时 {result['elapsed_ms']:.1f} ms")
+        if result.get('launcher_skipped'):
+            print(f"   ⚠️ 已跳过快速启动器: {result['launcher_skipped']}")
+    print(f"\n🎉 共 {summary['total']} 个安装，成功 {summary['succeeded']}，失败 {summary['failed']}，"
+          f"总用时 {summary['elapsed_ms']:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="对多个 npm 全局前缀中的 Codex CLI 批量执行汉化、恢复或状态检查")
+    parser.add_argument('command', choices=ACTIONS)
+    parser.add_argument('targets', nargs='*', help="npm 全局前缀、node_modules 目录或 @openai/codex 包目录")
+    parser.add_argument('--from-file', help="从文件读取目标列表（每行一个路径）")
+    parser.add_argument('--discover', action='store_true', help="自动查找本机已安装的 Codex CLI（含 nvm 各版本）")
+    parser.add_argument('--workers', type=int, help="并行进程数（默认为 CPU 核数）")
+    parser.add_argument('--force', action='store_true', help="注入时即使模板和词典未变化也重新生成")
+    parser.add_argument('--launcher', action='store_true', help="注入时同时安装快速启动器（仅 Linux），不需要翻译的命令不再启动 node")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出汇总")
+    args = parser.parse_args(argv)
+
+    targets = list(args.targets)
+    if args.from_file:
+        targets.extend(read_targets_file(args.from_file))
+    if args.discover:
+        targets.extend(str(path) for path in discover_targets())
+    if not targets:
+        parser.error("请指定至少一个目标，或使用 --from-file / --discover")
+
+    summary = run_fleet(args.command, targets, workers=args.workers, force=args.force, launcher=args.launcher)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print_summary(summary)
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,19 @@ Codex CLI 汉化工具
 功能：检测、汉化 Codex CLI
 """
 
+# 启动时只导入显示窗口必需的模块；检测、汉化和打开链接用到的模块在首次使用时再导入
 import tkinter as tk
 from tkinter import messagebox
 import customtkinter as ctk
-import webbrowser
-import subprocess
-import os
 import sys
 import threading
-import re
 from pathlib import Path
 
 class CodexCLIGUI:
+    # 检测命令的超时秒数
+    NODE_PROBE = (["node", "--version"], 10)
+    CODEX_PROBE = (["codex", "--version"], 15)
+    
     def __init__(self):
         # 设置CustomTkinter暗黑模式
         ctk.set_appearance_mode("dark")  # 暗黑模式
@@ -41,7 +42,9 @@ class CodexCLIGUI:
             'installed': False,
             'version': '',
             'latest_version': '',
-            'checked': False
+            'checked': False,
+            'patched': False,
+            'package_dir': ''
         }
         
         self.npm_status = {
@@ -49,19 +52,34 @@ class CodexCLIGUI:
             'version': ''
         }
         
-        # 支持的版本
-        self.supported_versions = ["0.40.0"]
-        self.max_supported_version = "0.40.0"
+        # 已有翻译包的版本（translation-packs 目录），首次检测时读取
+        # 新版本自动使用不高于它的最新翻译包
+        self.supported_versions = None
+        self.max_supported_version = ''
+        
+        # 环境检测线程池（首次检测时创建）、已提交且未完成的任务和进行中的检测
+        self.executor = None
+        self.futures = set()
+        # 窗口关闭后，后台线程不再向界面线程投递回调
+        self.closed = False
+        self.pending_probes = set()
+        self.probe_processes = set()
+        self.detect_generation = 0
+        self.latest_future = None
         
         # 初始化状态变量
         self.status_var = tk.StringVar(value="就绪")
-        self.selected_version = tk.StringVar(value=self.max_supported_version)
+        # 当前安装版本对应的翻译包
+        self.selected_version = tk.StringVar(value="")
         
         # 创建界面
         self.create_widgets()
         
-        # 启动时检测
-        self.root.after(1000, self.detect_installation)
+        # 关闭窗口时先停止后台检测再销毁窗口
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # 窗口显示后，事件循环空闲时立即检测
+        self.root.after_idle(self.detect_installation)
     
     def create_widgets(self):
         """创建主界面组件"""
@@ -86,16 +104,16 @@ class CodexCLIGUI:
         subtitle_label.grid(row=1, column=0, pady=(0, 12))
         
         # 创建标签页
-        notebook = ctk.CTkTabview(self.root)
-        notebook.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 5))
+        self.notebook = ctk.CTkTabview(self.root, command=self.on_tab_changed)
+        self.notebook.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 5))
         
         # 添加标签页
-        notebook.add("🏠 主要功能")
-        notebook.add("ℹ️ 关于")
+        self.notebook.add("🏠 主要功能")
+        self.notebook.add("ℹ️ 关于")
         
-        # 创建标签页内容
-        self.create_main_tab(notebook.tab("🏠 主要功能"))
-        self.create_about_tab(notebook.tab("ℹ️ 关于"))
+        # 先创建主要功能标签页，关于标签页在第一次切换过去时再创建
+        self.create_main_tab(self.notebook.tab("🏠 主要功能"))
+        self.about_tab_created = False
         
         # 状态栏
         status_bar = ctk.CTkLabel(self.root, textvariable=self.status_var,
@@ -160,14 +178,14 @@ class CodexCLIGUI:
         version_title.grid(row=0, column=0, sticky="w", padx=12, pady=(8, 5))
         
         # 版本选择
-        version_label = ctk.CTkLabel(version_card, text="支持版本:",
+        version_label = ctk.CTkLabel(version_card, text="翻译包:",
                                     font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
                                     text_color="#FFFFFF")
         version_label.grid(row=1, column=0, sticky="w", padx=12, pady=(0, 3))
         
-        # 当前版本显示（只读）
+        # 使用的翻译包（只读）
         self.version_label = ctk.CTkLabel(version_card, 
-                                         text="0.40.0",
+                                         textvariable=self.selected_version,
                                          font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
                                          text_color="#00D4FF",
                                          fg_color="#2B2B2B",
@@ -211,7 +229,7 @@ class CodexCLIGUI:
         
         # 重要提示信息
         warning_info = ctk.CTkLabel(combined_frame, 
-                                   text="⚠️ 本工具专为 Codex CLI 0.40.0 版本设计，请确保版本匹配",
+                                   text="⚠️ 汉化会按安装的 Codex CLI 版本自动选择翻译包，新版本中新增的文本可能暂未翻译",
                                    font=ctk.CTkFont(family="微软雅黑", size=9, weight="bold"),
                                    text_color="#FBBF24",
                                    wraplength=600)
@@ -220,6 +238,12 @@ class CodexCLIGUI:
         # 初始状态
         self.update_ui_state()
         
+    def on_tab_changed(self):
+        """切换标签页：第一次打开关于标签页时创建其内容"""
+        if self.notebook.get() == "ℹ️ 关于" and not self.about_tab_created:
+            self.about_tab_created = True
+            self.create_about_tab(self.notebook.tab("ℹ️ 关于"))
+    
     def create_about_tab(self, about_tab):
         """创建关于标签页"""
         about_tab.columnconfigure(0, weight=1)
@@ -242,7 +266,7 @@ class CodexCLIGUI:
                                   text_color="#00D4FF",
                                   cursor="hand2")
         github_link.grid(row=1, column=0, pady=(0, 8))
-        github_link.bind("<Button-1>", lambda e: webbrowser.open("https://github.com/396001000/codex-Chinese"))
+        github_link.bind("<Button-1>", lambda e: self.open_url("https://github.com/396001000/codex-Chinese"))
         
         # 欢迎使用提示
         welcome_label = ctk.CTkLabel(title_frame, text="欢迎使用，请给项目一个小星星 ⭐",
@@ -275,7 +299,7 @@ class CodexCLIGUI:
 • 🔄 自动检测最新版本
 • 🌍 一键汉化CLI界面
 • 🔄 快速恢复英文原版
-• ⚡ 支持 0.40.0 版本
+• ⚡ 按版本自动选择翻译包
 • 🎯 专业界面操作"""
         
         features_label = ctk.CTkLabel(features_card, text=features_text,
@@ -293,7 +317,7 @@ class CodexCLIGUI:
                                     text_color="#00D4FF")
         version_title.grid(row=0, column=0, sticky="w", padx=15, pady=(15, 8))
         
-        version_text = f"""• 支持版本: {', '.join(self.supported_versions)}
+        version_text = f"""• 翻译包: {', '.join(self.load_supported_versions()) or '无'}
 • 基于 Python + CustomTkinter
 • MIT 开源许可证
 • 跨平台兼容
@@ -306,112 +330,203 @@ class CodexCLIGUI:
                                     justify="left")
         version_label.grid(row=1, column=0, sticky="w", padx=25, pady=(0, 15))
     
-    def run_command(self, cmd, timeout=30):
-        """运行命令并返回结果"""
+    def open_url(self, url):
+        """用默认浏览器打开链接"""
+        import webbrowser
+        webbrowser.open(url)
+    
+    def load_supported_versions(self):
+        """读取已有翻译包的版本（只读取一次）"""
+        if self.supported_versions is None:
+            import codex_patcher
+            self.supported_versions = codex_patcher.list_pack_versions()
+            self.max_supported_version = self.supported_versions[-1] if self.supported_versions else ''
+        return self.supported_versions
+    
+    def get_executor(self):
+        """返回环境检测线程池，第一次使用时创建"""
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="codex-probe")
+        return self.executor
+    
+    def submit(self, func, *args):
+        """把任务提交到检测线程池，记录下来以便关闭窗口时取消"""
+        future = self.get_executor().submit(func, *args)
+        self.futures.add(future)
+        future.add_done_callback(self.futures.discard)
+        return future
+    
+    def call_in_ui(self, func, *args):
+        """从后台线程把回调投递到界面线程执行；窗口已关闭时丢弃"""
+        if self.closed:
+            return
         try:
-            # 设置编码
-            encoding = 'utf-8'
-            if sys.platform.startswith('win'):
-                encoding = 'gbk'
-            
-            result = subprocess.run(
-                cmd, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                timeout=timeout,
-                encoding=encoding,
-                errors='ignore'
-            )
-            return result.returncode == 0, result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            return False, "", "命令超时"
+            self.root.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            # 检查之后窗口刚好被销毁
+            pass
+    
+    def run_probe(self, args, timeout):
+        """直接运行检测命令（不启动 shell），返回 (成功, 标准输出, 错误输出)"""
+        import shutil
+        import subprocess
+        
+        executable = shutil.which(args[0])
+        if not executable:
+            return False, "", f"未找到命令: {args[0]}"
+        
+        encoding = 'gbk' if sys.platform.startswith('win') else 'utf-8'
+        try:
+            process = subprocess.Popen([executable] + args[1:],
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, encoding=encoding, errors='ignore')
         except Exception as e:
             return False, "", str(e)
+        
+        # 记录运行中的检测进程，关闭窗口时终止，避免退出时等待超时
+        self.probe_processes.add(process)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+            return process.returncode == 0, stdout, stderr
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            return False, "", "命令超时"
+        finally:
+            self.probe_processes.discard(process)
+    
+    def shutdown(self):
+        """停止仍在运行的检测：取消排队的任务，终止检测进程，之后的回调不再投递到界面线程"""
+        self.closed = True
+        # Python 3.9 之前 shutdown 没有 cancel_futures 参数，逐个取消
+        for future in list(self.futures):
+            future.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        for process in list(self.probe_processes):
+            try:
+                process.kill()
+            except OSError:
+                pass
+    
+    def close(self):
+        """关闭窗口：先停止后台检测，再销毁窗口"""
+        self.shutdown()
+        self.root.destroy()
     
     def detect_installation(self):
-        """检测 Node.js 和 Codex CLI 安装状态"""
+        """检测 Node.js 和 Codex CLI 安装状态，各项检测并行执行，结果逐项更新"""
         self.status_var.set("正在检测环境...")
+        self.load_supported_versions()
         
         # 禁用按钮
         self.check_update_btn.configure(state="disabled")
         
-        def detect_thread():
-            # 检测 Node.js
-            success, stdout, stderr = self.run_command("node --version")
-            if success:
-                self.npm_status['installed'] = True
-                self.npm_status['version'] = stdout.strip()
-            else:
-                self.npm_status['installed'] = False
-                self.npm_status['version'] = ''
+        # 重复点击时只采用最新一轮的检测结果
+        self.detect_generation += 1
+        generation = self.detect_generation
+        probes = {
+            'node': lambda: self.run_probe(*self.NODE_PROBE),
+            'codex': self.probe_codex,
+        }
+        self.pending_probes = set(probes)
+        self.update_detection_result()
+        self.update_ui_state()
+        
+        for name, probe in probes.items():
+            future = self.submit(probe)
+            future.add_done_callback(
+                lambda f, name=name: self.call_in_ui(self.apply_probe_result, generation, name, f))
+        
+        # 后台预取最新版本（缓存未过期时不发请求），点击“检测新版”时无需等待
+        if self.latest_future is None or self.latest_future.done():
+            self.latest_future = self.submit(self.fetch_latest_version)
+    
+    def fetch_latest_version(self, force=False):
+        """查询 npm 仓库中的最新版本（不启动 npm 进程，结果带本地缓存）"""
+        from registry_client import get_latest_version
+        
+        return get_latest_version(force=force)
+    
+    def probe_codex(self):
+        """直接读取 npm 全局目录中的 Codex CLI 安装信息，找不到时再运行 codex --version"""
+        from codex_detect import detect_codex
+        
+        try:
+            info = detect_codex()
+        except Exception:
+            info = None
+        if info and info['installed']:
+            return True, info['version'], "", info
+        success, stdout, stderr = self.run_probe(*self.CODEX_PROBE)
+        return success, stdout, stderr, None
+    
+    def apply_probe_result(self, generation, name, future):
+        """在界面线程中应用一项检测结果"""
+        if generation != self.detect_generation:
+            return
+        
+        try:
+            success, stdout, stderr, *extra = future.result()
+        except Exception as e:
+            success, stdout, stderr, extra = False, "", str(e), []
+        
+        if name == 'node':
+            # Node.js 检测结果
+            self.npm_status['installed'] = success
+            self.npm_status['version'] = stdout.strip() if success else ''
+        elif name == 'codex':
+            import re
+            from translation_packs import resolve_pack_version
             
-            # 检测 Codex CLI
-            success, stdout, stderr = self.run_command("codex --version")
-            if success:
-                # 提取版本号
-                version_match = re.search(r'(\d+\.\d+\.\d+)', stdout)
-                if version_match:
-                    version = version_match.group(1)
-                    self.codex_status['installed'] = True
-                    self.codex_status['version'] = version
-                    self.codex_status['checked'] = True
-                else:
-                    self.codex_status['installed'] = False
-                    self.codex_status['version'] = ''
+            # 提取 Codex CLI 版本号
+            version_match = re.search(r'(\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?)', stdout) if success else None
+            install = extra[0] if extra else None
+            if version_match:
+                self.codex_status['installed'] = True
+                self.codex_status['version'] = version_match.group(1)
+                self.codex_status['checked'] = True
             else:
                 self.codex_status['installed'] = False
                 self.codex_status['version'] = ''
-            
-            # 更新UI
-            def update_ui():
-                self.update_detection_result()
-                self.update_ui_state()
-                # 启用检测新版按钮（如果已安装）
-                if self.codex_status['installed']:
-                    self.check_update_btn.configure(state="normal")
-                else:
-                    self.check_update_btn.configure(state="disabled")
-            
-            self.root.after(0, update_ui)
+            self.codex_status['patched'] = bool(install and install['patched'])
+            self.codex_status['package_dir'] = install['package_dir'] if install else ''
+            pack = resolve_pack_version(self.codex_status['version'], self.supported_versions)
+            self.selected_version.set(pack or "基础词典")
+        
+        self.pending_probes.discard(name)
+        self.update_detection_result()
+        self.update_ui_state()
         
-        threading.Thread(target=detect_thread, daemon=True).start()
+        # 全部检测完成后启用检测新版按钮（如果已安装）
+        if not self.pending_probes:
+            if self.codex_status['installed']:
+                self.check_update_btn.configure(state="normal")
+            else:
+                self.check_update_btn.configure(state="disabled")
     
     def check_for_updates(self):
-        """检测Codex CLI新版本"""
+        """检测Codex CLI新版本（优先使用启动时预取的结果）"""
         if not self.codex_status.get('installed', False):
             return
             
         self.status_var.set("正在检测新版本...")
         self.check_update_btn.configure(state="disabled", text="检测中...")
         
-        def update_thread():
-            try:
-                self.detect_latest_version()
-                
-                # 更新UI
-                def update_ui():
-                    self.update_detection_result()
-                    self.update_ui_state()
-                    self.check_update_btn.configure(state="normal", text="🔄 检测新版")
-                
-                self.root.after(0, update_ui)
-            except Exception as e:
-                def update_ui():
-                    self.status_var.set(f"检测新版本失败: {str(e)}")
-                    self.check_update_btn.configure(state="normal", text="🔄 检测新版")
-                
-                self.root.after(0, update_ui)
-        
-        threading.Thread(target=update_thread, daemon=True).start()
+        future = self.latest_future
+        if future is None:
+            future = self.submit(self.fetch_latest_version, True)
+        # 预取结果只使用一次，再次点击时向仓库发送条件请求
+        self.latest_future = None
+        future.add_done_callback(lambda f: self.call_in_ui(self.apply_latest_version, f))
     
-    def detect_latest_version(self):
-        """检测 Codex CLI 最新版本"""
+    def apply_latest_version(self, future):
+        """在界面线程中应用最新版本的查询结果"""
         try:
-            # 使用 npm view 获取最新版本信息
-            success, stdout, stderr = self.run_command("npm view @openai/codex version")
-            if success:
-                latest_version = stdout.strip().strip('"')
+            result = future.result()
+            if result['success']:
+                latest_version = result['version']
                 self.codex_status['latest_version'] = latest_version
                 
                 # 比较版本
@@ -423,26 +538,29 @@ class CodexCLIGUI:
             else:
                 self.codex_status['latest_version'] = '未知'
                 self.codex_status['update_available'] = False
+            
+            self.update_detection_result()
+            self.update_ui_state()
+            if result['source'] == 'offline':
+                from registry_client import format_age
+                
+                if result['success']:
+                    cached = f"{format_age(result['age'])}前的" if result['age'] is not None else "缓存的"
+                    self.status_var.set(f"无法连接 npm 仓库，显示{cached}查询结果")
+                else:
+                    self.status_var.set(f"检测新版本失败: {result['error']}")
         except Exception as e:
-            self.codex_status['latest_version'] = '检测失败'
-            self.codex_status['update_available'] = False
+            self.status_var.set(f"检测新版本失败: {str(e)}")
+        finally:
+            self.check_update_btn.configure(state="normal", text="🔄 检测新版")
     
     def compare_versions(self, v1, v2):
-        """比较版本号，返回 1 如果 v1 > v2，-1 如果 v1 < v2，0 如果相等"""
-        def version_tuple(v):
-            return tuple(map(int, v.split('.')))
+        """按语义化版本比较，返回 1 如果 v1 > v2，-1 如果 v1 < v2，0 如果相等或无法比较"""
+        from translation_packs import compare_versions
         
         try:
-            v1_tuple = version_tuple(v1)
-            v2_tuple = version_tuple(v2)
-            
-            if v1_tuple > v2_tuple:
-                return 1
-            elif v1_tuple < v2_tuple:
-                return -1
-            else:
-                return 0
-        except:
+            return compare_versions(v1, v2)
+        except ValueError:
             return 0
     
     def update_detection_result(self):
@@ -452,7 +570,12 @@ class CodexCLIGUI:
             widget.destroy()
         
         # Node.js 状态
-        if self.npm_status['installed']:
+        if 'node' in self.pending_probes:
+            node_status = ctk.CTkLabel(self.status_frame, 
+                                      text="⏳ Node.js: 检测中...",
+                                      font=ctk.CTkFont(family="微软雅黑", size=11),
+                                      text_color="#CCCCCC")
+        elif self.npm_status['installed']:
             node_status = ctk.CTkLabel(self.status_frame, 
                                       text=f"✅ Node.js: {self.npm_status['version']}",
                                       font=ctk.CTkFont(family="微软雅黑", size=11),
@@ -465,9 +588,15 @@ class CodexCLIGUI:
         node_status.grid(row=0, column=0, sticky="w", pady=(0, 3))
         
         # Codex CLI 状态
-        if self.codex_status['installed']:
+        if 'codex' in self.pending_probes:
             codex_status = ctk.CTkLabel(self.status_frame, 
-                                       text=f"✅ Codex CLI: v{self.codex_status['version']}",
+                                       text="⏳ Codex CLI: 检测中...",
+                                       font=ctk.CTkFont(family="微软雅黑", size=11),
+                                       text_color="#CCCCCC")
+        elif self.codex_status['installed']:
+            codex_status = ctk.CTkLabel(self.status_frame, 
+                                       text=f"✅ Codex CLI: v{self.codex_status['version']}" +
+                                            (" (已汉化)" if self.codex_status.get('patched') else ""),
                                        font=ctk.CTkFont(family="微软雅黑", size=11),
                                        text_color="#4ADE80")
             
@@ -515,7 +644,7 @@ class CodexCLIGUI:
         
         version_text = f"当前: {current_version}"
         if current_version != '未检测':
-            version_text += f"\n选择: {selected_version}"
+            version_text += f"\n翻译包: {selected_version}"
             if latest_version != '未知':
                 version_text += f"\n最新: {latest_version}"
         
@@ -524,35 +653,27 @@ class CodexCLIGUI:
                                          text_color="#CCCCCC")
         version_info_label.grid(row=1, column=0, sticky="w")
         
-        # 版本匹配状态和支持状态
-        version_matched = (current_version == selected_version)
-        is_supported = self.is_version_supported(current_version) if current_version != '未检测' else True
-        
-        # 向下兼容检查
-        is_compatible = version_matched or (is_supported and self.is_version_supported(selected_version) and 
-                                          self.compare_versions_for_compatibility(current_version, selected_version))
+        # 版本号能识别即可汉化：早于所有翻译包时只使用基础词典，新于所有翻译包时使用最新的翻译包
+        is_supported = self.is_version_supported(current_version)
+        version_matched = current_version in self.load_supported_versions()
         
         if current_version != '未检测':
             if not is_supported:
-                status_label = ctk.CTkLabel(self.version_info_frame, text="⚠️ 版本过高，不支持汉化",
+                status_label = ctk.CTkLabel(self.version_info_frame, text="⚠️ 无法识别版本号",
                                            font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
                                            text_color="#FF6B6B")
             elif version_matched:
                 status_label = ctk.CTkLabel(self.version_info_frame, text="✅ 版本匹配",
                                            font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
                                            text_color="#4ADE80")
-            elif is_compatible:
+            else:
                 status_label = ctk.CTkLabel(self.version_info_frame, text="✅ 版本兼容",
                                            font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
                                            text_color="#4ADE80")
-            else:
-                status_label = ctk.CTkLabel(self.version_info_frame, text="❌ 版本不兼容",
-                                           font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
-                                           text_color="#F87171")
             status_label.grid(row=2, column=0, sticky="w", pady=(5, 0))
         
-        # 更新按钮状态 - 版本支持且兼容就能汉化
-        can_translate = self.codex_status.get('installed', False) and is_compatible and is_supported
+        # 更新按钮状态 - 版本号可识别就能汉化
+        can_translate = self.codex_status.get('installed', False) and is_supported
         self.translate_btn.configure(state="normal" if can_translate else "disabled")
         self.restore_btn.configure(state="normal" if self.codex_status.get('installed', False) else "disabled")
         
@@ -561,56 +682,36 @@ class CodexCLIGUI:
             widget.destroy()
         
         if not can_translate and self.codex_status.get('installed', False):
-            if not is_supported:
-                warning_label = ctk.CTkLabel(self.warning_frame, 
-                                            text=f"⚠️ v{current_version} 版本过高，不支持汉化\n最高支持版本：v{self.max_supported_version}",
-                                            font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
-                                            text_color="#FF6B6B")
-                warning_label.grid(row=0, column=0)
-            elif not is_compatible:
-                selected_version = self.selected_version.get()
-                warning_label = ctk.CTkLabel(self.warning_frame, 
-                                            text=f"⚠️ 版本不兼容\n当前v{current_version}不兼容选择的v{selected_version}\n请选择v{current_version}或更低版本",
-                                            font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
-                                            text_color="#FBBF24")
-                warning_label.grid(row=0, column=0)
+            warning_label = ctk.CTkLabel(self.warning_frame, 
+                                        text=f"⚠️ 无法识别版本号 v{current_version}\n请重新安装 Codex CLI 后再试",
+                                        font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
+                                        text_color="#FF6B6B")
+            warning_label.grid(row=0, column=0)
+        elif self.codex_status.get('installed', False) and not version_matched and self.max_supported_version \
+                and self.compare_versions(current_version, self.max_supported_version) > 0:
+            warning_label = ctk.CTkLabel(self.warning_frame, 
+                                        text=f"💡 v{current_version} 暂无专用翻译包\n将使用 v{self.max_supported_version} 翻译包",
+                                        font=ctk.CTkFont(family="微软雅黑", size=11, weight="bold"),
+                                        text_color="#FBBF24")
+            warning_label.grid(row=0, column=0)
     
     def is_version_supported(self, version):
-        """检查版本是否支持"""
-        if not version or version == '未检测':
-            return True
+        """检查版本是否支持（版本号符合语义化版本格式即可）"""
+        from translation_packs import parse_version
         
-        try:
-            # 检查版本是否在支持列表中
-            if version in self.supported_versions:
-                return True
-            
-            # 检查是否高于最高支持版本
-            if self.compare_versions(version, self.max_supported_version) > 0:
-                return False
-            
-            # 检查是否在支持范围内（向下兼容）
-            for supported_ver in self.supported_versions:
-                if self.compare_versions(version, supported_ver) <= 0:
-                    return True
-            
-            return False
-        except:
-            return True
-    
-    def compare_versions_for_compatibility(self, current, selected):
-        """检查版本兼容性（向下兼容）"""
-        try:
-            # 当前版本应该 >= 选择版本（向下兼容）
-            return self.compare_versions(current, selected) >= 0
-        except:
+        if not version or version == '未检测':
             return True
+        return parse_version(version) is not None
     
     
     def update_ui_state(self):
         """更新界面状态"""
         # 根据检测结果更新按钮状态
-        if not self.codex_status.get('installed', False):
+        if self.pending_probes:
+            self.translate_btn.configure(state="disabled")
+            self.restore_btn.configure(state="disabled")
+            self.status_var.set("正在检测环境...")
+        elif not self.codex_status.get('installed', False):
             self.translate_btn.configure(state="disabled")
             self.restore_btn.configure(state="disabled")
             self.status_var.set("请先安装 Codex CLI")
@@ -623,37 +724,6 @@ class CodexCLIGUI:
             self.update_version_info()
             self.status_var.set("就绪")
     
-    def get_script_path(self):
-        """获取汉化脚本路径，支持打包后的环境"""
-        script_name = "inject-chinese-final-dedup.js"
-        
-        # 尝试多个可能的路径
-        possible_paths = []
-        
-        # 1. 如果是打包后的环境，检查临时目录
-        if hasattr(sys, '_MEIPASS'):
-            # PyInstaller 打包后的临时目录
-            possible_paths.append(Path(sys._MEIPASS) / "scripts" / script_name)
-        elif hasattr(sys, 'frozen') and sys.frozen:
-            # Nuitka 打包后，脚本在可执行文件同级的scripts目录
-            exe_dir = Path(sys.executable).parent
-            possible_paths.append(exe_dir / "scripts" / script_name)
-        
-        # 2. 开发环境路径
-        current_dir = Path(__file__).parent
-        possible_paths.extend([
-            current_dir / "scripts" / script_name,  # 打包时复制到的scripts目录
-            current_dir / script_name,              # 当前目录
-            current_dir.parent / script_name        # 上级目录
-        ])
-        
-        # 查找存在的脚本文件
-        for path in possible_paths:
-            if path.exists():
-                return path
-        
-        return None
-    
     def start_translation(self):
         """开始汉化过程"""
         if not self.codex_status.get('installed', False):
@@ -663,7 +733,7 @@ class CodexCLIGUI:
         # 确认对话框
         result = messagebox.askyesno("确认汉化", 
                                    f"确定要汉化 Codex CLI v{self.codex_status['version']} 吗？\n\n" +
-                                   f"选择版本: {self.selected_version.get()}\n" +
+                                   f"翻译包: {self.selected_version.get()}\n" +
                                    "这将替换原有的英文界面。")
         if not result:
             return
@@ -671,32 +741,31 @@ class CodexCLIGUI:
         self.status_var.set("正在汉化...")
         self.translate_btn.configure(state="disabled", text="汉化中...")
         
+        package_dir = self.codex_status.get('package_dir') or None
+        
         def translate_thread():
+            import codex_patcher
+            
             try:
-                # 获取汉化脚本路径
-                script_path = self.get_script_path()
-                if not script_path:
-                    raise Exception("找不到汉化脚本文件 inject-chinese-final-dedup.js")
-                
-                # 执行汉化 - 切换到脚本所在目录
-                script_dir = script_path.parent
-                cmd = f'cd /d "{script_dir}" && node "{script_path.name}" inject'
-                success, stdout, stderr = self.run_command(cmd, timeout=60)
+                # 在进程内执行汉化，不需要启动 node
+                result = codex_patcher.inject(package_dir)
                 
                 def update_ui():
                     self.translate_btn.configure(state="normal", text="✨ 一键汉化")
-                    if success:
+                    if result['success']:
                         messagebox.showinfo("汉化成功", 
                                           "🎉 Codex CLI 汉化完成！\n\n" +
                                           "现在可以使用中文界面了。\n" +
                                           "如需恢复英文，请点击\"恢复原版\"。")
-                        self.status_var.set("汉化完成")
+                        self.status_var.set("汉化已是最新" if result.get('unchanged') else "汉化完成")
+                        # 刷新安装状态（检测缓存按文件修改时间自动失效）
+                        self.detect_installation()
                     else:
-                        error_msg = stderr or "未知错误"
+                        error_msg = result['error'] or "未知错误"
                         messagebox.showerror("汉化失败", f"汉化过程中出现错误：\n{error_msg}")
                         self.status_var.set("汉化失败")
                 
-                self.root.after(0, update_ui)
+                self.call_in_ui(update_ui)
                 
             except Exception as e:
                 def update_ui():
@@ -704,7 +773,7 @@ class CodexCLIGUI:
                     messagebox.showerror("汉化失败", f"汉化失败：\n{str(e)}")
                     self.status_var.set("汉化失败")
                 
-                self.root.after(0, update_ui)
+                self.call_in_ui(update_ui)
         
         threading.Thread(target=translate_thread, daemon=True).start()
     
@@ -724,31 +793,30 @@ class CodexCLIGUI:
         self.status_var.set("正在恢复...")
         self.restore_btn.configure(state="disabled", text="恢复中...")
         
+        package_dir = self.codex_status.get('package_dir') or None
+        
         def restore_thread():
+            import codex_patcher
+            
             try:
-                # 获取汉化脚本路径
-                script_path = self.get_script_path()
-                if not script_path:
-                    raise Exception("找不到汉化脚本文件 inject-chinese-final-dedup.js")
-                
-                # 执行恢复 - 切换到脚本所在目录
-                script_dir = script_path.parent
-                cmd = f'cd /d "{script_dir}" && node "{script_path.name}" restore'
-                success, stdout, stderr = self.run_command(cmd, timeout=60)
+                # 在进程内执行恢复
+                result = codex_patcher.restore(package_dir)
                 
                 def update_ui():
                     self.restore_btn.configure(state="normal", text="🔄 恢复原版")
-                    if success:
+                    if result['success']:
                         messagebox.showinfo("恢复成功", 
                                           "✅ Codex CLI 已恢复为英文原版！\n\n" +
                                           "现在界面已恢复为英文显示。")
                         self.status_var.set("恢复完成")
+                        # 刷新安装状态（检测缓存按文件修改时间自动失效）
+                        self.detect_installation()
                     else:
-                        error_msg = stderr or "未知错误"
+                        error_msg = result['error'] or "未知错误"
                         messagebox.showerror("恢复失败", f"恢复过程中出现错误：\n{error_msg}")
                         self.status_var.set("恢复失败")
                 
-                self.root.after(0, update_ui)
+                self.call_in_ui(update_ui)
                 
             except Exception as e:
                 def update_ui():
@@ -756,13 +824,22 @@ class CodexCLIGUI:
                     messagebox.showerror("恢复失败", f"恢复失败：\n{str(e)}")
                     self.status_var.set("恢复失败")
                 
-                self.root.after(0, update_ui)
+                self.call_in_ui(update_ui)
         
         threading.Thread(target=restore_thread, daemon=True).start()
 
 def main():
+    if '--self-test' in sys.argv[1:]:
+        # 自检不创建窗口，无显示器时也能运行
+        import codex_selftest
+        sys.exit(codex_selftest.main(sys.argv[1:]))
+    
     app = CodexCLIGUI()
+    if '--startup-probe' in sys.argv[1:]:
+        # 打包脚本测量启动时间：窗口显示后（事件循环第一次空闲）立即退出
+        app.root.after_idle(app.close)
     app.root.mainloop()
+    app.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化注入引擎（Python 实现）
+与 inject-chinese-final-dedup.js 共用包装脚本模板和词典，生成完全相同的文件，
+图形界面直接在进程内执行注入和恢复，不需要启动 node
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import sys
+import time
+from pathlib import Path
+
+from codex_detect import detect_codex
+from codex_paths import write_file_atomic
+from compile_translations import load_js_translations
+from translation_engine import TranslationTrie, normalize_translations
+from translation_packs import (PACKS_DIR_NAME, apply_packs, load_packs, pack_chain, resolve_pack_version,
+                               sorted_versions)
+
+INJECTOR_NAME = "inject-chinese-final-dedup.js"
+WRAPPER_TEMPLATE_NAME = "codex-wrapper.template.js"
+COMPILED_TRANSLATIONS_NAME = "codex-translations-compiled.json"
+LAUNCHER_TEMPLATE_NAME = "codex-launcher.template.sh"
+
+BACKUP_NAME = "codex.original.js"
+TRANSLATION_ARTIFACT_NAME = "codex-zh-translations.json"
+TRANSLATION_ARTIFACT_FORMAT = "codex-zh-trie"
+TRANSLATION_ARTIFACT_VERSION = 3
+
+# 生成的 codex.js 开头记录输入指纹，模板和词典都未变化时跳过重新生成
+FINGERPRINT_PATTERN = re.compile(rb"codex-zh-fingerprint: ([0-9a-f]{16})")
+FINGERPRINT_HEADER_BYTES = 512
+
+# 快速启动器只支持 Linux：原生二进制文件名与 codex.js 选择的目标三元组一致
+LAUNCHER_NAME = "codex-zh-launcher"
+LAUNCHER_TRIPLES = {
+    'x86_64': "x86_64-unknown-linux-musl",
+    'amd64': "x86_64-unknown-linux-musl",
+    'aarch64': "aarch64-unknown-linux-musl",
+    'arm64': "aarch64-unknown-linux-musl",
+}
+
+
+def find_resource(name):
+    """查找随工具发布的脚本和数据文件，支持打包后的环境"""
+    possible_paths = []
+
+    # 1. 打包后的环境
+    if hasattr(sys, '_MEIPASS'):
+        # PyInstaller 打包后的临时目录
+        possible_paths.append(Path(sys._MEIPASS) / "scripts" / name)
+    elif getattr(sys, 'frozen', False):
+        # Nuitka 打包后，脚本在可执行文件同级的scripts目录
+        possible_paths.append(Path(sys.executable).parent / "scripts" / name)
+
+    # 2. 开发环境路径
+    current_dir = Path(__file__).parent
+    possible_paths.extend([
+        current_dir / "scripts" / name,  # 打包时复制到的scripts目录
+        current_dir / name,              # 当前目录
+        current_dir.parent / name        # 上级目录
+    ])
+
+    for path in possible_paths:
+        if path.exists():
+            return path
+    return None
+
+
+def to_js_json(value):
+    """序列化为与 JavaScript JSON.stringify 相同的文本"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_base_translations():
+    """加载基础词典：优先使用编译后的词典，缺失时退回注入脚本中的内置翻译表
+
+    返回 (翻译列表, 合并前的原始条目数)
+    """
+    compiled_path = find_resource(COMPILED_TRANSLATIONS_NAME)
+    if compiled_path:
+        try:
+            with open(compiled_path, 'r', encoding='utf-8') as f:
+                compiled = json.load(f)
+            return compiled['translations'], compiled.get('source_entries', len(compiled['translations']))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    injector_path = find_resource(INJECTOR_NAME)
+    if not injector_path:
+        raise FileNotFoundError(f"找不到词典文件 {COMPILED_TRANSLATIONS_NAME} 或 {INJECTOR_NAME}")
+    translations = load_js_translations(injector_path)
+    return translations, len(translations)
+
+
+def load_runtime_translations(codex_version=None):
+    """加载注入使用的翻译表：基础词典加上与 Codex CLI 版本对应的翻译包
+
+    返回 (翻译列表, 原始条目数, 使用的翻译包版本或 None)
+    """
+    translations, source_entries = load_base_translations()
+    packs = load_packs(find_resource(PACKS_DIR_NAME))
+    pack = resolve_pack_version(codex_version, list(packs))
+    if pack:
+        translations, added = apply_packs(translations, pack_chain(packs, pack))
+        source_entries += added
+    return translations, source_entries, pack
+
+
+def list_pack_versions():
+    """列出已有翻译包的版本（从旧到新），翻译包目录缺失或损坏时返回空列表"""
+    try:
+        return sorted_versions(load_packs(find_resource(PACKS_DIR_NAME)))
+    except (OSError, ValueError):
+        return []
+
+
+def read_package_version(package_dir):
+    """读取安装目录 package.json 中的版本号，读取失败时返回空字符串"""
+    try:
+        with open(Path(package_dir) / "package.json", 'r', encoding='utf-8') as f:
+            return str(json.load(f).get('version', ''))
+    except (OSError, ValueError):
+        return ''
+
+
+def build_translation_artifact(translations, stats):
+    """生成带格式版本和内容哈希的紧凑翻译数据（与注入脚本的 buildTranslationArtifact 一致）"""
+    compiled = TranslationTrie(translations).compile()
+    digest = hashlib.sha256(to_js_json(compiled).encode('utf-8')).hexdigest()[:16]
+    return {
+        'format': TRANSLATION_ARTIFACT_FORMAT,
+        'version': TRANSLATION_ARTIFACT_VERSION,
+        'hash': digest,
+        'stats': stats,
+        'values': compiled['values'],
+        'scopes': compiled['scopes'],
+        'sections': compiled['sections'],
+        'rules': compiled['rules'],
+        'templates': compiled['templates'],
+        'nodes': compiled['nodes'],
+    }
+
+
+def load_wrapper_template():
+    """读取包装脚本模板"""
+    template_path = find_resource(WRAPPER_TEMPLATE_NAME)
+    if not template_path:
+        raise FileNotFoundError(f"找不到包装脚本模板 {WRAPPER_TEMPLATE_NAME}")
+    # 按原样读取，保持与 Node.js 生成的文件逐字节一致
+    return template_path.read_bytes().decode('utf-8')
+
+
+def compute_fingerprint(template, translations, source_entries, pack):
+    """计算模板和词典的指纹（与注入脚本的 computeFingerprint 一致）"""
+    digest = hashlib.sha256()
+    digest.update(template.encode('utf-8'))
+    digest.update(b"\n")
+    digest.update(f"{TRANSLATION_ARTIFACT_FORMAT}/{TRANSLATION_ARTIFACT_VERSION}".encode('utf-8'))
+    digest.update(b"\n")
+    digest.update(to_js_json({'sourceEntries': source_entries, 'pack': pack, 'translations': translations}).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def read_installed_fingerprint(codex_js):
+    """读取已安装 codex.js 开头的指纹，不是汉化版时返回 None"""
+    try:
+        with open(codex_js, 'rb') as f:
+            header = f.read(FINGERPRINT_HEADER_BYTES)
+    except OSError:
+        return None
+    match = FINGERPRINT_PATTERN.search(header)
+    return match.group(1).decode('ascii') if match else None
+
+
+def render_wrapper_template(template, artifact, fingerprint):
+    """用翻译数据的信息填充包装脚本模板"""
+    return (template
+            .replace('__CODEX_ZH_FINGERPRINT__', fingerprint)
+            .replace('__CODEX_ZH_ARTIFACT_NAME__', TRANSLATION_ARTIFACT_NAME)
+            .replace('__CODEX_ZH_ARTIFACT_FORMAT__', TRANSLATION_ARTIFACT_FORMAT)
+            .replace('__CODEX_ZH_ARTIFACT_VERSION__', str(TRANSLATION_ARTIFACT_VERSION))
+            .replace('__CODEX_ZH_ARTIFACT_HASH__', artifact['hash']))
+
+
+def get_launcher_triple():
+    """当前平台的原生二进制文件目标三元组，不支持快速启动器时返回 None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    return LAUNCHER_TRIPLES.get(platform.machine().lower())
+
+
+def get_bin_link_path(package_dir):
+    """npm 全局安装时在 <前缀>/bin/codex 创建指向 bin/codex.js 的符号链接"""
+    return Path(os.path.normpath(Path(package_dir).absolute() / ".." / ".." / ".." / ".." / "bin" / "codex"))
+
+
+def _realpath_or_none(path):
+    return os.path.realpath(path) if os.path.exists(path) else None
+
+
+def read_bin_link(link_path):
+    """读取符号链接最终指向的文件，不是符号链接时返回 None"""
+    return os.path.realpath(link_path) if os.path.islink(link_path) and os.path.exists(link_path) else None
+
+
+def point_bin_link(link_path, target):
+    """原子地把符号链接改为指向 target（相对路径，与 npm 创建的链接形式相同）"""
+    tmp = link_path.with_name(f"{link_path.name}.{os.getpid()}.tmp")
+    os.symlink(os.path.relpath(target, link_path.parent), tmp)
+    try:
+        os.replace(tmp, link_path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def render_launcher_template(template, bin_dir, triple):
+    """用安装路径填充快速启动器模板（路径放在 sh 单引号中，与注入脚本的 renderLauncherTemplate 一致）"""
+    return (template
+            .replace('__CODEX_ZH_BIN_DIR__', str(bin_dir).replace("'", "'\\''"))
+            .replace('__CODEX_ZH_TARGET_TRIPLE__', triple))
+
+
+def install_launcher(package_dir):
+    """安装快速启动器：不需要翻译的命令由启动器直接 exec 原生二进制文件
+
+    返回 (是否已安装, 跳过原因)
+    """
+    triple = get_launcher_triple()
+    if not triple:
+        return False, f"快速启动器只支持 Linux x64/arm64，当前为 {sys.platform} {platform.machine()}"
+    bin_dir = Path(package_dir).absolute() / "bin"
+    if not (bin_dir / f"codex-{triple}").exists():
+        return False, f"未找到原生二进制文件 codex-{triple}"
+    launcher = bin_dir / LAUNCHER_NAME
+    link_path = get_bin_link_path(package_dir)
+    current = read_bin_link(link_path)
+    if not current or current not in (_realpath_or_none(bin_dir / "codex.js"), _realpath_or_none(launcher)):
+        return False, f"{link_path} 不是指向 codex.js 的符号链接"
+
+    template_path = find_resource(LAUNCHER_TEMPLATE_NAME)
+    if not template_path:
+        raise FileNotFoundError(f"找不到快速启动器模板 {LAUNCHER_TEMPLATE_NAME}")
+    template = template_path.read_bytes().decode('utf-8')
+    write_file_atomic(launcher, render_launcher_template(template, bin_dir, triple).encode('utf-8'), 0o755)
+    if current != _realpath_or_none(launcher):
+        point_bin_link(link_path, launcher)
+    return True, ''
+
+
+def remove_launcher(package_dir):
+    """删除快速启动器并把符号链接改回指向 codex.js，返回是否删除了启动器"""
+    bin_dir = Path(package_dir).absolute() / "bin"
+    launcher = bin_dir / LAUNCHER_NAME
+    if not launcher.exists():
+        return False
+    link_path = get_bin_link_path(package_dir)
+    if read_bin_link(link_path) == _realpath_or_none(launcher):
+        point_bin_link(link_path, bin_dir / "codex.js")
+    launcher.unlink()
+    return True
+
+
+def is_launcher_installed(package_dir):
+    """快速启动器是否已安装并生效"""
+    launcher = Path(package_dir).absolute() / "bin" / LAUNCHER_NAME
+    return launcher.exists() and read_bin_link(get_bin_link_path(package_dir)) == _realpath_or_none(launcher)
+
+
+def resolve_package_dir(package_dir=None):
+    """确定 @openai/codex 的安装目录"""
+    if package_dir:
+        return Path(package_dir)
+    info = detect_codex()
+    if not info['installed']:
+        raise FileNotFoundError("未找到全局安装的 @openai/codex 包，请先运行: npm install -g @openai/codex")
+    return Path(info['package_dir'])
+
+
+def new_result(action):
+    return {
+        'success': False,
+        'action': action,
+        'package_dir': '',
+        'changes': [],
+        'error': '',
+        'elapsed_ms': 0.0,
+    }
+
+
+def backup_original_files(bin_dir):
+    """备份原始 codex.js（已有备份或已经是汉化版时不覆盖），返回是否新建了备份"""
+    codex_js = bin_dir / "codex.js"
+    backup = bin_dir / BACKUP_NAME
+    if codex_js.exists() and not backup.exists() and not read_installed_fingerprint(codex_js):
+        write_file_atomic(backup, codex_js.read_bytes(), codex_js.stat().st_mode & 0o777)
+        return True
+    return False
+
+
+def _apply_launcher(result, package_dir):
+    """注入时安装快速启动器，结果记录在 launcher 和 launcher_skipped 中"""
+    installed, reason = install_launcher(package_dir)
+    result['launcher'] = installed
+    if installed:
+        result['changes'].append(f"已安装快速启动器 {get_bin_link_path(package_dir)} → {LAUNCHER_NAME}")
+    else:
+        result['launcher_skipped'] = reason
+
+
+def inject(package_dir=None, force=False, launcher=False):
+    """注入汉化，返回结构化结果；模板和词典都未变化时跳过（force=True 强制重新生成）
+
+    launcher=True 时同时安装快速启动器（仅 Linux），汉化已是最新时也会安装
+    """
+    result = new_result('inject')
+    start = time.perf_counter()
+    try:
+        package_dir = resolve_package_dir(package_dir)
+        result['package_dir'] = str(package_dir)
+        bin_dir = package_dir / "bin"
+        if not (bin_dir / "codex.js").exists():
+            raise FileNotFoundError(f"未找到 {bin_dir / 'codex.js'}")
+
+        if backup_original_files(bin_dir):
+            result['changes'].append(f"已备份原始 codex.js 为 {BACKUP_NAME}")
+
+        template = load_wrapper_template()
+        codex_version = read_package_version(package_dir)
+        translations, source_entries, pack = load_runtime_translations(codex_version)
+        fingerprint = compute_fingerprint(template, translations, source_entries, pack)
+        result['fingerprint'] = fingerprint
+        result['pack'] = pack
+        if (not force
+                and read_installed_fingerprint(bin_dir / "codex.js") == fingerprint
+                and (bin_dir / TRANSLATION_ARTIFACT_NAME).exists()
+                and (bin_dir / BACKUP_NAME).exists()):
+            result['unchanged'] = True
+            if launcher:
+                _apply_launcher(result, package_dir)
+            result['success'] = True
+            result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+            return result
+
+        normalized, _ = normalize_translations(translations)
+        phrases = len(normalized)
+        stats = {
+            'sourceEntries': source_entries,
+            'phrases': phrases,
+            'removed': source_entries - phrases,
+            'pack': pack,
+        }
+        artifact = build_translation_artifact(normalized, stats)
+        # 先写翻译数据再替换 codex.js，新的 codex.js 生效时它引用的数据已经就位
+        write_file_atomic(bin_dir / TRANSLATION_ARTIFACT_NAME, to_js_json(artifact).encode('utf-8'), 0o644)
+        result['changes'].append(f"已生成预编译翻译数据 {TRANSLATION_ARTIFACT_NAME} ({artifact['hash']})")
+
+        write_file_atomic(bin_dir / "codex.js", render_wrapper_template(template, artifact, fingerprint).encode('utf-8'))
+        result['changes'].append(f"已创建汉化版 codex.js (指纹 {fingerprint})")
+
+        if launcher:
+            _apply_launcher(result, package_dir)
+
+        result['hash'] = artifact['hash']
+        result['stats'] = stats
+        result['success'] = True
+    except (OSError, ValueError, KeyError, re.error) as e:
+        result['error'] = str(e)
+    result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def restore(package_dir=None):
+    """恢复英文原版，返回结构化结果"""
+    result = new_result('restore')
+    start = time.perf_counter()
+    try:
+        package_dir = resolve_package_dir(package_dir)
+        result['package_dir'] = str(package_dir)
+        bin_dir = package_dir / "bin"
+        backup = bin_dir / BACKUP_NAME
+        artifact = bin_dir / TRANSLATION_ARTIFACT_NAME
+
+        if remove_launcher(package_dir):
+            result['changes'].append("已删除快速启动器")
+        if backup.exists():
+            write_file_atomic(bin_dir / "codex.js", backup.read_bytes())
+            result['changes'].append("已恢复原始 codex.js")
+        if artifact.exists():
+            artifact.unlink()
+            result['changes'].append("已删除预编译翻译数据")
+        result['success'] = True
+    except OSError as e:
+        result['error'] = str(e)
+    result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def status(package_dir=None):
+    """查看汉化状态"""
+    result = new_result('status')
+    try:
+        package_dir = resolve_package_dir(package_dir)
+        bin_dir = package_dir / "bin"
+        result['package_dir'] = str(package_dir)
+        result['backup'] = (bin_dir / BACKUP_NAME).exists()
+        result['artifact'] = (bin_dir / TRANSLATION_ARTIFACT_NAME).exists()
+        result['fingerprint'] = read_installed_fingerprint(bin_dir / "codex.js") or ''
+        result['launcher'] = is_launcher_installed(package_dir)
+        result['success'] = True
+    except OSError as e:
+        result['error'] = str(e)
+    return result
+
+
+def print_result(result):
+    """打印结构化结果"""
+    titles = {'inject': "汉化", 'restore': "恢复", 'status': "状态检查"}
+    title = titles.get(result['action'], result['action'])
+    if not result['success']:
+        print(f"❌ {title}失败: {result['error']}")
+        return
+    print(f"🔍 Codex CLI 安装路径: {result['package_dir']}")
+    if result.get('unchanged'):
+        print(f"✅ 汉化已是最新（指纹 {result['fingerprint']}），无需重新生成")
+    for change in result['changes']:
+        print(f"✅ {change}")
+    if result.get('launcher_skipped'):
+        print(f"⚠️ 已跳过快速启动器: {result['launcher_skipped']}")
+    if result.get('unchanged'):
+        return
+    if 'stats' in result:
+        stats = result['stats']
+        print(f"📦 翻译包: {stats['pack'] or '无（仅使用基础词典）'}")
+        print(f"📉 词典规范化: {stats['sourceEntries']} 条 → {stats['phrases']} 个唯一短语（去除 {stats['removed']} 条）")
+    if result['action'] == 'status':
+        print(f"  备份文件: {'✅ 存在' if result['backup'] else '❌ 不存在'}")
+        print(f"  翻译数据: {'✅ 存在' if result['artifact'] else '❌ 不存在'}")
+        print(f"  汉化指纹: {result['fingerprint'] or '无'}")
+        print(f"  快速启动器: {'✅ 已启用' if result['launcher'] else '❌ 未启用'}")
+    else:
+        print(f"🎉 {title}完成，用时 {result['elapsed_ms']:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Codex CLI 汉化注入与恢复")
+    parser.add_argument('command', nargs='?', default='inject', choices=['inject', 'restore', 'status'])
+    parser.add_argument('--package-dir', help="@openai/codex 安装目录（默认自动检测）")
+    parser.add_argument('--force', action='store_true', help="模板和词典未变化时也重新生成")
+    parser.add_argument('--launcher', action='store_true', help="同时安装快速启动器（仅 Linux），不需要翻译的命令不再启动 node")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args(argv)
+
+    if args.command == 'inject':
+        result = inject(args.package_dir, force=args.force, launcher=args.launcher)
+    else:
+        actions = {'restore': restore, 'status': status}
+        result = actions[args.command](args.package_dir)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_result(result)
+    return 0 if result['success'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化工具本地路径和文件写入
+缓存目录规则与 codex.js 中的 getCacheDir 保持一致
+"""
+
+import os
+import sys
+from pathlib import Path
+
+APP_DIR_NAME = "codex-zh"
+
+# 翻译统计文件（由 codex.js 在 CODEX_ZH_TELEMETRY=1 时追加）
+TELEMETRY_FILE_NAME = "translation-telemetry.jsonl"
+
+# npm 仓库查询缓存（由 registry_client 读写）
+REGISTRY_CACHE_FILE_NAME = "registry-cache.json"
+
+
+def get_cache_dir():
+    """返回本地缓存目录：Windows 为 %LOCALAPPDATA%\\codex-zh，其他系统为 $XDG_CACHE_HOME/codex-zh"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / APP_DIR_NAME
+
+
+def get_telemetry_path():
+    """返回翻译统计文件路径"""
+    return get_cache_dir() / TELEMETRY_FILE_NAME
+
+
+def get_registry_cache_path():
+    """返回 npm 仓库查询缓存文件路径"""
+    return get_cache_dir() / REGISTRY_CACHE_FILE_NAME
+
+
+def write_file_atomic(path, data, mode=None):
+    """原子写入：先写同目录的临时文件并刷盘，再重命名覆盖（与注入脚本的 writeFileAtomic 一致）
+
+    mode 默认沿用目标文件原有的权限，codex.js 的可执行位不会丢失
+    """
+    path = Path(path)
+    if mode is None:
+        try:
+            mode = path.stat().st_mode & 0o777
+        except OSError:
+            mode = 0o644
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+    # 刷新目录项，确保重命名本身落盘（Windows 不支持，忽略）
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
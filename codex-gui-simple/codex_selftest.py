@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化工具自检
+不创建窗口、不需要显示器：检查随程序发布的资源文件和词典，
+在临时的 npm 全局目录中对假的 Codex CLI 执行注入、状态检查和恢复，
+输出带耗时的 JSON 结果（codex_gui.py --self-test 和打包脚本使用）
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import codex_detect
+import codex_patcher
+from translation_engine import TranslationTrie, is_template, normalize_translations
+
+# 假的 Codex CLI 安装使用的版本和原版 codex.js 内容
+FAKE_CODEX_VERSION = "0.40.0"
+FAKE_CODEX_JS = "#!/usr/bin/env node\n// codex-zh self-test original codex.js\n"
+
+# 必须随程序发布的资源
+REQUIRED_RESOURCES = (
+    codex_patcher.WRAPPER_TEMPLATE_NAME,
+    codex_patcher.LAUNCHER_TEMPLATE_NAME,
+    codex_patcher.COMPILED_TRANSLATIONS_NAME,
+    codex_patcher.INJECTOR_NAME,
+    codex_patcher.PACKS_DIR_NAME,
+)
+
+
+class SelfTestError(Exception):
+    pass
+
+
+def check(condition, message):
+    if not condition:
+        raise SelfTestError(message)
+
+
+def check_resources(context):
+    """查找随程序发布的脚本、模板、词典和翻译包"""
+    found = {}
+    for name in REQUIRED_RESOURCES:
+        path = codex_patcher.find_resource(name)
+        check(path is not None, f"找不到资源 {name}")
+        found[name] = str(path)
+    return found
+
+
+def check_dictionary(context):
+    """加载词典并编译字典树，确认样本短语能被翻译"""
+    translations, source_entries, pack = codex_patcher.load_runtime_translations(FAKE_CODEX_VERSION)
+    normalized, _ = normalize_translations(translations)
+    check(normalized, "词典为空")
+    en, zh, *_ = max((entry for entry in normalized if len(entry) == 2 and not is_template(entry[0])),
+                     key=lambda entry: len(entry[0]))
+    trie = TranslationTrie.from_compiled(TranslationTrie(normalized).compile())
+    check(trie.translate(en) == zh, f"样本短语翻译错误: {en!r}")
+    context['sample'] = (en, zh)
+    return {'source_entries': source_entries, 'phrases': len(normalized), 'pack': pack}
+
+
+def create_fake_install(prefix):
+    """在 npm 全局前缀中创建假的 @openai/codex 安装"""
+    package_dir = codex_detect.prefix_to_root(prefix).joinpath(*codex_detect.PACKAGE_PARTS)
+    (package_dir / "bin").mkdir(parents=True)
+    package = {'name': '@openai/codex', 'version': FAKE_CODEX_VERSION, 'type': 'module'}
+    (package_dir / "package.json").write_text(json.dumps(package), encoding='utf-8')
+    (package_dir / "bin" / "codex.js").write_text(FAKE_CODEX_JS, encoding='utf-8')
+    return package_dir
+
+
+def check_inject(context):
+    """注入汉化：生成汉化版 codex.js、翻译数据和原版备份，再次注入时跳过"""
+    package_dir = context['package_dir']
+    bin_dir = package_dir / "bin"
+    result = codex_patcher.inject(package_dir)
+    check(result['success'], f"注入失败: {result['error']}")
+    check((bin_dir / codex_patcher.BACKUP_NAME).read_text(encoding='utf-8') == FAKE_CODEX_JS, "原版备份内容不正确")
+    check(codex_patcher.read_installed_fingerprint(bin_dir / "codex.js") == result['fingerprint'],
+          "汉化版 codex.js 缺少指纹")
+
+    with open(bin_dir / codex_patcher.TRANSLATION_ARTIFACT_NAME, 'r', encoding='utf-8') as f:
+        artifact = json.load(f)
+    check(artifact['format'] == codex_patcher.TRANSLATION_ARTIFACT_FORMAT, "翻译数据格式不正确")
+    en, zh = context['sample']
+    check(TranslationTrie.from_compiled(artifact).translate(en) == zh, "翻译数据无法翻译样本短语")
+
+    again = codex_patcher.inject(package_dir)
+    check(again['success'] and again.get('unchanged'), "重复注入没有被跳过")
+    return {'hash': result['hash'], 'fingerprint': result['fingerprint'], 'elapsed_ms': result['elapsed_ms']}
+
+
+def check_status(context):
+    """状态检查应报告已汉化"""
+    result = codex_patcher.status(context['package_dir'])
+    check(result['success'] and result['backup'] and result['artifact'], "状态检查未报告已汉化")
+    return {'fingerprint': result['fingerprint']}
+
+
+def check_restore(context):
+    """恢复原版：codex.js 与原版一致，翻译数据被删除"""
+    bin_dir = context['package_dir'] / "bin"
+    result = codex_patcher.restore(context['package_dir'])
+    check(result['success'], f"恢复失败: {result['error']}")
+    check((bin_dir / "codex.js").read_text(encoding='utf-8') == FAKE_CODEX_JS, "恢复后的 codex.js 与原版不一致")
+    check(not (bin_dir / codex_patcher.TRANSLATION_ARTIFACT_NAME).exists(), "恢复后翻译数据仍然存在")
+    return {'elapsed_ms': result['elapsed_ms']}
+
+
+CHECKS = (
+    ('resources', check_resources),
+    ('dictionary', check_dictionary),
+    ('inject', check_inject),
+    ('status', check_status),
+    ('restore', check_restore),
+)
+
+
+def run_self_test():
+    """依次执行各项检查，某项失败后跳过后续检查，返回结构化结果"""
+    start = time.perf_counter()
+    results = []
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="codex-zh-selftest-") as tmp:
+        root = Path(tmp)
+        context = {'package_dir': create_fake_install(root / "prefix")}
+        for name, func in CHECKS:
+            if failed:
+                results.append({'name': name, 'success': False, 'skipped': True})
+                continue
+            check_start = time.perf_counter()
+            entry = {'name': name, 'success': True}
+            try:
+                entry['detail'] = func(context)
+            except Exception as e:
+                entry['success'] = False
+                entry['error'] = f"{type(e).__name__}: {e}" if not isinstance(e, SelfTestError) else str(e)
+                failed = True
+            entry['elapsed_ms'] = (time.perf_counter() - check_start) * 1000
+            results.append(entry)
+
+    return {
+        'success': not failed,
+        'elapsed_ms': (time.perf_counter() - start) * 1000,
+        'python': sys.version.split()[0],
+        'frozen': bool(getattr(sys, 'frozen', False)),
+        'checks': results,
+    }
+
+
+def main(argv=None):
+    """执行自检并输出 JSON：--self-test-output <路径> 写入文件（无控制台的打包程序使用），否则输出到标准输出"""
+    argv = sys.argv[1:] if argv is None else argv
+    result = run_self_test()
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if '--self-test-output' in argv:
+        index = argv.index('--self-test-output')
+        if index + 1 < len(argv):
+            Path(argv[index + 1]).write_text(text + '\n', encoding='utf-8')
+    elif sys.stdout is not None:
+        print(text)
+    return 0 if result['success'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
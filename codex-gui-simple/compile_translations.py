@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化词典编译工具
+合并 inject-chinese-final-dedup.js 中的翻译表和 codex-translations-extended.json，
+规范化缩进变体、去重并报告冲突，附加 codex-translation-scopes.json 中的作用域，
+输出注入脚本使用的按长度排序的词典
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from translation_engine import TranslationTrie, is_template, template_pattern, trim_phrase
+
+PROJECT_ROOT = Path(__file__).parent.parent
+JS_SOURCE = PROJECT_ROOT / "inject-chinese-final-dedup.js"
+EXTENDED_SOURCE = PROJECT_ROOT / "codex-translations-extended.json"
+SCOPES_SOURCE = PROJECT_ROOT / "codex-translation-scopes.json"
+COMPILED_OUTPUT = PROJECT_ROOT / "codex-translations-compiled.json"
+
+COMPILED_VERSION = 1
+
+# JS 翻译表中的一条 ["英文", "中文"]
+_JS_TABLE_RE = re.compile(r'const finalTranslations = \[(.*?)\n\];', re.S)
+_JS_PAIR_RE = re.compile(r'\[\s*("(?:[^"\\]|\\.)*")\s*,\s*("(?:[^"\\]|\\.)*")\s*\]')
+
+
+def load_js_translations(path=JS_SOURCE):
+    """读取注入脚本中的 finalTranslations 表"""
+    source = Path(path).read_text(encoding='utf-8')
+    match = _JS_TABLE_RE.search(source)
+    if not match:
+        raise ValueError(f"未在 {path} 中找到 finalTranslations 翻译表")
+    return [(json.loads(en), json.loads(zh)) for en, zh in _JS_PAIR_RE.findall(match.group(1))]
+
+
+def load_extended_translations(path=EXTENDED_SOURCE):
+    """读取扩展翻译文件（保留重复的键，交给合并步骤统一报告）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f, object_pairs_hook=list)
+
+
+def load_scopes(path=SCOPES_SOURCE):
+    """读取短语作用域 {短语: [条件, ...]}，文件不存在时返回空字典"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        scopes = json.load(f).get('scopes', {})
+    # 提前检查条件名称，避免到注入时才报错
+    TranslationTrie().scope_code([condition for conditions in scopes.values() for condition in conditions])
+    return scopes
+
+
+def apply_scopes(translations, scopes, report):
+    """给词典条目附加作用域（第三项），词典中不存在的短语记入报告"""
+    for entry in translations:
+        if scopes.get(entry[0]):
+            entry.append(scopes[entry[0]])
+    keys = {entry[0] for entry in translations}
+    report['scoped'] = len([key for key in scopes if key in keys])
+    report['unknown_scopes'] = [key for key in scopes if key not in keys]
+    return translations
+
+
+def merge_translations(sources):
+    """按顺序合并多个翻译来源，先出现的来源优先
+
+    sources: [(来源名称, [(英文, 中文), ...]), ...]
+    返回 (按长度排序的翻译列表, 报告)
+    """
+    merged = {}
+    origin = {}
+    seen_conflicts = set()
+    report = {
+        'total': 0,
+        'duplicates': [],
+        'shadowed': [],
+        'conflicts': [],
+        'identity': [],
+    }
+
+    for source_name, pairs in sources:
+        for en, zh in pairs:
+            report['total'] += 1
+            key, value = trim_phrase(en, zh)
+            if not key:
+                continue
+
+            if key not in merged:
+                merged[key] = value
+                origin[key] = (source_name, en)
+                if key == value:
+                    report['identity'].append(key)
+                continue
+
+            if merged[key] != value:
+                # 同一冲突的缩进变体只报告一次
+                if (key, value) in seen_conflicts:
+                    report['shadowed'].append({'key': en, 'by': key, 'source': source_name})
+                    continue
+                seen_conflicts.add((key, value))
+                report['conflicts'].append({
+                    'key': key,
+                    'kept': merged[key],
+                    'kept_from': origin[key][0],
+                    'dropped': value,
+                    'dropped_from': source_name,
+                })
+            elif en != key or origin[key][1] != key:
+                # 缩进变体已由规范化后的条目覆盖
+                report['shadowed'].append({'key': en, 'by': key, 'source': source_name})
+            else:
+                report['duplicates'].append({'key': key, 'source': source_name})
+
+    translations = sorted(merged.items(), key=lambda item: (-len(item[0]), item[0]))
+    return [[en, zh] for en, zh in translations], report
+
+
+def build_compiled(js_path=JS_SOURCE, extended_path=EXTENDED_SOURCE, scopes_path=SCOPES_SOURCE):
+    """编译合并后的词典，返回 (词典内容, 报告)"""
+    sources = [
+        (Path(js_path).name, load_js_translations(js_path)),
+        (Path(extended_path).name, load_extended_translations(extended_path)),
+    ]
+    translations, report = merge_translations(sources)
+    translations = apply_scopes(translations, load_scopes(scopes_path), report)
+    # 模板规则的格式错误在编译时报告
+    templates = [entry[0] for entry in translations if is_template(entry[0])]
+    for en in templates:
+        template_pattern(en)
+    report['templates'] = len(templates)
+    compiled = {
+        'version': COMPILED_VERSION,
+        'sources': [name for name, _ in sources],
+        'source_entries': report['total'],
+        'translations': translations,
+    }
+    return compiled, report
+
+
+def dump_compiled(compiled):
+    """序列化词典：每条翻译一行，便于审阅差异"""
+    lines = ['{']
+    for key, value in compiled.items():
+        if key != 'translations':
+            lines.append(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},')
+    lines.append('  "translations": [')
+    pairs = [json.dumps(pair, ensure_ascii=False) for pair in compiled['translations']]
+    lines.append(',\n'.join(f'    {pair}' for pair in pairs))
+    lines.append('  ]')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def print_report(report, count):
+    """打印合并报告"""
+    print(f"📊 输入条目: {report['total']}，输出条目: {count}")
+    print(f"   重复条目: {len(report['duplicates'])}")
+    print(f"   缩进变体: {len(report['shadowed'])}")
+    print(f"   原样翻译: {len(report['identity'])}")
+    print(f"   模板规则: {report['templates']}")
+    print(f"   限定作用域: {report['scoped']}")
+    for key in report['unknown_scopes']:
+        print(f"   ⚠️ 作用域中的短语不在词典中: {key!r}")
+    print(f"   翻译冲突: {len(report['conflicts'])}")
+    for conflict in report['conflicts']:
+        print(f"   ⚠️ {conflict['key']!r}")
+        print(f"      保留 ({conflict['kept_from']}): {conflict['kept']!r}")
+        print(f"      丢弃 ({conflict['dropped_from']}): {conflict['dropped']!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="合并并编译 Codex CLI 汉化词典")
+    parser.add_argument('--js', default=str(JS_SOURCE), help="注入脚本路径")
+    parser.add_argument('--extended', default=str(EXTENDED_SOURCE), help="扩展翻译文件路径")
+    parser.add_argument('--scopes', default=str(SCOPES_SOURCE), help="短语作用域文件路径")
+    parser.add_argument('--output', default=str(COMPILED_OUTPUT), help="输出词典路径")
+    parser.add_argument('--check', action='store_true', help="只检查输出是否为最新，不写文件")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出报告")
+    args = parser.parse_args(argv)
+
+    compiled, report = build_compiled(args.js, args.extended, args.scopes)
+    content = dump_compiled(compiled)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, len(compiled['translations']))
+
+    output = Path(args.output)
+    if args.check:
+        current = output.read_text(encoding='utf-8') if output.exists() else None
+        if current != content:
+            print(f"❌ {output.name} 不是最新的，请重新运行编译")
+            return 1
+        print(f"✅ {output.name} 已是最新")
+        return 0
+
+    output.write_text(content, encoding='utf-8')
+    print(f"✅ 已写入: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
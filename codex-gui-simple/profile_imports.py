@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化工具图形界面导入耗时分析
+用 python -X importtime 多次导入 codex_gui，统计启动时必须导入的模块耗时，
+检查应延迟到首次使用时才导入的模块没有被提前导入，并与基线对比
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+GUI_DIR = Path(__file__).parent
+BASELINE_PATH = GUI_DIR / "benchmarks" / "import_profile.json"
+
+PROFILE_VERSION = 1
+
+# 显示窗口不需要、应在首次使用时才导入的模块
+DEFERRED_MODULES = (
+    'codex_patcher',
+    'codex_detect',
+    'translation_packs',
+    'concurrent.futures',
+    'webbrowser',
+    'codex_selftest',
+    'registry_client',
+    'urllib.request',
+)
+
+# 报告中列出的耗时最多的顶层模块数
+TOP_MODULES = 15
+
+
+def profile_once():
+    """导入一次 codex_gui，按输出顺序返回 [(模块, 自身耗时 ms, 累计耗时 ms, 嵌套层级)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import codex_gui"],
+        cwd=GUI_DIR, capture_output=True, text=True, encoding='utf-8', errors='replace',
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 codex_gui 失败:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return modules
+
+
+def gui_children(modules):
+    """codex_gui 直接导入的模块：importtime 先输出子模块，codex_gui 本身在最后一行"""
+    children = {}
+    for name, _, cumulative, depth in reversed(modules[:-1]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children[name] = cumulative
+    return children
+
+
+def run_profile(runs):
+    """多次导入取中位数，减少磁盘缓存和调度带来的波动"""
+    samples = [profile_once() for _ in range(runs)]
+    totals = [sample[-1][2] for sample in samples]
+
+    # codex_gui 直接导入的模块（已由 Python 启动过程导入的模块不会出现）
+    children = [gui_children(sample) for sample in samples]
+    top_level = {name: statistics.median(child[name] for child in children if name in child)
+                 for name in children[-1]}
+    top = sorted(top_level.items(), key=lambda item: -item[1])[:TOP_MODULES]
+    last = {name for name, _, _, _ in samples[-1]}
+
+    return {
+        'version': PROFILE_VERSION,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': f"{platform.system()} {platform.machine()}",
+        },
+        'config': {'runs': runs},
+        'total_ms': statistics.median(totals),
+        'modules_imported': len(last),
+        'top_modules_ms': dict(top),
+        'deferred_imported': [name for name in DEFERRED_MODULES if name in last],
+    }
+
+
+def print_profile(profile, baseline, threshold):
+    """打印结果，与基线对比，返回问题列表"""
+    problems = []
+    print(f"\n📊 {profile['environment']['platform']}，Python {profile['environment']['python']}，"
+          f"{profile['config']['runs']} 次导入取中位数")
+    line = f"   导入 codex_gui 总耗时 {profile['total_ms']:>9.2f} ms（共 {profile['modules_imported']} 个模块）"
+    if baseline:
+        old = baseline['total_ms']
+        change = (profile['total_ms'] - old) / old
+        line += f"   基线 {old:.2f} ms  {change:+7.1%}"
+        if change > threshold:
+            line += "  ⚠️"
+            problems.append('total_ms')
+    print(line)
+
+    print("\n   耗时最多的顶层模块（累计 ms）:")
+    for name, value in profile['top_modules_ms'].items():
+        print(f"   {name:<40} {value:>9.2f}")
+
+    if profile['deferred_imported']:
+        print(f"\n⚠️ 以下模块应延迟导入，但启动时已被导入: {', '.join(profile['deferred_imported'])}")
+        problems.extend(profile['deferred_imported'])
+    else:
+        print("\n✅ 检测、汉化和打开链接相关的模块均已延迟导入")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分析 Codex CLI 汉化工具图形界面的导入耗时")
+    parser.add_argument('--runs', type=int, default=7, help="导入次数（取中位数）")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="基线文件路径")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基线")
+    parser.add_argument('--threshold', type=float, default=0.25, help="判定退步的相对变化")
+    parser.add_argument('--check', action='store_true', help="有退步或提前导入时返回非零退出码")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args(argv)
+
+    profile = run_profile(args.runs)
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.json:
+        print(json.dumps(profile, ensure_ascii=False, indent=2))
+        problems = profile['deferred_imported']
+    else:
+        problems = print_profile(profile, baseline, args.threshold)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(profile, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        print(f"✅ 已保存基线: {baseline_path}")
+
+    if problems:
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 最新版本查询（npm 仓库客户端）
+直接请求仓库的 dist-tags 接口，不启动 npm 进程：结果保存在本地缓存中，
+有效期内不发请求，过期后带 If-None-Match 做条件请求；无法联网时立即返回缓存的结果和缓存时长
+"""
+
+import json
+import os
+import sys
+import time
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from codex_paths import get_registry_cache_path, write_file_atomic
+
+PACKAGE_NAME = "@openai/codex"
+DEFAULT_REGISTRY = "https://registry.npmjs.org/"
+
+# 缓存有效期（秒）和请求超时（秒）
+DEFAULT_TTL = 600
+REQUEST_TIMEOUT = 5
+
+
+def read_npmrc_registry():
+    """读取用户 .npmrc 中配置的 registry（国内镜像等），没有时返回 None"""
+    path = os.environ.get('npm_config_userconfig') or os.environ.get('NPM_CONFIG_USERCONFIG')
+    path = Path(path) if path else Path.home() / ".npmrc"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, sep, value = line.partition('=')
+                if sep and key.strip() == 'registry' and value.strip():
+                    return value.strip()
+    except OSError:
+        pass
+    return None
+
+
+def resolve_registry(registry=None):
+    """确定仓库地址：参数 > CODEX_ZH_REGISTRY > npm_config_registry > ~/.npmrc > npm 官方仓库"""
+    registry = (registry
+                or os.environ.get('CODEX_ZH_REGISTRY')
+                or os.environ.get('npm_config_registry')
+                or os.environ.get('NPM_CONFIG_REGISTRY')
+                or read_npmrc_registry()
+                or DEFAULT_REGISTRY)
+    return registry.rstrip('/') + '/'
+
+
+def dist_tags_url(registry, package=PACKAGE_NAME):
+    """dist-tags 接口地址，只返回各标签对应的版本号，响应只有几十字节"""
+    return f"{registry}-/package/{urllib.parse.quote(package, safe='@')}/dist-tags"
+
+
+def load_cache(path):
+    """读取缓存 {接口地址: {etag, tags, checked_at}}，文件不存在或损坏时返回空字典"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    """原子写入缓存，写入失败不影响查询结果"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_file_atomic(path, json.dumps(cache, ensure_ascii=False, indent=2).encode('utf-8'), 0o644)
+    except OSError:
+        pass
+
+
+def fetch_dist_tags(url, etag=None, timeout=REQUEST_TIMEOUT):
+    """条件请求 dist-tags，返回 (标签字典, ETag)；内容未变化（304）时标签字典为 None"""
+    headers = {'Accept': 'application/json', 'User-Agent': 'codex-zh'}
+    if etag:
+        headers['If-None-Match'] = etag
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            tags = json.loads(response.read().decode('utf-8'))
+            return tags, response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, e.headers.get('ETag') or etag
+        raise
+
+
+def format_age(seconds):
+    """把缓存时长格式化为“3 分钟”之类的文字"""
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds} 秒"
+    if seconds < 3600:
+        return f"{seconds // 60} 分钟"
+    if seconds < 86400:
+        return f"{seconds // 3600} 小时"
+    return f"{seconds // 86400} 天"
+
+
+def get_latest_version(package=PACKAGE_NAME, registry=None, ttl=DEFAULT_TTL, force=False,
+                       timeout=REQUEST_TIMEOUT, cache_path=None):
+    """查询最新版本，返回结构化结果
+
+    source 说明结果来源：cache（缓存未过期，没有请求）、not-modified（条件请求返回 304）、
+    network（下载了新内容）、offline（请求失败，使用缓存）；age 为距上次成功联系仓库的秒数。
+    force=True 时忽略有效期，但仍然带 ETag 做条件请求
+    """
+    registry = resolve_registry(registry)
+    url = dist_tags_url(registry, package)
+    cache_path = Path(cache_path) if cache_path else get_registry_cache_path()
+    cache = load_cache(cache_path)
+    entry = cache.get(url) or {}
+    now = time.time()
+
+    result = {
+        'success': False,
+        'version': entry.get('tags', {}).get('latest'),
+        'source': 'cache',
+        'age': now - entry['checked_at'] if isinstance(entry.get('checked_at'), (int, float)) else None,
+        'registry': registry,
+        'error': None,
+    }
+    # 缓存中没有记录联系仓库的时间时视为已过期
+    if result['version'] and not force and result['age'] is not None and result['age'] < ttl:
+        result['success'] = True
+        return result
+
+    try:
+        tags, etag = fetch_dist_tags(url, entry.get('etag') if result['version'] else None, timeout)
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        # 没有网络、仓库不可用或响应不完整（IncompleteRead 等）：有缓存时直接使用
+        result['error'] = str(getattr(e, 'reason', None) or e)
+        result['source'] = 'offline'
+        result['success'] = bool(result['version'])
+        return result
+
+    if tags is None:
+        # 304 响应可能带有新的 ETag，保存下来供下次条件请求使用
+        entry['etag'] = etag
+        result['source'] = 'not-modified'
+    else:
+        latest = tags.get('latest') if isinstance(tags, dict) else None
+        if not isinstance(latest, str) or not latest:
+            result['error'] = "仓库返回的数据中没有 latest 标签"
+            result['source'] = 'offline'
+            result['success'] = bool(result['version'])
+            return result
+        entry = {'etag': etag, 'tags': tags}
+        result['version'] = latest
+        result['source'] = 'network'
+
+    entry['checked_at'] = now
+    cache[url] = entry
+    save_cache(cache_path, cache)
+    result['age'] = 0.0
+    result['success'] = True
+    return result
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="查询 npm 仓库中 Codex CLI 的最新版本")
+    parser.add_argument('--registry', help="仓库地址（默认读取 CODEX_ZH_REGISTRY、npm 配置或使用官方仓库）")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL, help="缓存有效期（秒）")
+    parser.add_argument('--force', action='store_true', help="忽略缓存有效期，向仓库发送条件请求")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args(argv)
+
+    result = get_latest_version(registry=args.registry, ttl=args.ttl, force=args.force)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif not result['success']:
+        print(f"❌ 查询失败（{result['registry']}）: {result['error']}")
+    elif result['source'] == 'offline':
+        cached = f"{format_age(result['age'])}前的缓存" if result['age'] is not None else "缓存"
+        print(f"⚠️ 无法连接仓库（{result['error']}），使用{cached}: v{result['version']}")
+    else:
+        print(f"📦 最新版本: v{result['version']}（{result['source']}，{result['registry']}）")
+    return 0 if result['success'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
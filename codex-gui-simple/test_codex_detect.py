@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+codex_detect.py 的回归测试（python -m pytest codex-gui-simple）
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import codex_detect
+
+FAKE_CODEX_VERSION = "0.40.0"
+
+
+def create_fake_install(prefix):
+    """在 npm 全局前缀中创建假的 @openai/codex 安装"""
+    package_dir = codex_detect.prefix_to_root(prefix).joinpath(*codex_detect.PACKAGE_PARTS)
+    (package_dir / "bin").mkdir(parents=True)
+    package = {'name': '@openai/codex', 'version': FAKE_CODEX_VERSION, 'type': 'module'}
+    (package_dir / "package.json").write_text(json.dumps(package), encoding='utf-8')
+    (package_dir / "bin" / "codex.js").write_text("#!/usr/bin/env node\n", encoding='utf-8')
+    return package_dir
+
+
+@pytest.fixture
+def prefixes(tmp_path, monkeypatch):
+    """两个各有一份假安装的 npm 全局前缀，清除继承的前缀环境变量"""
+    monkeypatch.delenv('npm_config_prefix', raising=False)
+    monkeypatch.delenv('NPM_CONFIG_PREFIX', raising=False)
+    return {name: (tmp_path / name, create_fake_install(tmp_path / name)) for name in ("prefix-a", "prefix-b")}
+
+
+def test_detect_follows_prefix_switch(prefixes, tmp_path, monkeypatch):
+    """切换 npm 全局前缀后，检测结果跟随新的前缀，不返回缓存的旧安装；前缀未变化时使用缓存"""
+    cache_path = tmp_path / "detect-cache.json"
+    sources = []
+    for name in ("prefix-a", "prefix-b", "prefix-a"):
+        prefix, package_dir = prefixes[name]
+        monkeypatch.setenv('npm_config_prefix', str(prefix))
+        for _ in range(2):
+            info = codex_detect.detect_codex(cache_path=cache_path)
+            assert info['installed']
+            assert Path(info['package_dir']) == package_dir
+            sources.append(info['source'])
+    assert sources[1::2] == ['cache'] * 3
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+translation_engine.py 的回归测试（python -m pytest codex-gui-simple）
+"""
+
+import pytest
+
+import codex_patcher
+import translation_engine
+from translation_engine import TranslationTrie, normalize_translations
+
+# 以数字开头的模板规则
+NUMBER_TEMPLATES = (
+    ("{n} tokens used", "已用 {n} 个令牌"),
+    ("word", "词"),
+)
+
+# 帮助段落中的参数可选值应保持英文
+SECTION_SAMPLE = (
+    "Options:\n"
+    "  -s, --sandbox <workspace-write>\n"
+    "          [possible values: read-only, workspace-write, danger-full-access]\n"
+    "          workspace-write)\n"
+)
+SECTION_KEPT = (
+    "  -s, --sandbox <workspace-write>\n",
+    "read-only, workspace-write, danger-full-access]\n",
+    "          workspace-write)\n",
+)
+
+
+def build_trie(translations):
+    """编译后再加载，与 codex.js 运行时使用的翻译数据一致"""
+    return TranslationTrie.from_compiled(TranslationTrie(translations).compile())
+
+
+@pytest.fixture(scope="module")
+def dictionary_trie():
+    """随程序发布的词典（归一化后）编译成的字典树"""
+    translations, _, _ = codex_patcher.load_runtime_translations()
+    normalized, _ = normalize_translations(translations)
+    return build_trie(normalized)
+
+
+@pytest.fixture
+def rule_attempts(monkeypatch):
+    """统计模板规则的匹配尝试：记录每次尝试的起点"""
+    attempts = []
+    original = translation_engine._RuleSet.match
+
+    def counting_match(self, text, i):
+        attempts.append(i)
+        return original(self, text, i)
+
+    monkeypatch.setattr(translation_engine._RuleSet, "match", counting_match)
+    return attempts
+
+
+def test_number_template_translates():
+    trie = build_trie(NUMBER_TEMPLATES)
+    assert trie.translate("12 tokens used, 7777 word") == "已用 12 个令牌, 7777 词"
+
+
+def test_digit_run_tries_rules_once(rule_attempts):
+    """长数字串原样输出，模板规则只在数字串开头尝试一次"""
+    trie = build_trie(NUMBER_TEMPLATES)
+    text = "7" * 100000
+    assert trie.translate(text) == text
+    assert rule_attempts == [0]
+
+
+def test_rules_tried_at_each_digit_run_start(rule_attempts):
+    trie = build_trie(NUMBER_TEMPLATES)
+    text = "12 345 6789"
+    assert trie.translate(text) == text
+    assert rule_attempts == [0, 3, 7]
+
+
+@pytest.mark.parametrize("kept", SECTION_KEPT)
+def test_section_values_stay_english(dictionary_trie, kept):
+    """限定 no-section 的参数值在帮助段落中保持英文"""
+    assert kept in dictionary_trie.translate(SECTION_SAMPLE)
+
+
+def test_values_translated_outside_sections(dictionary_trie):
+    assert dictionary_trie.translate("workspace-write\n") != "workspace-write\n"
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+codex.js 大输出回归测试：200 MB 以上的输出经 pipeTranslated 翻译，读取端间歇停顿，
+检查输出完整、背压生效（预热后峰值内存不随输出总量增长）。需要 Linux、Node.js 和 npm
+"""
+
+import random
+import shutil
+import sys
+
+import pytest
+
+import bench_wrapper
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith('linux') or not shutil.which('node') or not shutil.which('npm'),
+    reason="需要 Linux、Node.js 和 npm",
+)
+
+STREAM_MB = 208
+
+
+def test_stream_backpressure(tmp_path):
+    env, wrapper, _ = bench_wrapper.setup_sandbox(tmp_path, 16384)
+    # 日志样本不含可翻译的短语，译文与原文逐字节相同
+    data = bench_wrapper.generate_fixture('logs', bench_wrapper.STREAM_FIXTURE_MB * 1024 * 1024,
+                                          random.Random(1), bench_wrapper.load_phrases())
+    count = STREAM_MB // bench_wrapper.STREAM_FIXTURE_MB
+    stream = bench_wrapper.measure_stream(wrapper, env, tmp_path / 'stream.txt', data, count)
+
+    assert stream['output_bytes'] == stream['input_bytes'] == len(data) * count
+    assert stream['expected_bytes'] == stream['input_bytes']
+    assert stream['growth'] <= bench_wrapper.STREAM_MAX_GROWTH, stream
+    assert stream['buffered'] <= bench_wrapper.STREAM_MAX_BUFFERED, stream
+    assert stream['problems'] == []
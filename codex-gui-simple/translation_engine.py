@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化翻译引擎（Python 参考实现）
+与 inject-chinese-final-dedup.js 生成的 codex.js 使用同一套字典树格式：
+单次扫描、最左最长匹配；带作用域的短语只在满足条件的位置生效，
+带占位符的模板规则（如 "Retrying in {n}s..."）在同一次扫描中匹配
+"""
+
+import bisect
+import codecs
+import re
+
+# 行尾标点及其在译文中可接受的写法（半角/全角）
+TRAILING_PUNCTUATION = {
+    '.': ('.', '。'),
+    ':': (':', '：'),
+    ';': (';', '；'),
+    ',': (',', '，'),
+    '!': ('!', '！'),
+    '?': ('?', '？'),
+    ')': (')', '）'),
+}
+
+# 不完整的控制序列最多保留的长度，超过后按原样输出
+MAX_PENDING_ESCAPE = 4096
+
+_ESC = '\x1b'
+_CSI_8BIT = '\x9b'
+
+# 短语的作用域条件，编译为每条译文一个整数（0 表示不限）：
+#   word        整词匹配，短语首尾的字母数字不能与相邻的字母数字相连
+#   line-start  只匹配行首（允许缩进）
+#   no-section  只在帮助段落之外匹配（如选项说明里用户需要照原样输入的参数值）
+#   section:名称 只在指定的帮助段落中匹配，如 section:Commands
+SCOPE_WORD = 1
+SCOPE_LINE_START = 2
+SCOPE_NO_SECTION = 4
+SCOPE_SECTION_SHIFT = 3
+
+# 帮助段落标题：顶格、单独成行、以冒号结尾，如 "Options:"
+_SECTION_HEADER_RE = re.compile(r'([A-Z][A-Za-z ]{0,39}):[ \t\r]*')
+_BLANK_RE = re.compile(r'[ \t\r]*')
+# 跨数据块保留的行首文本长度（足以判断是否为段落标题）
+MAX_LINE_HEAD = 64
+
+# 模板规则的占位符：{n}、{n1} 等匹配数字，其他名称匹配不含空白的一段文本
+_PLACEHOLDER_RE = re.compile(r'\{([a-z][a-z0-9_]*)\}')
+_NUMBER_PLACEHOLDER_RE = re.compile(r'n[0-9]*')
+_NUMBER_PATTERN = r'([0-9]+(?:\.[0-9]+)?)'
+_TOKEN_PATTERN = r'([^ \t\r\n]+?)'
+_TRAILING_TOKEN_PATTERN = r'([^ \t\r\n]+)'
+# 需要转义的正则元字符（与注入脚本一致，生成的表达式在 Python 和 JS 中含义相同）
+_REGEX_SPECIAL = set('\\^$.|?*+()[]{}/-')
+# 流式翻译时，模板规则的匹配最多等待这么多字符（或等到行尾）
+MAX_RULE_SPAN = 256
+
+
+def is_template(en):
+    """带 {名称} 占位符的短语是模板规则"""
+    return _PLACEHOLDER_RE.search(en) is not None
+
+
+def escape_pattern(text):
+    return ''.join('\\' + ch if ch in _REGEX_SPECIAL else ch for ch in text)
+
+
+def template_pattern(en):
+    """把模板编译为正则表达式片段，返回 (开头的文字, 表达式, 占位符名称列表)
+
+    每个占位符是一个捕获组；模板必须以文字或数字占位符开头，且不能跨行
+    """
+    if '\n' in en:
+        raise ValueError(f"模板规则不能跨行: {en!r}")
+    parts = []
+    names = []
+    last = 0
+    for match in _PLACEHOLDER_RE.finditer(en):
+        name = match.group(1)
+        parts.append(escape_pattern(en[last:match.start()]))
+        if _NUMBER_PLACEHOLDER_RE.fullmatch(name):
+            parts.append(_NUMBER_PATTERN)
+        elif match.end() == len(en):
+            parts.append(_TRAILING_TOKEN_PATTERN)
+        else:
+            parts.append(_TOKEN_PATTERN)
+        names.append(name)
+        last = match.end()
+    parts.append(escape_pattern(en[last:]))
+    prefix = en[:_PLACEHOLDER_RE.search(en).start()]
+    if not prefix and not _NUMBER_PLACEHOLDER_RE.fullmatch(names[0]):
+        raise ValueError(f"模板规则必须以文字或数字占位符开头: {en!r}")
+    return prefix, ''.join(parts), names
+
+
+class _RuleSet:
+    """挂在字典树节点上的一组模板规则，合并为一个表达式，从短语起点开始匹配"""
+
+    def __init__(self, alternatives=()):
+        # [(译文下标, 模板), ...]，按词典顺序（较长的模板在前）
+        self.alternatives = list(alternatives)
+        self._compiled = None
+
+    def pattern(self):
+        return '|'.join(f'({template_pattern(en)[1]})' for _, en in self.alternatives)
+
+    def match(self, text, i):
+        """从 i 开始匹配，返回 (译文下标, 终点) 或 None；排在前面的规则优先"""
+        if self._compiled is None:
+            # 每条规则的外层分组序号
+            groups = []
+            group = 1
+            for value, en in self.alternatives:
+                groups.append((value, group))
+                group += len(template_pattern(en)[2]) + 1
+            self._compiled = (re.compile(self.pattern()), groups)
+        regex, groups = self._compiled
+        m = regex.match(text, i)
+        if m is None:
+            return None
+        for value, group in groups:
+            if m.start(group) != -1:
+                return value, m.end()
+        return None
+
+
+def _inside_number(text, i):
+    """i 处的数字前面紧跟着数字：模板规则只从一串数字的开头尝试，避免长数字串被反复扫描"""
+    return i > 0 and '0' <= text[i] <= '9' and '0' <= text[i - 1] <= '9'
+
+
+def is_word_char(ch):
+    return ch.isascii() and (ch.isalnum() or ch == '_')
+
+
+def trim_phrase(en, zh):
+    """去掉键首尾的空白；译文带有相同空白时一并去掉，匹配时原文的缩进会原样保留"""
+    key = en.lstrip()
+    indent = en[:len(en) - len(key)]
+    if indent:
+        zh = zh[len(indent):] if zh.startswith(indent) else zh.lstrip()
+    trimmed = key.rstrip()
+    tail = key[len(trimmed):]
+    if tail:
+        zh = zh[:len(zh) - len(tail)] if zh.endswith(tail) else zh.rstrip()
+    return trimmed, zh
+
+
+def normalize_translations(translations):
+    """规范化翻译表：按去掉缩进和行尾标点后的短语去重
+
+    条目为 [英文, 中文] 或带作用域的 [英文, 中文, [条件, ...]]；
+    返回 (规范化后的翻译列表, 去除的条目数)
+    """
+    phrases = {}
+    for en, zh, *scope in translations:
+        key, value = trim_phrase(en, zh)
+        if key and key not in phrases:
+            phrases[key] = (value, scope)
+
+    normalized = []
+    for key, (value, scope) in phrases.items():
+        accepted = TRAILING_PUNCTUATION.get(key[-1])
+        shorter = phrases.get(key[:-1])
+        if (len(key) > 1 and accepted and value[-1:] in accepted
+                and shorter is not None and shorter[0] == value[:-1]):
+            # 去掉标点后与已有短语完全相同，由该短语（及其作用域）覆盖
+            continue
+        normalized.append([key, value, *scope])
+    return normalized, len(translations) - len(normalized)
+
+
+def new_scope_state():
+    """数据块之间传递的扫描状态：前一个字符是否为字母数字、当前行是否仍只有缩进、
+    当前行已输出部分的开头和所在的帮助段落（0 为段落之外，-1 为未登记的段落）"""
+    return {'prev_word': False, 'line_start': True, 'line_head': '', 'section': 0}
+
+
+class _ScopeScanner:
+    """按需向前推进的行扫描器：只有遇到带作用域的候选短语时才确定行首和所在段落"""
+
+    def __init__(self, trie, text, state):
+        self.trie = trie
+        self.text = text
+        self.state = state
+        self.line_begin = 0
+        self.section = state['section']
+
+    def finish_line(self, line):
+        """一行结束：顶格的段落标题进入该段落，其他顶格文本离开段落"""
+        if _BLANK_RE.fullmatch(line) or line[0] in ' \t':
+            return
+        match = _SECTION_HEADER_RE.fullmatch(line)
+        self.section = self.trie.section_ids.get(match.group(1), -1) if match else 0
+
+    def advance(self, i):
+        """处理 i 之前已完整的行"""
+        text = self.text
+        while True:
+            nl = text.find('\n', self.line_begin)
+            if nl == -1 or nl >= i:
+                return
+            head = self.state['line_head'] if self.line_begin == 0 else ''
+            c = text[self.line_begin]
+            if head:
+                self.finish_line(head + text[:nl])
+            elif c in ' \t\n':
+                # 缩进或空行，所在段落不变
+                pass
+            elif c > ' ' and not 'A' <= c <= 'Z':
+                # 不以大写字母开头的顶格文本不可能是段落标题
+                self.section = 0
+            else:
+                self.finish_line(text[self.line_begin:nl])
+            self.line_begin = nl + 1
+
+    def at_line_start(self, i):
+        self.advance(i)
+        if not _BLANK_RE.fullmatch(self.text, self.line_begin, i):
+            return False
+        return self.line_begin > 0 or self.state['line_start']
+
+    def allowed(self, code, i, j, final):
+        """检查 [i, j) 的匹配是否满足作用域；需要后续数据才能判断时返回 None"""
+        text = self.text
+        if code & SCOPE_WORD:
+            if is_word_char(text[i]) and (is_word_char(text[i - 1]) if i > 0 else self.state['prev_word']):
+                return False
+            if is_word_char(text[j - 1]):
+                if j < len(text):
+                    if is_word_char(text[j]):
+                        return False
+                elif not final:
+                    return None
+        if code & SCOPE_LINE_START and not self.at_line_start(i):
+            return False
+        if code & SCOPE_NO_SECTION or code >> SCOPE_SECTION_SHIFT:
+            self.advance(i)
+            # 顶格的行（段落标题、用法说明等）不属于任何段落
+            first = self.state['line_head'][:1] if self.line_begin == 0 else ''
+            section = self.section if (first or text[self.line_begin]) in ' \t' else 0
+            if code & SCOPE_NO_SECTION and section != 0:
+                return False
+            if code >> SCOPE_SECTION_SHIFT and section != code >> SCOPE_SECTION_SHIFT:
+                return False
+        return True
+
+    def save(self, stop):
+        """把扫描停止位置处的状态写回，供下一块数据使用"""
+        text = self.text
+        state = self.state
+        self.advance(stop)
+        if stop > 0:
+            state['prev_word'] = is_word_char(text[stop - 1])
+        blank = bool(_BLANK_RE.fullmatch(text, self.line_begin, stop))
+        if self.line_begin == 0:
+            state['line_start'] = state['line_start'] and blank
+            state['line_head'] = (state['line_head'] + text[:stop])[:MAX_LINE_HEAD]
+        else:
+            state['line_start'] = blank
+            state['line_head'] = text[self.line_begin:stop][:MAX_LINE_HEAD]
+        state['section'] = self.section
+
+
+def scan_escape(text, i):
+    """返回从 i 开始的终端控制序列的结束位置；序列在文本末尾被截断时返回 -1"""
+    n = len(text)
+    j = i + 1
+    if text[i] == _CSI_8BIT:
+        kind = '['
+    else:
+        if j >= n:
+            return -1
+        kind = text[j]
+        j += 1
+
+    if kind == '[':
+        # CSI：参数字节 0x30-0x3F，中间字节 0x20-0x2F，终止字节 0x40-0x7E
+        while j < n:
+            c = ord(text[j])
+            if 0x40 <= c <= 0x7e:
+                return j + 1
+            if c < 0x20 or c > 0x3f:
+                # 非法字节，序列到此为止，避免吞掉后面的文本
+                return j
+            j += 1
+        return -1
+
+    if kind in ']PX^_':
+        # OSC / DCS / SOS / PM / APC：以 BEL 或 ST（ESC \\）结束
+        while j < n:
+            c = text[j]
+            if c == '\x07':
+                return j + 1
+            if c == _ESC:
+                if j + 1 >= n:
+                    return -1
+                if text[j + 1] == '\\':
+                    return j + 2
+            j += 1
+        return -1
+
+    # 其他转义：ESC 中间字节(0x20-0x2F)* 终止字节
+    j -= 1
+    while j < n and 0x20 <= ord(text[j]) <= 0x2f:
+        j += 1
+    return j + 1 if j < n else -1
+
+
+def tokenize_terminal_text(text):
+    """把终端输出拆分为可见文本段和控制序列
+
+    返回 (runs, escapes, tail)：runs 和 escapes 为 [(原文起点, 原文终点), ...]，
+    tail 为末尾不完整控制序列的起点，没有时等于文本长度
+    """
+    runs = []
+    escapes = []
+    n = len(text)
+    next_esc = text.find(_ESC)
+    next_csi = text.find(_CSI_8BIT)
+    run_start = 0
+    tail = n
+    while next_esc != -1 or next_csi != -1:
+        i = next_esc if next_csi == -1 or (next_esc != -1 and next_esc < next_csi) else next_csi
+        end = scan_escape(text, i)
+        if end == -1:
+            if n - i < MAX_PENDING_ESCAPE:
+                tail = i
+                break
+            end = n
+        if i > run_start:
+            runs.append((run_start, i))
+        escapes.append((i, end))
+        run_start = end
+        if next_esc != -1 and next_esc < end:
+            next_esc = text.find(_ESC, end)
+        if next_csi != -1 and next_csi < end:
+            next_csi = text.find(_CSI_8BIT, end)
+    if tail > run_start:
+        runs.append((run_start, tail))
+    return runs, escapes, tail
+
+
+class TranslationTrie:
+    """最长匹配字典树翻译器"""
+
+    def __init__(self, translations=()):
+        # 节点结构: [译文下标或-1, {码点: 子节点}]
+        self.root = [-1, {}]
+        self.values = []
+        # 每条译文的作用域编码和作用域中出现的段落名称（段落编号从 1 开始）
+        self.scopes = []
+        self.sections = []
+        self.section_ids = {}
+        # 模板规则：模板 -> 译文下标；译文下标 -> (单条模板的表达式, 占位符名称)，生成译文时使用
+        self.templates = {}
+        self.template_regexes = {}
+        for en, zh, *scope in translations:
+            self.add(en, zh, scope[0] if scope else ())
+
+    @property
+    def scoped(self):
+        return any(self.scopes)
+
+    def scope_code(self, conditions):
+        """把作用域条件列表编码为整数"""
+        code = 0
+        for condition in conditions:
+            if condition == 'word':
+                code |= SCOPE_WORD
+            elif condition == 'line-start':
+                code |= SCOPE_LINE_START
+            elif condition == 'no-section':
+                code |= SCOPE_NO_SECTION
+            elif condition.startswith('section:') and condition[8:]:
+                name = condition[8:]
+                if name not in self.section_ids:
+                    self.sections.append(name)
+                    self.section_ids[name] = len(self.sections)
+                code |= self.section_ids[name] << SCOPE_SECTION_SHIFT
+            else:
+                raise ValueError(f"未知的作用域条件: {condition}")
+        return code
+
+    def add(self, en, zh, scope=()):
+        """添加一条翻译，重复的键保留首次出现的翻译"""
+        if not en:
+            return
+        if is_template(en):
+            self.add_template(en, zh, scope)
+            return
+        node = self.root
+        for ch in en:
+            node = node[1].setdefault(ord(ch), [-1, {}])
+        if node[0] == -1:
+            node[0] = len(self.values)
+            self.values.append(zh)
+            self.scopes.append(self.scope_code(scope))
+
+    def _register_template(self, value, en):
+        """登记模板规则，返回模板开头的文字"""
+        prefix, pattern, names = template_pattern(en)
+        try:
+            regex = re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"模板规则无法编译: {en!r}（{e}）") from e
+        self.templates[en] = value
+        self.template_regexes[value] = (regex, names)
+        return prefix
+
+    def _rule_nodes(self, prefix):
+        """模板规则挂载的节点：开头文字对应的节点；以数字开头时挂在每个数字对应的节点上"""
+        if not prefix:
+            return [self.root[1].setdefault(ord(digit), [-1, {}]) for digit in '0123456789']
+        node = self.root
+        for ch in prefix:
+            node = node[1].setdefault(ord(ch), [-1, {}])
+        return [node]
+
+    def add_template(self, en, zh, scope=()):
+        """添加一条模板规则"""
+        if en in self.templates:
+            return
+        value = len(self.values)
+        self.values.append(zh)
+        self.scopes.append(self.scope_code(scope))
+        for node in self._rule_nodes(self._register_template(value, en)):
+            if len(node) == 2:
+                node.append(_RuleSet())
+            node[2].alternatives.append((value, en))
+            node[2]._compiled = None
+
+    def render(self, value, text, start):
+        """生成 text 中从 start 开始的匹配的译文：模板规则代入占位符的取值"""
+        template = self.template_regexes.get(value)
+        if template is None:
+            return self.values[value]
+        regex, names = template
+        captured = dict(zip(names, regex.match(text, start).groups()))
+        return _PLACEHOLDER_RE.sub(lambda m: captured.get(m.group(1), m.group(0)), self.values[value])
+
+    def compile(self):
+        """序列化为与 JS 注入脚本一致的紧凑格式（单分支链压缩为一条边）"""
+        nodes = []
+        rules = []
+        queue = [self.root]
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            packed = [node[0]]
+            if len(node) > 2:
+                rules.append([head - 1, node[2].pattern(), *[value for value, _ in node[2].alternatives]])
+            for cp in sorted(node[1]):
+                label = chr(cp)
+                child = node[1][cp]
+                while child[0] == -1 and len(child) == 2 and len(child[1]) == 1:
+                    (next_cp, child), = child[1].items()
+                    label += chr(next_cp)
+                packed.extend((label, len(queue)))
+                queue.append(child)
+            nodes.append(packed)
+        return {
+            'values': list(self.values),
+            'scopes': list(self.scopes),
+            'sections': list(self.sections),
+            'rules': rules,
+            'templates': [[value, en, template_pattern(en)[1]]
+                          for en, value in sorted(self.templates.items(), key=lambda item: item[1])],
+            'nodes': nodes,
+        }
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        """从序列化格式还原字典树（边标签展开为逐字符节点）"""
+        trie = cls()
+        nodes = [[packed[0], {}] for packed in compiled['nodes']]
+        for node, packed in zip(nodes, compiled['nodes']):
+            for i in range(1, len(packed), 2):
+                label = packed[i]
+                parent = node
+                for ch in label[:-1]:
+                    parent = parent[1].setdefault(ord(ch), [-1, {}])
+                parent[1][ord(label[-1])] = nodes[packed[i + 1]]
+        trie.root = nodes[0]
+        trie.values = list(compiled['values'])
+        trie.scopes = list(compiled.get('scopes') or [0] * len(trie.values))
+        trie.sections = list(compiled.get('sections', []))
+        trie.section_ids = {name: k + 1 for k, name in enumerate(trie.sections)}
+        keys = {}
+        for value, en, _ in compiled.get('templates', []):
+            trie._register_template(value, en)
+            keys[value] = en
+        for node_id, _, *alternatives in compiled.get('rules', []):
+            nodes[node_id].append(_RuleSet((value, keys[value]) for value in alternatives))
+        return trie
+
+    def find_matches(self, text, final=True, state=None):
+        """查找最左最长的短语匹配，返回 ([(起点, 终点, 译文下标), ...], 扫描停止的位置)
+        final 为 False 时，末尾可能是某个短语前缀的部分不扫描，留给下一块；
+        state 为流式翻译在数据块之间传递的作用域状态，省略时从新的一行开始"""
+        scanner = _ScopeScanner(self, text, state or new_scope_state()) if self.scoped else None
+        matches = []
+        i = 0
+        n = len(text)
+        while i < n:
+            # 从当前位置沿字典树走到底，记录满足作用域的最长完整匹配
+            node = self.root
+            value, end = -1, -1
+            undecided = False
+            rules_allowed = not _inside_number(text, i)
+            j = i
+            while j < n:
+                child = node[1].get(ord(text[j]))
+                if child is None:
+                    break
+                node = child
+                j += 1
+                if len(node) > 2 and rules_allowed:
+                    # 模板规则：从短语起点匹配合并后的表达式，比已有匹配更长时采用
+                    if not final and n - i < MAX_RULE_SPAN and text.find('\n', i) == -1:
+                        # 这一行还没有结束，占位符的取值可能被截断
+                        undecided = True
+                    else:
+                        found = node[2].match(text, i)
+                        if found and found[1] > end:
+                            code = self.scopes[found[0]] if scanner else 0
+                            allowed = scanner.allowed(code, i, found[1], final) if code else True
+                            if allowed:
+                                value, end = found[0], found[1]
+                            elif allowed is None:
+                                undecided = True
+                if node[0] != -1 and j > end:
+                    code = self.scopes[node[0]] if scanner else 0
+                    allowed = scanner.allowed(code, i, j, final) if code else True
+                    if allowed:
+                        value, end = node[0], j
+                    elif allowed is None:
+                        undecided = True
+
+            # 走到块末尾时仍可能匹配更长的短语（或整词边界、模板规则还无法确定），保留剩余部分
+            if not final and ((j == n and node[1]) or undecided):
+                break
+
+            if value != -1:
+                matches.append((i, end, value))
+                i = end
+            else:
+                i += 1
+        if scanner and state is not None:
+            scanner.save(i)
+        return matches, i
+
+    def translate_chunk(self, text, final=True, state=None):
+        """翻译一段纯文本，返回 (译文, 保留的尾部)"""
+        matches, stop = self.find_matches(text, final, state)
+        rest = text[stop:]
+        # 没有命中时原样返回
+        if not matches:
+            return text[:stop], rest
+        parts = []
+        last = 0
+        for start, end, value in matches:
+            parts.append(text[last:start])
+            parts.append(self.render(value, text, start))
+            last = end
+        parts.append(text[last:stop])
+        return ''.join(parts), rest
+
+    def translate_terminal_text(self, text, final=True, state=None):
+        """翻译终端输出：只在可见文本上匹配，控制序列原样保留，返回 (译文, 保留的尾部)
+        短语内部的控制序列紧跟在译文之后输出；末尾不完整的控制序列总是放入保留的尾部"""
+        runs, escapes, tail = tokenize_terminal_text(text)
+        if not escapes and tail == len(text):
+            return self.translate_chunk(text, final, state)
+
+        visible = ''.join(text[start:end] for start, end in runs)
+        matches, stop = self.find_matches(visible, final, state)
+
+        # 可见文本位置到原文位置的映射
+        offsets = []
+        position = 0
+        for start, end in runs:
+            offsets.append(position)
+            position += end - start
+
+        def to_source(v):
+            k = bisect.bisect_right(offsets, v) - 1
+            return runs[k][0] + v - offsets[k]
+
+        parts = []
+        pos = 0
+        e = 0
+        for start, end, value in matches:
+            translated = self.render(value, visible, start)
+            start, end = to_source(start), to_source(end - 1) + 1
+            parts.append(text[pos:start])
+            parts.append(translated)
+            while e < len(escapes) and escapes[e][0] < start:
+                e += 1
+            while e < len(escapes) and escapes[e][0] < end:
+                parts.append(text[escapes[e][0]:escapes[e][1]])
+                e += 1
+            pos = end
+        rest_start = to_source(stop) if stop < len(visible) else tail
+        parts.append(text[pos:rest_start])
+        return ''.join(parts), text[rest_start:]
+
+    def translate(self, text):
+        """翻译整段文本"""
+        return self.translate_chunk(text, True)[0]
+
+
+class StreamTranslator:
+    """流式翻译器：增量解码 UTF-8，只保留最长可能匹配的尾部和不完整的控制序列"""
+
+    def __init__(self, trie):
+        self.trie = trie
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.pending = ''
+        self.state = new_scope_state()
+
+    def write(self, data):
+        """写入一块字节数据，返回可以立即输出的译文"""
+        output, self.pending = self.trie.translate_terminal_text(
+            self.pending + self.decoder.decode(data), False, self.state)
+        return output
+
+    def flush(self):
+        """输出被保留的尾部（数据暂停时调用）"""
+        output, rest = self.trie.translate_terminal_text(self.pending, True, self.state)
+        self.pending = ''
+        return output + rest
+
+    def end(self):
+        """输入结束，输出全部剩余内容"""
+        output, rest = self.trie.translate_terminal_text(
+            self.pending + self.decoder.decode(b'', final=True), True, self.state)
+        self.pending = ''
+        return output + rest
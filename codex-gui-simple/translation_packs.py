@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 按版本划分的翻译包
+translation-packs/<版本>.json 记录相对父翻译包（或基础词典）的增量：
+新增/覆盖的译文和删除的短语。注入时按安装的 Codex CLI 版本选择
+不高于该版本的最新翻译包，规则与注入脚本的 resolvePackVersion 一致
+"""
+
+import json
+import re
+from pathlib import Path
+
+PACKS_DIR_NAME = "translation-packs"
+
+# 语义化版本：主.次.修订[-预发布][+构建信息]，允许前缀 v
+_VERSION_RE = re.compile(
+    r'^v?(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)'
+    r'(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?'
+    r'(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$'
+)
+
+
+def parse_version(text):
+    """解析语义化版本，返回 (主, 次, 修订, 预发布标识列表)；格式不正确时返回 None"""
+    match = _VERSION_RE.match(str(text).strip())
+    if not match:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    identifiers = prerelease.split('.') if prerelease else []
+    return int(major), int(minor), int(patch), identifiers
+
+
+def _compare_identifiers(a, b):
+    """比较单个预发布标识：数字按数值比较，且低于字母标识"""
+    a_numeric, b_numeric = a.isdigit(), b.isdigit()
+    if a_numeric and b_numeric:
+        a, b = int(a), int(b)
+    elif a_numeric != b_numeric:
+        return -1 if a_numeric else 1
+    return (a > b) - (a < b)
+
+
+def compare_versions(v1, v2):
+    """按语义化版本规则比较，返回 1（v1 较新）、-1（v1 较旧）或 0
+
+    预发布版本低于对应的正式版本：0.41.0-alpha.1 < 0.41.0-alpha.2 < 0.41.0；
+    版本号格式不正确时抛出 ValueError
+    """
+    a, b = parse_version(v1), parse_version(v2)
+    if a is None or b is None:
+        raise ValueError(f"无效的版本号: {v1 if a is None else v2}")
+    if a[:3] != b[:3]:
+        return 1 if a[:3] > b[:3] else -1
+    a_pre, b_pre = a[3], b[3]
+    if not a_pre or not b_pre:
+        # 没有预发布标识的正式版本更高
+        return (not a_pre) - (not b_pre)
+    for x, y in zip(a_pre, b_pre):
+        result = _compare_identifiers(x, y)
+        if result:
+            return result
+    return (len(a_pre) > len(b_pre)) - (len(a_pre) < len(b_pre))
+
+
+def load_packs(packs_dir):
+    """读取目录中的所有翻译包，返回 {版本: 翻译包}；目录不存在时返回空字典"""
+    packs = {}
+    packs_dir = Path(packs_dir) if packs_dir else None
+    if not packs_dir or not packs_dir.is_dir():
+        return packs
+    for path in sorted(packs_dir.glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            pack = json.load(f)
+        version = pack.get('version')
+        if version != path.stem or parse_version(version) is None:
+            raise ValueError(f"翻译包 {path.name} 的 version 字段应为与文件名相同的版本号")
+        packs[version] = pack
+    return packs
+
+
+def sorted_versions(versions):
+    """按语义化版本从旧到新排序"""
+    ordered = []
+    for version in versions:
+        index = len(ordered)
+        while index > 0 and compare_versions(ordered[index - 1], version) > 0:
+            index -= 1
+        ordered.insert(index, version)
+    return ordered
+
+
+def resolve_pack_version(version, versions):
+    """选择不高于 version 的最新翻译包版本；version 无效或早于所有翻译包时返回 None"""
+    if not version or parse_version(version) is None:
+        return None
+    best = None
+    for candidate in versions:
+        if compare_versions(candidate, version) <= 0 and (best is None or compare_versions(candidate, best) > 0):
+            best = candidate
+    return best
+
+
+def pack_chain(packs, version):
+    """沿 extends 找到继承链，返回从最上层父包到 version 的翻译包列表"""
+    chain = []
+    seen = set()
+    while version:
+        if version in seen:
+            raise ValueError(f"翻译包继承关系存在循环: {version}")
+        if version not in packs:
+            raise ValueError(f"找不到翻译包: {version}")
+        seen.add(version)
+        chain.append(packs[version])
+        version = packs[version].get('extends')
+    chain.reverse()
+    return chain
+
+
+def apply_packs(translations, chain):
+    """依次应用翻译包增量，返回 (翻译列表, 新增的原始条目数)
+
+    翻译包的译文排在前面，规范化时优先于父级中的同名短语；条目可以带第三项作用域
+    """
+    added = 0
+    for pack in chain:
+        overrides = [list(entry) for entry in pack.get('translations', [])]
+        dropped = set(pack.get('remove', []))
+        dropped.update(entry[0] for entry in overrides)
+        translations = overrides + [list(entry) for entry in translations if entry[0] not in dropped]
+        added += len(overrides)
+    return translations, added
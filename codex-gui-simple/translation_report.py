@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codex CLI 汉化翻译统计报告
+汇总 codex.js 记录的翻译统计（CODEX_ZH_TELEMETRY=1），
+列出从未命中的词条（可删除）和仍未翻译的输出行（可补充）
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+from codex_paths import get_telemetry_path
+from translation_engine import normalize_translations
+from translation_packs import PACKS_DIR_NAME, apply_packs, load_packs, pack_chain, resolve_pack_version
+
+DICTIONARY_PATH = Path(__file__).parent.parent / "codex-translations-compiled.json"
+PACKS_DIR = Path(__file__).parent.parent / PACKS_DIR_NAME
+
+
+def load_records(path):
+    """读取统计记录，跳过写入中断造成的残缺行"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def load_dictionary_keys(path=DICTIONARY_PATH, codex_version=None, packs_dir=PACKS_DIR):
+    """读取当前词典中实际参与匹配的短语：基础词典加上 codex_version 对应的翻译包
+    （与注入脚本相同的选包和规范化规则），返回 (短语列表, 使用的翻译包版本或 None)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        compiled = json.load(f)
+    translations = compiled['translations']
+    packs = load_packs(packs_dir)
+    pack = resolve_pack_version(codex_version, list(packs))
+    if pack:
+        translations, _ = apply_packs(translations, pack_chain(packs, pack))
+    translations, _ = normalize_translations(translations)
+    return [entry[0] for entry in translations], pack
+
+
+def detect_codex_version():
+    """已安装的 Codex CLI 版本，未安装时返回 None"""
+    from codex_detect import detect_codex
+
+    info = detect_codex()
+    return info['version'] if info['installed'] else None
+
+
+def build_report(records, keys, pack=None):
+    """汇总统计记录"""
+    hits = Counter()
+    missed = Counter()
+    chunk_p99 = []
+    chunks = 0
+    chars = 0
+    total_ms = 0.0
+    for record in records:
+        hits.update(record.get('hits', {}))
+        for line, count in record.get('unmatched', []):
+            missed[line] += count
+        timing = record.get('chunkMs', {})
+        if record.get('chunks'):
+            chunk_p99.append(timing.get('p99', 0))
+        chunks += record.get('chunks', 0)
+        chars += record.get('chars', 0)
+        total_ms += timing.get('total', 0)
+
+    known = set(keys)
+    return {
+        'sessions': len(records),
+        'pack': pack,
+        'dictionaries': sorted({r.get('dictionary') for r in records if r.get('dictionary')}),
+        'chunks': chunks,
+        'chars': chars,
+        'total_ms': total_ms,
+        'worst_chunk_p99_ms': max(chunk_p99, default=0),
+        'hits': hits.most_common(),
+        # 按长度从长到短列出，长短语通常是整句说明，最值得核对
+        'dead': sorted((key for key in keys if key not in hits), key=lambda k: (-len(k), k)),
+        'stale': sorted(key for key in hits if key not in known),
+        'missed': missed.most_common(),
+    }
+
+
+def print_report(report, top):
+    """打印报告"""
+    print(f"📊 统计记录: {report['sessions']} 次运行，{report['chunks']} 个数据块，{report['chars']} 个字符")
+    print(f"   翻译包: {report['pack'] or '无（仅使用基础词典）'}")
+    if report['chunks']:
+        average = report['total_ms'] / report['chunks']
+        print(f"   每块平均耗时: {average:.3f} ms，最差 p99: {report['worst_chunk_p99_ms']:.3f} ms")
+    if len(report['dictionaries']) > 1:
+        print(f"   ⚠️ 记录来自 {len(report['dictionaries'])} 个不同版本的词典")
+
+    print(f"\n✅ 命中最多的词条（共 {len(report['hits'])} 条命中过）:")
+    for key, count in report['hits'][:top]:
+        print(f"   {count:>6}  {key!r}")
+
+    print(f"\n🗑️ 从未命中的词条: {len(report['dead'])} 条（可考虑删除）")
+    for key in report['dead'][:top]:
+        print(f"   {key!r}")
+
+    if report['stale']:
+        print(f"\n⚠️ 已不在词典中的词条: {len(report['stale'])} 条")
+
+    print(f"\n📝 未翻译的输出行: {len(report['missed'])} 条（可考虑补充）")
+    for line, count in report['missed'][:top]:
+        print(f"   {count:>6}  {line!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="汇总 Codex CLI 汉化翻译统计")
+    parser.add_argument('--telemetry', default=str(get_telemetry_path()), help="统计文件路径")
+    parser.add_argument('--dictionary', default=str(DICTIONARY_PATH), help="编译后的词典路径")
+    parser.add_argument('--codex-version', help="按该 Codex CLI 版本选择翻译包（默认使用检测到的安装版本）")
+    parser.add_argument('--top', type=int, default=30, help="每个列表最多显示的条数")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出完整报告")
+    args = parser.parse_args(argv)
+
+    path = Path(args.telemetry)
+    if not path.exists():
+        print(f"❌ 未找到统计文件: {path}")
+        print("   请先设置环境变量 CODEX_ZH_TELEMETRY=1 后运行 codex")
+        return 1
+
+    codex_version = args.codex_version or detect_codex_version()
+    keys, pack = load_dictionary_keys(args.dictionary, codex_version)
+    report = build_report(load_records(path), keys, pack)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+#!/bin/sh
+# codex-zh-launcher: Codex CLI 汉化快速启动器（由 inject --launcher 生成，restore 时删除）
+# 帮助和交互式界面交给汉化版 codex.js 翻译，其余命令直接 exec 原生二进制文件，不启动 Node.js
+bin_dir='__CODEX_ZH_BIN_DIR__'
+binary="$bin_dir/codex-__CODEX_ZH_TARGET_TRIPLE__"
+
+# 与 codex.js 的 needsTranslation 和 isInteractiveSession 判断一致
+translate=
+for arg in "$@"; do
+  case $arg in
+    --help|-h|help) translate=1; break ;;
+  esac
+done
+if [ -z "$translate" ] && [ "${CODEX_ZH_TUI:-}" != 0 ] && [ -t 0 ] && [ -t 1 ]; then
+  case ${1-} in
+    exec|e|login|logout|mcp|proto|p|completion|debug|apply|a|--version|-V) ;;
+    *) translate=1 ;;
+  esac
+fi
+if [ -n "$translate" ] || [ ! -x "$binary" ]; then
+  exec node "$bin_dir/codex.js" "$@"
+fi
+
+# 与 codex.js 的 resolveRgDir 一致：把 @vscode/ripgrep 的 rg 加入 PATH
+# 依赖装在包内 node_modules 或提升到全局 node_modules
+package_dir=${bin_dir%/*}
+for rg_dir in "$package_dir/node_modules/@vscode/ripgrep/bin" "${package_dir%/*/*}/@vscode/ripgrep/bin"; do
+  if [ -x "$rg_dir/rg" ]; then
+    PATH="$rg_dir${PATH:+:$PATH}"
+    break
+  fi
+done
+CODEX_MANAGED_BY_NPM=1
+export PATH CODEX_MANAGED_BY_NPM
+exec "$binary" "$@"
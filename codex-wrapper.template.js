@@ -0,0 +1,1264 @@
+#!/usr/bin/env node
+// Codex CLI 汉化版 codex.js，由汉化工具根据 codex-wrapper.template.js 生成
+// codex-zh-fingerprint: __CODEX_ZH_FINGERPRINT__
+import fs from "fs";
+import os from "os";
+import path from "path";
+import { fileURLToPath } from "url";
+import { spawn } from "child_process";
+import { createHash } from "crypto";
+import { Transform } from "stream";
+import { StringDecoder } from "string_decoder";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+// 预编译的翻译数据（由注入脚本生成，仅在需要翻译时才读取）
+const translationArtifactPath = path.join(__dirname, "__CODEX_ZH_ARTIFACT_NAME__");
+const translationArtifactHash = "__CODEX_ZH_ARTIFACT_HASH__";
+// 模板和词典的指纹，任一变化时帮助输出缓存失效
+const wrapperFingerprint = "__CODEX_ZH_FINGERPRINT__";
+
+// 还原字典树节点，边按首码点索引并直接引用子节点对象，避免匹配时二次查表
+// 没有任何带作用域的短语时 scopes 为 null，匹配时完全跳过作用域检查
+function loadTranslationTrie(compiled) {
+  const nodes = compiled.nodes.map((packed) => ({ value: packed[0], next: new Map(), rules: null }));
+  compiled.nodes.forEach((packed, id) => {
+    for (let i = 1; i < packed.length; i += 2) {
+      const label = packed[i];
+      nodes[id].next.set(label.codePointAt(0), { label, node: nodes[packed[i + 1]] });
+    }
+  });
+  const scopes = compiled.scopes?.some(Boolean) ? compiled.scopes : null;
+  const sectionIds = new Map((compiled.sections || []).map((name, k) => [name, k + 1]));
+  // 模板规则：译文下标 -> { key: 模板, regex: 单条模板的表达式, names: 占位符名称 }
+  const templates = new Map();
+  for (const [value, key, pattern] of compiled.templates || []) {
+    const names = [...key.matchAll(TEMPLATE_PLACEHOLDER)].map((match) => match[1]);
+    templates.set(value, { key, regex: new RegExp(pattern, "y"), names });
+  }
+  // 节点上的规则组：合并后的表达式和每条规则的外层分组序号
+  for (const [id, pattern, ...alternatives] of compiled.rules || []) {
+    const groups = [];
+    let group = 1;
+    for (const value of alternatives) {
+      groups.push(value, group);
+      group += templates.get(value).names.length + 1;
+    }
+    nodes[id].rules = { regex: new RegExp(pattern, "y"), groups };
+  }
+  return { root: nodes[0], values: compiled.values, scopes, sectionIds, templates, stats: compiled.stats };
+}
+
+// 读取并校验翻译数据，缺失或不匹配时返回 null（退回原样输出）
+function loadTranslationArtifact() {
+  try {
+    const artifact = JSON.parse(fs.readFileSync(translationArtifactPath, "utf8"));
+    if (
+      artifact.format !== "__CODEX_ZH_ARTIFACT_FORMAT__" ||
+      artifact.version !== __CODEX_ZH_ARTIFACT_VERSION__ ||
+      artifact.hash !== translationArtifactHash
+    ) {
+      return null;
+    }
+    return loadTranslationTrie(artifact);
+  } catch {
+    return null;
+  }
+}
+
+// 检查是否需要翻译（帮助输出）
+function needsTranslation() {
+  const args = process.argv.slice(2);
+  return args.includes('--help') || args.includes('-h') || args.includes('help');
+}
+
+// 不进入交互式界面的子命令和参数
+const NON_INTERACTIVE_ARGS = new Set([
+  "exec", "e", "login", "logout", "mcp", "proto", "p",
+  "completion", "debug", "apply", "a", "--version", "-V",
+]);
+
+// 检查是否为交互式界面（TUI）会话：运行在终端中且没有指定非交互子命令
+function isInteractiveSession() {
+  const args = process.argv.slice(2);
+  if (process.env.CODEX_ZH_TUI === "0" || !process.stdin.isTTY || !process.stdout.isTTY) {
+    return false;
+  }
+  return args.length === 0 || !NON_INTERACTIVE_ARGS.has(args[0]);
+}
+
+// 本地缓存目录（与 codex-gui-simple/codex_paths.py 的规则一致）
+function getCacheDir() {
+  if (process.platform === "win32") {
+    const localAppData = process.env.LOCALAPPDATA || path.join(os.homedir(), "AppData", "Local");
+    return path.join(localAppData, "codex-zh");
+  }
+  return path.join(process.env.XDG_CACHE_HOME || path.join(os.homedir(), ".cache"), "codex-zh");
+}
+
+// 翻译统计：设置 CODEX_ZH_TELEMETRY=1 时启用，每次运行向缓存目录追加一条记录
+const TELEMETRY_FILE_NAME = "translation-telemetry.jsonl";
+const TELEMETRY_MAX_LINES = 500;
+const TELEMETRY_MAX_LINE_LENGTH = 200;
+// 译文中仍包含连续英文单词的行，视为可能漏翻的候选
+const UNTRANSLATED_LINE = /[A-Za-z]{2,}[ -]+[A-Za-z]{2,}/;
+let telemetry = null;
+
+function isTelemetryEnabled() {
+  const value = process.env.CODEX_ZH_TELEMETRY;
+  return Boolean(value) && value !== "0";
+}
+
+// 从字典树还原每个译文下标对应的英文短语
+function collectTrieKeys(trie) {
+  const keys = new Array(trie.values.length);
+  const stack = [[trie.root, ""]];
+  while (stack.length > 0) {
+    const [node, prefix] = stack.pop();
+    if (node.value !== -1) {
+      keys[node.value] = prefix;
+    }
+    for (const edge of node.next.values()) {
+      stack.push([edge.node, prefix + edge.label]);
+    }
+  }
+  for (const [value, { key }] of trie.templates) {
+    keys[value] = key;
+  }
+  return keys;
+}
+
+function percentile(sorted, p) {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+function createTelemetry(trie, mode) {
+  const hits = new Uint32Array(trie.values.length);
+  const chunkMs = [];
+  const unmatched = new Map();
+  let chars = 0;
+  let carry = "";
+  
+  // 去掉控制序列后按行检查译文，记录仍是英文的行
+  const observe = (output) => {
+    const { runs } = tokenizeTerminalText(output);
+    const pieces = [carry];
+    for (let k = 0; k < runs.length; k += 2) {
+      pieces.push(output.slice(runs[k], runs[k + 1]));
+    }
+    const lines = pieces.join("").split("\n");
+    carry = lines.pop().slice(-TELEMETRY_MAX_LINE_LENGTH);
+    lines.forEach(observeLine);
+  };
+  
+  const observeLine = (raw) => {
+    const line = raw.trim().slice(0, TELEMETRY_MAX_LINE_LENGTH);
+    if (!UNTRANSLATED_LINE.test(line)) {
+      return;
+    }
+    if (unmatched.has(line)) {
+      unmatched.set(line, unmatched.get(line) + 1);
+    } else if (unmatched.size < TELEMETRY_MAX_LINES) {
+      unmatched.set(line, 1);
+    }
+  };
+  
+  return {
+    countHits(matches) {
+      for (let k = 2; k < matches.length; k += 3) {
+        hits[matches[k]]++;
+      }
+    },
+    recordChunk(elapsedMs, size, output) {
+      chunkMs.push(elapsedMs);
+      chars += size;
+      if (output) {
+        observe(output);
+      }
+    },
+    // 追加本次运行的记录；统计失败不能影响 Codex 本身
+    save() {
+      try {
+        observeLine(carry);
+        carry = "";
+        const keys = collectTrieKeys(trie);
+        const hitCounts = {};
+        hits.forEach((count, index) => {
+          if (count > 0) {
+            hitCounts[keys[index]] = count;
+          }
+        });
+        const sorted = chunkMs.slice().sort((a, b) => a - b);
+        const record = {
+          time: new Date().toISOString(),
+          mode,
+          args: process.argv.slice(2),
+          dictionary: translationArtifactHash,
+          chunks: sorted.length,
+          chars,
+          chunkMs: {
+            total: sorted.reduce((sum, ms) => sum + ms, 0),
+            p50: percentile(sorted, 0.5),
+            p99: percentile(sorted, 0.99),
+            max: sorted.length > 0 ? sorted[sorted.length - 1] : 0,
+          },
+          hits: hitCounts,
+          unmatched: [...unmatched],
+        };
+        const dir = getCacheDir();
+        fs.mkdirSync(dir, { recursive: true });
+        fs.appendFileSync(path.join(dir, TELEMETRY_FILE_NAME), JSON.stringify(record) + "\n");
+      } catch {
+        /* ignore */
+      }
+    },
+  };
+}
+
+// 帮助输出缓存：同一个二进制文件在相同参数、语言环境和终端设置下的帮助输出总是相同的，
+// 译文保存在缓存目录中，命中时直接输出，不启动二进制文件。设置 CODEX_ZH_HELP_CACHE=0 可关闭
+const HELP_CACHE_DIR_NAME = "help-cache";
+const HELP_CACHE_BINARY_INDEX = "binaries.json";
+const HELP_CACHE_MAX_ENTRIES = 200;
+const HELP_CACHE_MAX_BYTES = 8 * 1024 * 1024;
+// 超过此大小的输出不缓存
+const HELP_CACHE_MAX_ENTRY_BYTES = 1024 * 1024;
+// 影响帮助输出内容（语言、颜色、换行宽度）的环境变量
+const HELP_CACHE_ENV = [
+  "LC_ALL", "LC_MESSAGES", "LANG", "LANGUAGE", "TERM",
+  "NO_COLOR", "CLICOLOR", "CLICOLOR_FORCE", "FORCE_COLOR", "COLUMNS",
+];
+
+// 只缓存真正的帮助请求；`codex exec help` 这类把 help 当作提示词的调用会真正执行，不能缓存
+function isHelpCacheEnabled() {
+  const args = process.argv.slice(2);
+  if (process.env.CODEX_ZH_HELP_CACHE === "0" || isTelemetryEnabled() || process.env.CODEX_ZH_STATS) {
+    return false;
+  }
+  return args.includes("--help") || args.includes("-h") || args[0] === "help";
+}
+
+function hashFile(filePath) {
+  const hash = createHash("sha256");
+  const buffer = Buffer.alloc(1024 * 1024);
+  const fd = fs.openSync(filePath, "r");
+  try {
+    let size;
+    while ((size = fs.readSync(fd, buffer, 0, buffer.length, null)) > 0) {
+      hash.update(buffer.subarray(0, size));
+    }
+  } finally {
+    fs.closeSync(fd);
+  }
+  return hash.digest("hex");
+}
+
+// 先写临时文件再重命名，并发运行的 codex 不会读到写了一半的缓存
+function writeCacheFile(filePath, data) {
+  const tmpPath = `${filePath}.${process.pid}.tmp`;
+  fs.writeFileSync(tmpPath, data);
+  fs.renameSync(tmpPath, filePath);
+}
+
+// 打开帮助输出缓存，缓存不可用时返回 null
+// 二进制文件的哈希按路径记录在 binaries.json 中，并以大小、修改时间和 inode 校验：
+// 文件不变时查询缓存只需一次 stat，二进制文件更新后旧的哈希对不上，相应的缓存随即失效
+function openHelpCache(binary) {
+  try {
+    const dir = path.join(getCacheDir(), HELP_CACHE_DIR_NAME);
+    const indexPath = path.join(dir, HELP_CACHE_BINARY_INDEX);
+    const stat = fs.statSync(binary);
+    const signature = `${stat.size}:${stat.mtimeMs}:${stat.ino}`;
+    let index = {};
+    try {
+      index = JSON.parse(fs.readFileSync(indexPath, "utf8"));
+    } catch {
+      /* 首次使用 */
+    }
+    const known = index[binary]?.signature === signature ? index[binary].hash : null;
+    
+    const key = createHash("sha256")
+      .update(JSON.stringify([
+        process.argv.slice(2),
+        HELP_CACHE_ENV.map((name) => process.env[name] ?? null),
+        Boolean(process.stdout.isTTY),
+        Boolean(process.stderr.isTTY),
+        process.stdout.columns ?? null,
+      ]))
+      .digest("hex");
+    // 文件名依次为指纹、二进制文件哈希和参数等信息的哈希，便于按前缀清理失效的缓存
+    const entryPath = (binaryHash) =>
+      path.join(dir, `${wrapperFingerprint}-${binaryHash.slice(0, 16)}-${key.slice(0, 32)}.json`);
+    
+    return {
+      lookup() {
+        if (!known) {
+          return null;
+        }
+        const file = entryPath(known);
+        const entry = JSON.parse(fs.readFileSync(file, "utf8"));
+        // 修改时间作为最近使用时间，超出上限时先淘汰最久未用的
+        const now = new Date();
+        fs.utimesSync(file, now, now);
+        return entry;
+      },
+      store(entry) {
+        fs.mkdirSync(dir, { recursive: true });
+        const binaryHash = known || hashFile(binary);
+        if (!known) {
+          const previous = index[binary]?.hash;
+          index[binary] = { signature, hash: binaryHash };
+          writeCacheFile(indexPath, JSON.stringify(index));
+          // 同一路径的二进制文件已更新，删除旧版本的缓存
+          if (previous && previous !== binaryHash) {
+            for (const name of fs.readdirSync(dir)) {
+              if (name.includes(`-${previous.slice(0, 16)}-`)) {
+                fs.rmSync(path.join(dir, name), { force: true });
+              }
+            }
+          }
+        }
+        writeCacheFile(entryPath(binaryHash), JSON.stringify(entry));
+        pruneHelpCache(dir);
+      },
+    };
+  } catch {
+    return null;
+  }
+}
+
+// 删除模板或词典已变化的缓存，其余按最近使用时间保留不超过上限的条目
+function pruneHelpCache(dir) {
+  const entries = [];
+  for (const name of fs.readdirSync(dir)) {
+    if (!name.endsWith(".json") || name === HELP_CACHE_BINARY_INDEX) {
+      continue;
+    }
+    const file = path.join(dir, name);
+    if (!name.startsWith(`${wrapperFingerprint}-`)) {
+      fs.rmSync(file, { force: true });
+      continue;
+    }
+    const stat = fs.statSync(file, { throwIfNoEntry: false });
+    if (stat) {
+      entries.push({ file, size: stat.size, used: stat.mtimeMs });
+    }
+  }
+  entries.sort((a, b) => b.used - a.used);
+  let total = 0;
+  entries.forEach((entry, i) => {
+    total += entry.size;
+    if (i >= HELP_CACHE_MAX_ENTRIES || total > HELP_CACHE_MAX_BYTES) {
+      fs.rmSync(entry.file, { force: true });
+    }
+  });
+}
+
+// 收集写给终端的译文，超过缓存上限后放弃
+function createOutputCapture() {
+  const chunks = [];
+  let size = 0;
+  return {
+    add(chunk) {
+      if (size <= HELP_CACHE_MAX_ENTRY_BYTES) {
+        chunks.push(chunk);
+        size += chunk.length;
+      }
+    },
+    text() {
+      return size <= HELP_CACHE_MAX_ENTRY_BYTES ? Buffer.concat(chunks).toString("utf8") : null;
+    },
+  };
+}
+
+// 输出缓存的译文，写完后以缓存的退出码退出
+function writeCachedHelp(entry) {
+  const write = (stream, text) => new Promise((resolve) => {
+    stream.once("error", resolve);
+    stream.write(text, resolve);
+  });
+  Promise.all([write(process.stdout, entry.stdout), write(process.stderr, entry.stderr)])
+    .then(() => process.exit(entry.code));
+}
+
+// 短语的作用域（规则与 codex-gui-simple/translation_engine.py 一致），每条译文编码为一个整数：
+// 整词、行首（允许缩进）、帮助段落之外，以及 section:名称 指定的帮助段落
+const SCOPE_WORD = 1;
+const SCOPE_LINE_START = 2;
+const SCOPE_NO_SECTION = 4;
+const SCOPE_SECTION_SHIFT = 3;
+// 帮助段落标题：顶格、单独成行、以冒号结尾，如 "Options:"
+const SECTION_HEADER = /^([A-Z][A-Za-z ]{0,39}):[ \t\r]*$/;
+// 跨数据块保留的行首文本长度（足以判断是否为段落标题）
+const MAX_LINE_HEAD = 64;
+
+// 模板规则的占位符，如 {n}
+const TEMPLATE_PLACEHOLDER = /\{([a-z][a-z0-9_]*)\}/g;
+// 流式翻译时，模板规则的匹配最多等待这么多字符（或等到行尾）
+const MAX_RULE_SPAN = 256;
+
+// i 处的数字前面紧跟着数字：模板规则只从一串数字的开头尝试，避免长数字串被反复扫描
+function isInsideNumber(text, i) {
+  if (i === 0) {
+    return false;
+  }
+  const c = text.charCodeAt(i);
+  const p = text.charCodeAt(i - 1);
+  return c >= 48 && c <= 57 && p >= 48 && p <= 57;
+}
+
+// 从 i 开始匹配节点上的规则组，返回 [译文下标, 终点] 或 null；排在前面的规则优先
+function matchRules(rules, text, i) {
+  rules.regex.lastIndex = i;
+  const match = rules.regex.exec(text);
+  if (match === null) {
+    return null;
+  }
+  const { groups } = rules;
+  for (let k = 0; k < groups.length; k += 2) {
+    if (match[groups[k + 1]] !== undefined) {
+      return [groups[k], i + match[0].length];
+    }
+  }
+  return null;
+}
+
+// 生成 text 中从 start 开始的匹配的译文：模板规则代入占位符的取值
+function renderMatch(trie, value, text, start) {
+  const template = trie.templates.get(value);
+  if (template === undefined) {
+    return trie.values[value];
+  }
+  template.regex.lastIndex = start;
+  const match = template.regex.exec(text);
+  return trie.values[value].replace(TEMPLATE_PLACEHOLDER, (whole, name) => {
+    const k = template.names.indexOf(name);
+    return k === -1 ? whole : match[k + 1];
+  });
+}
+
+function isWordCode(c) {
+  return (c >= 0x30 && c <= 0x39) || (c >= 0x41 && c <= 0x5a) || (c >= 0x61 && c <= 0x7a) || c === 0x5f;
+}
+
+// 数据块之间传递的扫描状态：前一个字符是否为字母数字、当前行是否仍只有缩进、
+// 当前行已输出部分的开头和所在的帮助段落（0 为段落之外，-1 为未登记的段落）
+function newScopeState() {
+  return { prevWord: false, lineStart: true, lineHead: "", section: 0 };
+}
+
+// 按需向前推进的行扫描器：只有遇到带作用域的候选短语时才确定行首和所在段落
+function createScopeScanner(trie, text, state) {
+  let lineBegin = 0;
+  let section = state.section;
+  
+  const isBlank = (start, end) => {
+    for (let k = start; k < end; k++) {
+      const c = text.charCodeAt(k);
+      if (c !== 0x20 && c !== 0x09 && c !== 0x0d) {
+        return false;
+      }
+    }
+    return true;
+  };
+  
+  // 一行结束：顶格的段落标题进入该段落，其他顶格文本离开段落
+  const finishLine = (line) => {
+    if (/^[ \t\r]*$/.test(line) || line[0] === " " || line[0] === "\t") {
+      return;
+    }
+    const header = SECTION_HEADER.exec(line);
+    section = header ? trie.sectionIds.get(header[1]) ?? -1 : 0;
+  };
+  
+  // 处理 i 之前已完整的行
+  const advance = (i) => {
+    for (;;) {
+      const nl = text.indexOf("\n", lineBegin);
+      if (nl === -1 || nl >= i) {
+        return;
+      }
+      const c = lineBegin === 0 && state.lineHead ? -1 : text.charCodeAt(lineBegin);
+      if (c === 0x20 || c === 0x09 || nl === lineBegin) {
+        // 缩进或空行，所在段落不变
+      } else if (c > 0x20 && (c < 0x41 || c > 0x5a)) {
+        // 不以大写字母开头的顶格文本不可能是段落标题
+        section = 0;
+      } else {
+        finishLine((lineBegin === 0 ? state.lineHead : "") + text.slice(lineBegin, nl));
+      }
+      lineBegin = nl + 1;
+    }
+  };
+  
+  return {
+    // 检查 [i, j) 的匹配是否满足作用域；需要后续数据才能判断时返回 null
+    allowed(code, i, j, final) {
+      if (code & SCOPE_WORD) {
+        if (isWordCode(text.charCodeAt(i)) && (i > 0 ? isWordCode(text.charCodeAt(i - 1)) : state.prevWord)) {
+          return false;
+        }
+        if (isWordCode(text.charCodeAt(j - 1))) {
+          if (j < text.length) {
+            if (isWordCode(text.charCodeAt(j))) {
+              return false;
+            }
+          } else if (!final) {
+            return null;
+          }
+        }
+      }
+      if (code & SCOPE_LINE_START) {
+        advance(i);
+        if (!isBlank(lineBegin, i) || (lineBegin === 0 && !state.lineStart)) {
+          return false;
+        }
+      }
+      const wanted = code >> SCOPE_SECTION_SHIFT;
+      if (code & SCOPE_NO_SECTION || wanted) {
+        advance(i);
+        // 顶格的行（段落标题、用法说明等）不属于任何段落
+        const first = (lineBegin === 0 && state.lineHead) || text[lineBegin];
+        const current = first[0] === " " || first[0] === "\t" ? section : 0;
+        if ((code & SCOPE_NO_SECTION && current !== 0) || (wanted && current !== wanted)) {
+          return false;
+        }
+      }
+      return true;
+    },
+    // 把扫描停止位置处的状态写回，供下一块数据使用
+    save(stop) {
+      advance(stop);
+      if (stop > 0) {
+        state.prevWord = isWordCode(text.charCodeAt(stop - 1));
+      }
+      const blank = isBlank(lineBegin, stop);
+      if (lineBegin === 0) {
+        state.lineStart = state.lineStart && blank;
+        state.lineHead = (state.lineHead + text.slice(0, stop)).slice(0, MAX_LINE_HEAD);
+      } else {
+        state.lineStart = blank;
+        state.lineHead = text.slice(lineBegin, stop).slice(0, MAX_LINE_HEAD);
+      }
+      state.section = section;
+    },
+  };
+}
+
+// 单次扫描，沿字典树查找最左最长的短语匹配
+// 返回 { matches: [起点, 终点, 译文下标, ...] 或 null（没有命中）, stop: 扫描停止的位置 }
+// final 为 false 时，末尾可能是某个短语前缀的部分不扫描，留给下一块数据；
+// state 为流式翻译在数据块之间传递的作用域状态，省略时从新的一行开始
+function findMatches(trie, text, final, state) {
+  const scopes = trie.scopes;
+  const scanner = scopes === null ? null : createScopeScanner(trie, text, state || newScopeState());
+  let matches = null;
+  let i = 0;
+  const n = text.length;
+  while (i < n) {
+    // 从当前位置沿字典树走到底，记录满足作用域的最长完整匹配
+    let node = trie.root;
+    let matchValue = -1;
+    let matchEnd = -1;
+    let more = false;
+    const rulesAllowed = !isInsideNumber(text, i);
+    let j = i;
+    while (j < n) {
+      const edge = node.next.get(text.codePointAt(j));
+      if (edge === undefined) {
+        break;
+      }
+      if (!text.startsWith(edge.label, j)) {
+        // 文本在边的中途结束，且与边标签一致：后续数据可能补全
+        more = n - j < edge.label.length && edge.label.startsWith(text.slice(j));
+        break;
+      }
+      j += edge.label.length;
+      node = edge.node;
+      if (node.rules !== null && rulesAllowed) {
+        // 模板规则：从短语起点匹配合并后的表达式，比已有匹配更长时采用
+        if (!final && n - i < MAX_RULE_SPAN && text.indexOf("\n", i) === -1) {
+          // 这一行还没有结束，占位符的取值可能被截断
+          more = true;
+        } else {
+          const found = matchRules(node.rules, text, i);
+          if (found !== null && found[1] > matchEnd) {
+            const allowed = scanner === null || scopes[found[0]] === 0 ||
+              scanner.allowed(scopes[found[0]], i, found[1], final);
+            if (allowed) {
+              matchValue = found[0];
+              matchEnd = found[1];
+            } else if (allowed === null) {
+              more = true;
+            }
+          }
+        }
+      }
+      if (node.value !== -1 && j > matchEnd) {
+        const allowed = scanner === null || scopes[node.value] === 0 ||
+          scanner.allowed(scopes[node.value], i, j, final);
+        if (allowed) {
+          matchValue = node.value;
+          matchEnd = j;
+        } else if (allowed === null) {
+          // 整词边界要等下一块数据才能确定
+          more = true;
+        }
+      }
+    }
+    if (j === n && node.next.size > 0) {
+      more = true;
+    }
+    
+    // 走到块末尾时仍可能匹配更长的短语，保留剩余部分等待后续数据
+    if (!final && more) {
+      break;
+    }
+    
+    if (matchValue !== -1) {
+      if (matches === null) {
+        matches = [];
+      }
+      matches.push(i, matchEnd, matchValue);
+      i = matchEnd;
+    } else {
+      i += text.codePointAt(i) > 0xffff ? 2 : 1;
+    }
+  }
+  if (scanner !== null && state) {
+    scanner.save(i);
+  }
+  return { matches, stop: i };
+}
+
+// 翻译一段纯文本，返回 { output, rest }
+function translateChunk(trie, text, final, state) {
+  const { matches, stop } = findMatches(trie, text, final, state);
+  if (telemetry !== null && matches !== null) {
+    telemetry.countHits(matches);
+  }
+  const rest = stop < text.length ? text.slice(stop) : '';
+  // 没有命中时直接切片返回，不产生任何中间字符串
+  if (matches === null) {
+    return { output: rest ? text.slice(0, stop) : text, rest };
+  }
+  const parts = [];
+  let last = 0;
+  for (let k = 0; k < matches.length; k += 3) {
+    parts.push(text.slice(last, matches[k]), renderMatch(trie, matches[k + 2], text, matches[k]));
+    last = matches[k + 1];
+  }
+  parts.push(text.slice(last, stop));
+  return { output: parts.join(''), rest };
+}
+
+// 不完整的控制序列最多保留的长度，超过后按原样输出
+const MAX_PENDING_ESCAPE = 4096;
+
+// 返回从 i 开始的终端控制序列的结束位置；序列在文本末尾被截断时返回 -1
+function scanEscape(text, i) {
+  const n = text.length;
+  let j = i + 1;
+  let kind = text.charCodeAt(i) === 0x9b ? 0x5b : -1;
+  if (kind === -1) {
+    if (j >= n) {
+      return -1;
+    }
+    kind = text.charCodeAt(j);
+    j++;
+  }
+  
+  if (kind === 0x5b) {
+    // CSI：参数字节 0x30-0x3F，中间字节 0x20-0x2F，终止字节 0x40-0x7E
+    while (j < n) {
+      const c = text.charCodeAt(j);
+      if (c >= 0x40 && c <= 0x7e) {
+        return j + 1;
+      }
+      if (c < 0x20 || c > 0x3f) {
+        // 非法字节，序列到此为止，避免吞掉后面的文本
+        return j;
+      }
+      j++;
+    }
+    return -1;
+  }
+  
+  if (kind === 0x5d || kind === 0x50 || kind === 0x58 || kind === 0x5e || kind === 0x5f) {
+    // OSC / DCS / SOS / PM / APC：以 BEL 或 ST（ESC \）结束
+    while (j < n) {
+      const c = text.charCodeAt(j);
+      if (c === 0x07) {
+        return j + 1;
+      }
+      if (c === 0x1b) {
+        if (j + 1 >= n) {
+          return -1;
+        }
+        if (text.charCodeAt(j + 1) === 0x5c) {
+          return j + 2;
+        }
+      }
+      j++;
+    }
+    return -1;
+  }
+  
+  // 其他转义：ESC 中间字节(0x20-0x2F)* 终止字节
+  j--;
+  while (j < n && text.charCodeAt(j) >= 0x20 && text.charCodeAt(j) <= 0x2f) {
+    j++;
+  }
+  return j < n ? j + 1 : -1;
+}
+
+const ESC = String.fromCharCode(0x1b);
+const CSI_8BIT = String.fromCharCode(0x9b);
+
+// 把终端输出拆分为可见文本段和控制序列
+// 返回 { runs: [原文起点, 原文终点, ...], escapes: [原文起点, 原文终点, ...], tail }
+// tail 为末尾不完整控制序列的起点，没有时等于文本长度
+function tokenizeTerminalText(text) {
+  const runs = [];
+  const escapes = [];
+  const n = text.length;
+  let nextEsc = text.indexOf(ESC);
+  let nextCsi = text.indexOf(CSI_8BIT);
+  let runStart = 0;
+  let tail = n;
+  while (nextEsc !== -1 || nextCsi !== -1) {
+    const i = nextCsi === -1 || (nextEsc !== -1 && nextEsc < nextCsi) ? nextEsc : nextCsi;
+    let end = scanEscape(text, i);
+    if (end === -1) {
+      if (n - i < MAX_PENDING_ESCAPE) {
+        tail = i;
+        break;
+      }
+      end = n;
+    }
+    if (i > runStart) {
+      runs.push(runStart, i);
+    }
+    escapes.push(i, end);
+    runStart = end;
+    if (nextEsc !== -1 && nextEsc < end) {
+      nextEsc = text.indexOf(ESC, end);
+    }
+    if (nextCsi !== -1 && nextCsi < end) {
+      nextCsi = text.indexOf(CSI_8BIT, end);
+    }
+  }
+  if (tail > runStart) {
+    runs.push(runStart, tail);
+  }
+  return { runs, escapes, tail };
+}
+
+// 翻译终端输出：只在可见文本上匹配，控制序列原样保留
+// 被控制序列（如颜色）拆开的短语也能命中，短语内部的控制序列紧跟在译文之后输出
+// 末尾不完整的控制序列总是放入 rest，由调用方决定等待后续数据还是原样输出
+function translateTerminalText(trie, text, final, state) {
+  const { runs, escapes, tail } = tokenizeTerminalText(text);
+  if (escapes.length === 0 && tail === text.length) {
+    return translateChunk(trie, text, final, state);
+  }
+  
+  let visibleText = runs.length === 2 ? text.slice(runs[0], runs[1]) : "";
+  if (runs.length > 2) {
+    const pieces = [];
+    for (let k = 0; k < runs.length; k += 2) {
+      pieces.push(text.slice(runs[k], runs[k + 1]));
+    }
+    visibleText = pieces.join("");
+  }
+  const { matches, stop } = findMatches(trie, visibleText, final, state);
+  if (telemetry !== null && matches !== null) {
+    telemetry.countHits(matches);
+  }
+  
+  // 可见文本位置到原文位置的映射，查询位置单调递增，用游标顺序推进
+  let run = 0;
+  let runVisible = 0;
+  const toSource = (v) => {
+    while (run + 2 < runs.length && v >= runVisible + runs[run + 1] - runs[run]) {
+      runVisible += runs[run + 1] - runs[run];
+      run += 2;
+    }
+    return runs[run] + v - runVisible;
+  };
+  
+  // 未命中的部分连同其中的控制序列直接从原文切片
+  const parts = [];
+  let pos = 0;
+  if (matches !== null) {
+    let e = 0;
+    for (let k = 0; k < matches.length; k += 3) {
+      const translated = renderMatch(trie, matches[k + 2], visibleText, matches[k]);
+      const start = toSource(matches[k]);
+      const end = toSource(matches[k + 1] - 1) + 1;
+      parts.push(text.slice(pos, start), translated);
+      while (e < escapes.length && escapes[e] < start) {
+        e += 2;
+      }
+      while (e < escapes.length && escapes[e] < end) {
+        parts.push(text.slice(escapes[e], escapes[e + 1]));
+        e += 2;
+      }
+      pos = end;
+    }
+  }
+  const restStart = stop < visibleText.length ? toSource(stop) : tail;
+  parts.push(text.slice(pos, restStart));
+  return { output: parts.join(""), rest: text.slice(restStart) };
+}
+
+// 流式翻译器：增量解码 UTF-8，只保留最长可能匹配的尾部和不完整的控制序列
+function createStreamTranslator(trie) {
+  const decoder = new StringDecoder("utf8");
+  const state = newScopeState();
+  let pending = "";
+  
+  const translate = (text, final) => {
+    if (telemetry === null) {
+      return translateTerminalText(trie, text, final, state);
+    }
+    const start = process.hrtime.bigint();
+    const result = translateTerminalText(trie, text, final, state);
+    telemetry.recordChunk(Number(process.hrtime.bigint() - start) / 1e6, text.length, result.output);
+    return result;
+  };
+  
+  return {
+    write(data) {
+      const result = translate(pending + decoder.write(data), false);
+      pending = result.rest;
+      return result.output;
+    },
+    // 输出被保留的尾部（数据暂停时调用，保证延迟有上限）
+    flush() {
+      const result = translate(pending, true);
+      pending = "";
+      return result.output + result.rest;
+    },
+    end() {
+      const result = translate(pending + decoder.end(), true);
+      pending = "";
+      return result.output + result.rest;
+    },
+    hasPending() {
+      return pending.length > 0;
+    },
+  };
+}
+
+// 保留的尾部在输出暂停多久后强制刷新（毫秒）
+const PENDING_FLUSH_DELAY_MS = 50;
+
+// 翻译转换流：数据块经过流式翻译器后交给下游，缓冲区大小由 highWaterMark 限制
+function createTranslateStream(trie) {
+  const translator = createStreamTranslator(trie);
+  let flushTimer = null;
+  
+  // 只有上游确实没有新数据时才强制输出保留的尾部；下游已满导致的停顿不算，
+  // 否则跨数据块的短语会因背压被拆开而漏译
+  const flushPending = () => {
+    if (stream.isPaused() || stream.readableLength > 0) {
+      flushTimer = setTimeout(flushPending, PENDING_FLUSH_DELAY_MS);
+      return;
+    }
+    flushTimer = null;
+    const rest = translator.flush();
+    if (rest) {
+      stream.push(rest);
+    }
+  };
+  
+  const stream = new Transform({
+    transform(data, _encoding, callback) {
+      clearTimeout(flushTimer);
+      flushTimer = null;
+      const text = translator.write(data);
+      if (translator.hasPending()) {
+        flushTimer = setTimeout(flushPending, PENDING_FLUSH_DELAY_MS);
+      }
+      callback(null, text || undefined);
+    },
+    flush(callback) {
+      clearTimeout(flushTimer);
+      callback(null, translator.end() || undefined);
+    },
+  });
+  return stream;
+}
+
+// 将子进程输出流翻译后写入目标流（子进程输出 → 解码 → 翻译 → 目标流）
+// pipe 会在目标流缓冲区满时暂停读取子进程输出，管道写满后子进程自然阻塞，内存占用与输出总量无关。
+// 返回的 Promise 在全部译文交给目标流后完成；目标流出错（如分页程序提前退出）时关闭读取端，
+// 子进程随后写入会收到 EPIPE，与直接运行时的行为一致。capture 用于收集译文写入帮助输出缓存
+function pipeTranslated(source, target, trie, capture) {
+  const translate = createTranslateStream(trie);
+  if (capture) {
+    translate.on("data", (chunk) => capture.add(chunk));
+  }
+  return new Promise((resolve) => {
+    const abort = () => {
+      target.off("error", abort);
+      source.unpipe(translate);
+      translate.unpipe(target);
+      source.destroy();
+      translate.destroy();
+      resolve();
+    };
+    target.on("error", abort);
+    translate.once("error", abort);
+    // 写入空字符串的回调在之前的数据全部写出后才执行
+    translate.once("end", () => target.write("", () => {
+      target.off("error", abort);
+      resolve();
+    }));
+    // 目标是 process.stdout/stderr 时 pipe 不会关闭它们
+    source.pipe(translate).pipe(target);
+  });
+}
+
+// 单帧翻译的耗时预算（毫秒）；连续超出预算的帧数达到上限后，本次会话停止翻译
+const FRAME_BUDGET_MS = 4;
+const FRAME_OVERRUN_LIMIT = 3;
+
+// 加载可选的伪终端模块 node-pty
+async function loadPtyModule() {
+  const pty = await tryImport("node-pty");
+  if (pty?.spawn) {
+    return pty;
+  }
+  return pty?.default?.spawn ? pty.default : null;
+}
+
+// 在伪终端中运行交互式界面：转发原始按键和窗口大小，逐帧翻译屏幕输出
+function runPtySession(pty, trie, env) {
+  const term = pty.spawn(binaryPath, process.argv.slice(2), {
+    name: process.env.TERM || "xterm-256color",
+    cols: process.stdout.columns || 80,
+    rows: process.stdout.rows || 24,
+    cwd: process.cwd(),
+    env,
+  });
+  
+  // 无论以何种方式退出（包括未捕获的异常）都恢复终端的行缓冲模式
+  const restoreTerminal = () => {
+    try {
+      process.stdin.setRawMode(false);
+    } catch {
+      /* ignore */
+    }
+  };
+  process.on("exit", restoreTerminal);
+
+  // 按键直接写入伪终端，不经过翻译，保证回显延迟
+  process.stdin.setRawMode(true);
+  process.stdin.on("data", (data) => term.write(data));
+  process.stdin.resume();
+  process.stdout.on("resize", () => {
+    term.resize(process.stdout.columns || 80, process.stdout.rows || 24);
+  });
+  
+  // 同一轮事件循环内到达的输出合并为一帧
+  let frame = [];
+  let pending = "";
+  let scheduled = false;
+  let overruns = 0;
+  let translating = true;
+  
+  const flushFrame = () => {
+    scheduled = false;
+    const text = pending + frame.join("");
+    frame = [];
+    pending = "";
+    if (!text) {
+      return;
+    }
+    if (!translating) {
+      process.stdout.write(text);
+      return;
+    }
+    const start = process.hrtime.bigint();
+    let result;
+    try {
+      result = translateTerminalText(trie, text, true);
+    } catch {
+      // 翻译出错时原样输出这一帧，本次会话改为透明传递
+      translating = false;
+      process.stdout.write(text);
+      return;
+    }
+    const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+    telemetry?.recordChunk(elapsedMs, text.length, result.output);
+    overruns = elapsedMs > FRAME_BUDGET_MS ? overruns + 1 : 0;
+    if (overruns >= FRAME_OVERRUN_LIMIT) {
+      translating = false;
+    }
+    pending = result.rest;
+    if (result.output) {
+      process.stdout.write(result.output);
+    }
+  };
+  
+  term.onData((data) => {
+    frame.push(data);
+    if (!scheduled) {
+      scheduled = true;
+      setImmediate(flushFrame);
+    }
+  });
+  
+  // 收到 SIGTERM / SIGHUP 时恢复终端并转发给子进程，子进程退出后以同一信号退出
+  const signalHandlers = {};
+  const removeSignalHandlers = () => {
+    for (const [sig, handler] of Object.entries(signalHandlers)) {
+      process.off(sig, handler);
+    }
+  };
+  ["SIGTERM", "SIGHUP"].forEach((sig) => {
+    signalHandlers[sig] = () => {
+      restoreTerminal();
+      try {
+        term.kill(sig);
+      } catch {
+        // 子进程已经退出，直接按默认方式处理信号
+        removeSignalHandlers();
+        process.kill(process.pid, sig);
+      }
+    };
+    process.on(sig, signalHandlers[sig]);
+  });
+  
+  term.onExit(({ exitCode, signal }) => {
+    flushFrame();
+    if (pending) {
+      process.stdout.write(pending);
+    }
+    restoreTerminal();
+    telemetry?.save();
+    if (signal) {
+      removeSignalHandlers();
+      process.kill(process.pid, signal);
+    } else {
+      process.exit(exitCode ?? 1);
+    }
+  });
+}
+
+const { platform, arch } = process;
+
+let targetTriple = null;
+switch (platform) {
+  case "linux":
+  case "android":
+    switch (arch) {
+      case "x64":
+        targetTriple = "x86_64-unknown-linux-musl";
+        break;
+      case "arm64":
+        targetTriple = "aarch64-unknown-linux-musl";
+        break;
+      default:
+        break;
+    }
+    break;
+  case "darwin":
+    switch (arch) {
+      case "x64":
+        targetTriple = "x86_64-apple-darwin";
+        break;
+      case "arm64":
+        targetTriple = "aarch64-apple-darwin";
+        break;
+      default:
+        break;
+    }
+    break;
+  case "win32":
+    switch (arch) {
+      case "x64":
+        targetTriple = "x86_64-pc-windows-msvc.exe";
+        break;
+      case "arm64":
+        targetTriple = "aarch64-pc-windows-msvc.exe";
+        break;
+      default:
+        break;
+    }
+    break;
+  default:
+    break;
+}
+
+if (!targetTriple) {
+  throw new Error(`Unsupported platform: ${platform} (${arch})`);
+}
+
+const binaryPath = path.join(__dirname, `codex-${targetTriple}`);
+
+async function tryImport(moduleName) {
+  try {
+    return await import(moduleName);
+  } catch (err) {
+    return null;
+  }
+}
+
+async function resolveRgDir() {
+  const ripgrep = await tryImport("@vscode/ripgrep");
+  if (!ripgrep?.rgPath) {
+    return null;
+  }
+  return path.dirname(ripgrep.rgPath);
+}
+
+function getUpdatedPath(newDirs) {
+  const pathSep = process.platform === "win32" ? ";" : ":";
+  const existingPath = process.env.PATH || "";
+  const updatedPath = [
+    ...newDirs,
+    ...existingPath.split(pathSep).filter(Boolean),
+  ].join(pathSep);
+  return updatedPath;
+}
+
+const helpMode = needsTranslation();
+// 帮助输出缓存命中时不再查找 ripgrep、加载翻译数据和启动二进制文件
+const helpCache = helpMode && isHelpCacheEnabled() ? openHelpCache(binaryPath) : null;
+let cachedHelp = null;
+try {
+  cachedHelp = helpCache?.lookup() ?? null;
+} catch {
+  /* 未命中 */
+}
+
+const additionalDirs = [];
+const rgDir = cachedHelp ? null : await resolveRgDir();
+if (rgDir) {
+  additionalDirs.push(rgDir);
+}
+const updatedPath = getUpdatedPath(additionalDirs);
+
+// 只有需要翻译的命令才加载翻译数据，透明传递路径不读取任何额外文件
+const interactiveMode = !helpMode && isInteractiveSession();
+const translationTrie = (helpMode && !cachedHelp) || interactiveMode ? loadTranslationArtifact() : null;
+if (translationTrie && isTelemetryEnabled()) {
+  telemetry = createTelemetry(translationTrie, helpMode ? "help" : "tui");
+}
+// 交互式界面需要伪终端，没有安装 node-pty 时完全透明传递
+const ptyModule = interactiveMode && translationTrie ? await loadPtyModule() : null;
+
+if (cachedHelp) {
+  writeCachedHelp(cachedHelp);
+} else if (ptyModule) {
+  runPtySession(ptyModule, translationTrie, {
+    ...process.env,
+    PATH: updatedPath,
+    CODEX_MANAGED_BY_NPM: "1",
+  });
+} else if (helpMode && translationTrie) {
+  // 对于需要翻译的命令，进行最终翻译处理
+  const child = spawn(binaryPath, process.argv.slice(2), {
+    stdio: ["inherit", "pipe", "pipe"],
+    env: { ...process.env, PATH: updatedPath, CODEX_MANAGED_BY_NPM: "1" },
+  });
+
+  child.on("error", (err) => {
+    console.error(err);
+    process.exit(1);
+  });
+
+  // 实时翻译输出（跨数据块的短语和多字节字符也能正确处理）
+  const captures = helpCache ? [createOutputCapture(), createOutputCapture()] : [];
+  const outputDone = Promise.all([
+    pipeTranslated(child.stdout, process.stdout, translationTrie, captures[0]),
+    pipeTranslated(child.stderr, process.stderr, translationTrie, captures[1]),
+  ]);
+
+  child.on('close', async (code, signal) => {
+    // 等待译文全部写出后再退出，避免输出被截断
+    await outputDone;
+    // 正常结束的帮助输出写入缓存，下次直接使用
+    const [stdoutText, stderrText] = captures.map((capture) => capture.text());
+    if (helpCache && !signal && code !== null && stdoutText !== null && stderrText !== null) {
+      try {
+        helpCache.store({ stdout: stdoutText, stderr: stderrText, code });
+      } catch {
+        /* 缓存失败不影响 Codex 本身 */
+      }
+    }
+    // 设置 CODEX_ZH_STATS 时报告词典规模，便于跟踪每块扫描成本
+    const stats = translationTrie.stats;
+    if (process.env.CODEX_ZH_STATS && stats) {
+      process.stderr.write(
+        `[codex-zh] 词典: ${stats.sourceEntries} 条 → ${stats.phrases} 个唯一短语（规范化去除 ${stats.removed} 条）\n`
+      );
+    }
+    telemetry?.save();
+    process.exit(code || 0);
+  });
+
+  const forwardSignal = (signal) => {
+    if (child.killed) {
+      return;
+    }
+    try {
+      child.kill(signal);
+    } catch {
+      /* ignore */
+    }
+  };
+
+  ["SIGINT", "SIGTERM", "SIGHUP"].forEach((sig) => {
+    process.on(sig, () => forwardSignal(sig));
+  });
+} else {
+  // 非翻译命令，完全透明传递
+  const child = spawn(binaryPath, process.argv.slice(2), {
+    stdio: "inherit",
+    env: { ...process.env, PATH: updatedPath, CODEX_MANAGED_BY_NPM: "1" },
+  });
+
+  child.on("error", (err) => {
+    console.error(err);
+    process.exit(1);
+  });
+
+  const forwardSignal = (signal) => {
+    if (child.killed) {
+      return;
+    }
+    try {
+      child.kill(signal);
+    } catch {
+      /* ignore */
+    }
+  };
+
+  ["SIGINT", "SIGTERM", "SIGHUP"].forEach((sig) => {
+    process.on(sig, () => forwardSignal(sig));
+  });
+
+  const childResult = await new Promise((resolve) => {
+    child.on("exit", (code, signal) => {
+      if (signal) {
+        resolve({ type: "signal", signal });
+      } else {
+        resolve({ type: "code", exitCode: code ?? 1 });
+      }
+    });
+  });
+
+  if (childResult.type === "signal") {
+    process.kill(process.pid, childResult.signal);
+  } else {
+    process.exit(childResult.exitCode);
+  }
+}
@@ -6,9 +6,9 @@
 
 import fs from 'fs';
 import path from 'path';
+import crypto from 'crypto';
 import { execSync } from 'child_process';
 import { fileURLToPath } from 'url';
-import { spawn } from "child_process";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -162,8 +162,6 @@ const finalTranslations = [
   ["          Print version", "          打印版本"],
   
   // 选项值和可能的值
-  ["[possible values: read-only, workspace-write, danger-full-access]", "[可能的值：只读, 工作区写入, 危险-完全访问]"],
-  ["          [possible values: read-only, workspace-write, danger-full-access]", "          [可能的值：只读, 工作区写入, 危险-完全访问]"],
   ["possible values:", "可能的值："],
   ["Possible values:", "可能的值："],
   ["          Possible values:", "          可能的值："],
@@ -176,28 +174,28 @@ const finalTranslations = [
   ["never", "从不"],
   
   // 详细的批准策略说明
-  ["- untrusted:  Only run \"trusted\" commands (e.g. ls, cat, sed) without asking for user", "- 不受信任：仅运行 \"受信任\"的命令（如 ls、cat、sed）而不询问用户"],
-  ["          - untrusted:  Only run \"trusted\" commands (e.g. ls, cat, sed) without asking for user", "          - 不受信任：仅运行 \"受信任\"的命令（如 ls、cat、sed）而不询问用户"],
+  ["- untrusted:  Only run \"trusted\" commands (e.g. ls, cat, sed) without asking for user", "- untrusted：仅运行 \"受信任\"的命令（如 ls、cat、sed）而不询问用户"],
+  ["          - untrusted:  Only run \"trusted\" commands (e.g. ls, cat, sed) without asking for user", "          - untrusted：仅运行 \"受信任\"的命令（如 ls、cat、sed）而不询问用户"],
   ["approval. Will escalate to the user if the model proposes a command that is not in the", "批准。如果模型提出不在"],
   ["            approval. Will escalate to the user if the model proposes a command that is not in the", "            批准。如果模型提出不在"],
   ["\"trusted\" set", "\"受信任\"集合中的命令，将升级给用户"],
   ["            \"trusted\" set", "            \"受信任\"集合中的命令，将升级给用户"],
-  ["- on-failure: Run all commands without asking for user approval. Only asks for approval if", "- 失败时：运行所有命令而不询问用户批准。仅在以下情况下询问批准："],
-  ["          - on-failure: Run all commands without asking for user approval. Only asks for approval if", "          - 失败时：运行所有命令而不询问用户批准。仅在以下情况下询问批准："],
+  ["- on-failure: Run all commands without asking for user approval. Only asks for approval if", "- on-failure：运行所有命令而不询问用户批准。仅在以下情况下询问批准："],
+  ["          - on-failure: Run all commands without asking for user approval. Only asks for approval if", "          - on-failure：运行所有命令而不询问用户批准。仅在以下情况下询问批准："],
   ["a command fails to execute, in which case it will escalate to the user to ask for", "命令执行失败，在这种情况下将升级给用户询问"],
   ["            a command fails to execute, in which case it will escalate to the user to ask for", "            命令执行失败，在这种情况下将升级给用户询问"],
   ["un-sandboxed execution", "非沙盒执行"],
   ["            un-sandboxed execution", "            非沙盒执行"],
-  ["- on-request: The model decides when to ask the user for approval", "- 按需批准：模型决定何时询问用户批准"],
-  ["          - on-request: The model decides when to ask the user for approval", "          - 按需批准：模型决定何时询问用户批准"],
-  ["- never:      Never ask for user approval Execution failures are immediately returned to", "- 从不：从不询问用户批准，执行失败立即返回给"],
-  ["          - never:      Never ask for user approval Execution failures are immediately returned to", "          - 从不：从不询问用户批准，执行失败立即返回给"],
+  ["- on-request: The model decides when to ask the user for approval", "- on-request：模型决定何时询问用户批准"],
+  ["          - on-request: The model decides when to ask the user for approval", "          - on-request：模型决定何时询问用户批准"],
+  ["- never:      Never ask for user approval Execution failures are immediately returned to", "- never：从不询问用户批准，执行失败立即返回给"],
+  ["          - never:      Never ask for user approval Execution failures are immediately returned to", "          - never：从不询问用户批准，执行失败立即返回给"],
   ["the model", "模型"],
   ["            the model", "            模型"],
   
   // 其他选项说明
-  ["Convenience alias for low-friction sandboxed automatic execution (-a on-failure, --sandbox", "低摩擦沙盒自动执行的便利别名（-a 失败时，--sandbox"],
-  ["          Convenience alias for low-friction sandboxed automatic execution (-a on-failure, --sandbox", "          低摩擦沙盒自动执行的便利别名（-a 失败时，--sandbox"],
+  ["Convenience alias for low-friction sandboxed automatic execution (-a on-failure, --sandbox", "低摩擦沙盒自动执行的便利别名（-a on-failure，--sandbox"],
+  ["          Convenience alias for low-friction sandboxed automatic execution (-a on-failure, --sandbox", "          低摩擦沙盒自动执行的便利别名（-a on-failure，--sandbox"],
   ["workspace-write)", "工作区写入）"],
   ["          workspace-write)", "          工作区写入）"],
   ["Skip all confirmation prompts and execute commands without sandboxing. EXTREMELY", "跳过所有确认提示并在没有沙盒的情况下执行命令。极其"],
@@ -424,6 +422,13 @@ const finalTranslations = [
   ["Timeout occurred.", "发生超时。"],
   ["Retrying...", "重试中..."],
   ["Maximum retries reached.", "已达到最大重试次数。"],
+  
+  // 带占位符的模板规则：{n} 匹配数字，其他名称匹配不含空白的一段文本
+  ["Retrying in {n}s...", "{n} 秒后重试..."],
+  ["Reconnecting... {n}/{n1}", "重新连接中... {n}/{n1}"],
+  ["{n}% context left", "剩余 {n}% 上下文"],
+  ["Working ({n}s • esc to interrupt)", "工作中（{n} 秒 • 按 esc 中断）"],
+  
   ["Connection established.", "连接已建立。"],
   ["Connection failed.", "连接失败。"],
   ["Disconnecting...", "断开连接中..."],
@@ -436,253 +441,542 @@ function needsTranslation() {
   return args.includes('--help') || args.includes('-h') || args.includes('help') || args.length === 0;
 }
 
-// 最终的文本翻译（去重优化）
-function finalTranslateText(text) {
-  if (!needsTranslation()) {
-    return text;
+// 合并去重后的词典（由 codex-gui-simple/compile_translations.py 生成）
+const COMPILED_TRANSLATIONS_PATH = path.join(__dirname, 'codex-translations-compiled.json');
+
+// 加载基础词典：优先使用编译后的词典，缺失时退回内置翻译表
+// sourceEntries 为合并前的原始条目数，用于统计规范化去除的条目
+function loadBaseTranslations() {
+  try {
+    const compiled = JSON.parse(fs.readFileSync(COMPILED_TRANSLATIONS_PATH, 'utf8'));
+    return {
+      translations: compiled.translations,
+      sourceEntries: compiled.source_entries ?? compiled.translations.length,
+    };
+  } catch {
+    return { translations: finalTranslations, sourceEntries: finalTranslations.length };
   }
-  
-  let result = text;
-  // 按长度排序，优先匹配长字符串，避免部分替换
-  const sortedTranslations = finalTranslations.sort((a, b) => b[0].length - a[0].length);
-  
-  for (const [en, zh] of sortedTranslations) {
-    result = result.split(en).join(zh);
+}
+
+// 按版本划分的翻译包（规则与 codex-gui-simple/translation_packs.py 一致）
+const TRANSLATION_PACKS_DIR = path.join(__dirname, 'translation-packs');
+
+// 语义化版本：主.次.修订[-预发布][+构建信息]，允许前缀 v
+const VERSION_PATTERN = /^v?(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$/;
+
+// 解析语义化版本，格式不正确时返回 null
+function parseVersion(text) {
+  const match = VERSION_PATTERN.exec(String(text).trim());
+  if (!match) {
+    return null;
   }
-  return result;
+  return {
+    core: [Number(match[1]), Number(match[2]), Number(match[3])],
+    prerelease: match[4] ? match[4].split('.') : [],
+  };
 }
 
-// 备份原始文件
-function backupOriginalFiles(codexPath) {
-  const binPath = path.join(codexPath, 'bin');
-  const codexJsPath = path.join(binPath, 'codex.js');
-  const backupJsPath = path.join(binPath, 'codex.original.js');
-  
-  if (fs.existsSync(codexJsPath) && !fs.existsSync(backupJsPath)) {
-    fs.copyFileSync(codexJsPath, backupJsPath);
-    console.log('✅ 已备份原始 codex.js 文件');
+// 比较单个预发布标识：数字按数值比较，且低于字母标识
+function compareIdentifiers(a, b) {
+  const aNumeric = /^\d+$/.test(a);
+  const bNumeric = /^\d+$/.test(b);
+  if (aNumeric && bNumeric) {
+    return Math.sign(Number(a) - Number(b));
   }
+  if (aNumeric !== bNumeric) {
+    return aNumeric ? -1 : 1;
+  }
+  return a === b ? 0 : (a > b ? 1 : -1);
 }
 
-// 创建最终去重汉化版本
-function createFinalDedupLocalizedCodexJs(codexPath) {
-  const binPath = path.join(codexPath, 'bin');
-  const codexJsPath = path.join(binPath, 'codex.js');
-  const backupJsPath = path.join(binPath, 'codex.original.js');
-  
-  if (!fs.existsSync(backupJsPath)) {
-    if (fs.existsSync(codexJsPath)) {
-      fs.copyFileSync(codexJsPath, backupJsPath);
+// 按语义化版本规则比较：预发布版本低于对应的正式版本
+function compareVersions(v1, v2) {
+  const a = parseVersion(v1);
+  const b = parseVersion(v2);
+  if (!a || !b) {
+    throw new Error(`无效的版本号: ${a ? v2 : v1}`);
+  }
+  for (let i = 0; i < 3; i++) {
+    if (a.core[i] !== b.core[i]) {
+      return a.core[i] > b.core[i] ? 1 : -1;
     }
   }
-  
-  const finalDedupLocalizedCodexJs = `#!/usr/bin/env node
-import path from "path";
-import { fileURLToPath } from "url";
-import { spawn } from "child_process";
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
-
-// 最终去重的翻译映射
-const finalTranslations = ${JSON.stringify(finalTranslations, null, 2)};
-
-// 检查是否需要翻译
-function needsTranslation() {
-  const args = process.argv.slice(2);
-  return args.includes('--help') || args.includes('-h') || args.includes('help') || args.length === 0;
+  if (!a.prerelease.length || !b.prerelease.length) {
+    // 没有预发布标识的正式版本更高
+    return Number(!a.prerelease.length) - Number(!b.prerelease.length);
+  }
+  const length = Math.min(a.prerelease.length, b.prerelease.length);
+  for (let i = 0; i < length; i++) {
+    const result = compareIdentifiers(a.prerelease[i], b.prerelease[i]);
+    if (result) {
+      return result;
+    }
+  }
+  return Math.sign(a.prerelease.length - b.prerelease.length);
 }
 
-// 最终的文本翻译（去重优化）
-function finalTranslateText(text) {
-  if (!needsTranslation()) {
-    return text;
+// 读取所有翻译包，返回 Map<版本, 翻译包>
+function loadTranslationPacks() {
+  const packs = new Map();
+  if (!fs.existsSync(TRANSLATION_PACKS_DIR)) {
+    return packs;
   }
-  
-  let result = text;
-  // 按长度排序，优先匹配长字符串，避免部分替换
-  const sortedTranslations = finalTranslations.sort((a, b) => b[0].length - a[0].length);
-  
-  for (const [en, zh] of sortedTranslations) {
-    result = result.split(en).join(zh);
+  for (const name of fs.readdirSync(TRANSLATION_PACKS_DIR).sort()) {
+    if (!name.endsWith('.json')) {
+      continue;
+    }
+    const pack = JSON.parse(fs.readFileSync(path.join(TRANSLATION_PACKS_DIR, name), 'utf8'));
+    if (pack.version !== name.slice(0, -'.json'.length) || !parseVersion(pack.version)) {
+      throw new Error(`翻译包 ${name} 的 version 字段应为与文件名相同的版本号`);
+    }
+    packs.set(pack.version, pack);
   }
-  return result;
+  return packs;
 }
 
-const { platform, arch } = process;
+// 选择不高于 version 的最新翻译包版本；version 无效或早于所有翻译包时返回 null
+function resolvePackVersion(version, versions) {
+  if (!version || !parseVersion(version)) {
+    return null;
+  }
+  let best = null;
+  for (const candidate of versions) {
+    if (compareVersions(candidate, version) <= 0 && (best === null || compareVersions(candidate, best) > 0)) {
+      best = candidate;
+    }
+  }
+  return best;
+}
 
-let targetTriple = null;
-switch (platform) {
-  case "linux":
-  case "android":
-    switch (arch) {
-      case "x64":
-        targetTriple = "x86_64-unknown-linux-musl";
-        break;
-      case "arm64":
-        targetTriple = "aarch64-unknown-linux-musl";
-        break;
-      default:
-        break;
+// 沿 extends 找到继承链，返回从最上层父包到 version 的翻译包列表
+function packChain(packs, version) {
+  const chain = [];
+  const seen = new Set();
+  while (version) {
+    if (seen.has(version)) {
+      throw new Error(`翻译包继承关系存在循环: ${version}`);
     }
-    break;
-  case "darwin":
-    switch (arch) {
-      case "x64":
-        targetTriple = "x86_64-apple-darwin";
-        break;
-      case "arm64":
-        targetTriple = "aarch64-apple-darwin";
-        break;
-      default:
-        break;
+    if (!packs.has(version)) {
+      throw new Error(`找不到翻译包: ${version}`);
     }
-    break;
-  case "win32":
-    switch (arch) {
-      case "x64":
-        targetTriple = "x86_64-pc-windows-msvc.exe";
-        break;
-      case "arm64":
-        targetTriple = "aarch64-pc-windows-msvc.exe";
-        break;
-      default:
-        break;
-    }
-    break;
-  default:
-    break;
+    seen.add(version);
+    chain.push(packs.get(version));
+    version = packs.get(version).extends;
+  }
+  return chain.reverse();
 }
 
-if (!targetTriple) {
-  throw new Error(\`Unsupported platform: \${platform} (\${arch})\`);
+// 依次应用翻译包增量；翻译包的译文排在前面，规范化时优先于父级中的同名短语
+function applyTranslationPacks(translations, chain) {
+  let added = 0;
+  for (const pack of chain) {
+    const overrides = (pack.translations || []).map((entry) => [...entry]);
+    const dropped = new Set(pack.remove || []);
+    for (const [en] of overrides) {
+      dropped.add(en);
+    }
+    translations = overrides.concat(translations.filter(([en]) => !dropped.has(en)));
+    added += overrides.length;
+  }
+  return { translations, added };
 }
 
-const binaryPath = path.join(__dirname, \`codex-\${targetTriple}\`);
-
-async function tryImport(moduleName) {
+// 读取安装目录 package.json 中的版本号，读取失败时返回空字符串
+function readPackageVersion(codexPath) {
   try {
-    return await import(moduleName);
-  } catch (err) {
-    return null;
+    return String(JSON.parse(fs.readFileSync(path.join(codexPath, 'package.json'), 'utf8')).version ?? '');
+  } catch {
+    return '';
   }
 }
 
-async function resolveRgDir() {
-  const ripgrep = await tryImport("@vscode/ripgrep");
-  if (!ripgrep?.rgPath) {
-    return null;
+// 加载注入使用的翻译表：基础词典加上与 Codex CLI 版本对应的翻译包
+function loadRuntimeTranslations(codexVersion) {
+  const base = loadBaseTranslations();
+  const packs = loadTranslationPacks();
+  const pack = resolvePackVersion(codexVersion, [...packs.keys()]);
+  if (!pack) {
+    return { ...base, pack: null };
   }
-  return path.dirname(ripgrep.rgPath);
+  const applied = applyTranslationPacks(base.translations, packChain(packs, pack));
+  return {
+    translations: applied.translations,
+    sourceEntries: base.sourceEntries + applied.added,
+    pack,
+  };
 }
 
-function getUpdatedPath(newDirs) {
-  const pathSep = process.platform === "win32" ? ";" : ":";
-  const existingPath = process.env.PATH || "";
-  const updatedPath = [
-    ...newDirs,
-    ...existingPath.split(pathSep).filter(Boolean),
-  ].join(pathSep);
-  return updatedPath;
+// 行尾标点及其在译文中可接受的写法（半角/全角）
+const TRAILING_PUNCTUATION = {
+  '.': ['.', '。'],
+  ':': [':', '：'],
+  ';': [';', '；'],
+  ',': [',', '，'],
+  '!': ['!', '！'],
+  '?': ['?', '？'],
+  ')': [')', '）'],
+};
+
+// 去掉键首尾的空白；译文带有相同空白时一并去掉，匹配时原文的缩进会原样保留
+function trimPhrase(en, zh) {
+  let key = en.trimStart();
+  const indent = en.slice(0, en.length - key.length);
+  if (indent) {
+    zh = zh.startsWith(indent) ? zh.slice(indent.length) : zh.trimStart();
+  }
+  const trimmed = key.trimEnd();
+  const tail = key.slice(trimmed.length);
+  if (tail) {
+    zh = zh.endsWith(tail) ? zh.slice(0, zh.length - tail.length) : zh.trimEnd();
+  }
+  return [trimmed, zh];
 }
 
-const additionalDirs = [];
-const rgDir = await resolveRgDir();
-if (rgDir) {
-  additionalDirs.push(rgDir);
+// 规范化翻译表：按去掉缩进和行尾标点后的短语去重
+// 匹配短语核心时，原文的缩进和行尾标点保留在匹配范围之外，不需要单独的条目
+function normalizeTranslations(translations) {
+  const phrases = new Map();
+  for (const [en, zh, ...scope] of translations) {
+    const [key, value] = trimPhrase(en, zh);
+    if (key && !phrases.has(key)) {
+      phrases.set(key, { value, scope });
+    }
+  }
+  
+  const normalized = [];
+  for (const [key, { value, scope }] of phrases) {
+    const accepted = TRAILING_PUNCTUATION[key[key.length - 1]];
+    const shorter = phrases.get(key.slice(0, -1));
+    if (key.length > 1 && accepted && accepted.includes(value[value.length - 1]) &&
+        shorter?.value === value.slice(0, -1)) {
+      // 去掉标点后与已有短语完全相同，由该短语（及其作用域）覆盖
+      continue;
+    }
+    normalized.push([key, value, ...scope]);
+  }
+  return { translations: normalized, removed: translations.length - normalized.length };
 }
-const updatedPath = getUpdatedPath(additionalDirs);
 
-// 对于需要翻译的命令，进行最终翻译处理
-if (needsTranslation()) {
-  const child = spawn(binaryPath, process.argv.slice(2), {
-    stdio: ["inherit", "pipe", "pipe"],
-    env: { ...process.env, PATH: updatedPath, CODEX_MANAGED_BY_NPM: "1" },
-  });
+// 短语作用域条件的编码（与 codex-gui-simple/translation_engine.py 一致）
+const SCOPE_FLAGS = { 'word': 1, 'line-start': 2, 'no-section': 4 };
+const SCOPE_SECTION_SHIFT = 3;
 
-  child.on("error", (err) => {
-    console.error(err);
-    process.exit(1);
-  });
+// 把作用域条件列表编码为整数，section:名称 按首次出现的顺序编号（从 1 开始）
+function scopeCode(conditions, sections) {
+  let code = 0;
+  for (const condition of conditions) {
+    if (SCOPE_FLAGS[condition]) {
+      code |= SCOPE_FLAGS[condition];
+    } else if (condition.startsWith('section:') && condition.length > 8) {
+      const name = condition.slice(8);
+      if (!sections.includes(name)) {
+        sections.push(name);
+      }
+      code |= (sections.indexOf(name) + 1) << SCOPE_SECTION_SHIFT;
+    } else {
+      throw new Error(`未知的作用域条件: ${condition}`);
+    }
+  }
+  return code;
+}
 
-  // 实时翻译输出
-  child.stdout.on('data', (data) => {
-    const text = data.toString('utf8');
-    const translated = finalTranslateText(text);
-    process.stdout.write(translated);
-  });
-  
-  child.stderr.on('data', (data) => {
-    const text = data.toString('utf8');
-    const translated = finalTranslateText(text);
-    process.stderr.write(translated);
-  });
+// 模板规则的占位符：{n}、{n1} 等匹配数字，其他名称匹配不含空白的一段文本（与 translation_engine.py 一致）
+const PLACEHOLDER = /\{([a-z][a-z0-9_]*)\}/g;
+const NUMBER_PLACEHOLDER = /^n[0-9]*$/;
+const NUMBER_PATTERN = '([0-9]+(?:\\.[0-9]+)?)';
+const TOKEN_PATTERN = '([^ \\t\\r\\n]+?)';
+const TRAILING_TOKEN_PATTERN = '([^ \\t\\r\\n]+)';
+const REGEX_SPECIAL = new Set('\\^$.|?*+()[]{}/-');
 
-  child.on('close', (code) => {
-    process.exit(code || 0);
-  });
+function isTemplate(en) {
+  return en.search(PLACEHOLDER) !== -1;
+}
 
-  const forwardSignal = (signal) => {
-    if (child.killed) {
-      return;
+function escapePattern(text) {
+  return [...text].map((ch) => (REGEX_SPECIAL.has(ch) ? '\\' + ch : ch)).join('');
+}
+
+// 把模板编译为正则表达式片段，返回 { prefix: 开头的文字, pattern, names: 占位符名称 }
+function templatePattern(en) {
+  if (en.includes('\n')) {
+    throw new Error(`模板规则不能跨行: ${en}`);
+  }
+  const parts = [];
+  const names = [];
+  let last = 0;
+  for (const match of en.matchAll(PLACEHOLDER)) {
+    const name = match[1];
+    const end = match.index + match[0].length;
+    parts.push(escapePattern(en.slice(last, match.index)));
+    if (NUMBER_PLACEHOLDER.test(name)) {
+      parts.push(NUMBER_PATTERN);
+    } else {
+      parts.push(end === en.length ? TRAILING_TOKEN_PATTERN : TOKEN_PATTERN);
     }
-    try {
-      child.kill(signal);
-    } catch {
-      /* ignore */
+    names.push(name);
+    last = end;
+  }
+  parts.push(escapePattern(en.slice(last)));
+  const prefix = en.slice(0, en.search(PLACEHOLDER));
+  if (!prefix && !NUMBER_PLACEHOLDER.test(names[0])) {
+    throw new Error(`模板规则必须以文字或数字占位符开头: ${en}`);
+  }
+  return { prefix, pattern: parts.join(''), names };
+}
+
+// 将翻译映射编译为最长匹配字典树（构建时只执行一次）
+// 序列化格式：nodes[i] = [译文下标或-1, 边标签, 子节点下标, 边标签, 子节点下标, ...]
+// scopes[k] 为第 k 条译文的作用域编码，sections 为作用域中的帮助段落名称；
+// 带占位符的模板规则挂在开头文字对应的节点上（以数字开头时挂在每个数字对应的节点上），
+// rules 中每项为 [节点下标, 合并后的表达式, 译文下标, ...]（较长的模板在前），
+// templates 中每项为 [译文下标, 模板, 单条模板的表达式]，生成译文时用于取出占位符的值
+// 单分支链压缩为一条边；节点按广度优先编号、边按首码点排序，保证与 Python 参考实现输出一致
+function compileTranslationTrie(translations) {
+  const root = { value: -1, children: new Map(), rules: null };
+  const values = [];
+  const scopes = [];
+  const sections = [];
+  const templates = [];
+  const seenTemplates = new Set();
+  
+  const walk = (node, text) => {
+    for (const ch of text) {
+      const cp = ch.codePointAt(0);
+      let next = node.children.get(cp);
+      if (!next) {
+        next = { value: -1, children: new Map(), rules: null };
+        node.children.set(cp, next);
+      }
+      node = next;
     }
+    return node;
   };
+  
+  for (const [en, zh, scope] of translations) {
+    if (!en) {
+      continue;
+    }
+    if (isTemplate(en)) {
+      if (seenTemplates.has(en)) {
+        continue;
+      }
+      seenTemplates.add(en);
+      const value = values.length;
+      values.push(zh);
+      scopes.push(scopeCode(scope || [], sections));
+      const { prefix, pattern } = templatePattern(en);
+      templates.push([value, en, pattern]);
+      const targets = prefix ? [walk(root, prefix)] : [...'0123456789'].map((digit) => walk(root, digit));
+      for (const target of targets) {
+        (target.rules ||= []).push([value, en]);
+      }
+      continue;
+    }
+    const node = walk(root, en);
+    // 重复的键保留首次出现的翻译
+    if (node.value === -1) {
+      node.value = values.length;
+      values.push(zh);
+      scopes.push(scopeCode(scope || [], sections));
+    }
+  }
+  
+  const nodes = [];
+  const rules = [];
+  const queue = [root];
+  for (let head = 0; head < queue.length; head++) {
+    const node = queue[head];
+    const packed = [node.value];
+    if (node.rules) {
+      const pattern = node.rules.map(([, en]) => `(${templatePattern(en).pattern})`).join('|');
+      rules.push([head, pattern, ...node.rules.map(([value]) => value)]);
+    }
+    const codePoints = [...node.children.keys()].sort((a, b) => a - b);
+    for (const cp of codePoints) {
+      // 连续只有一个子节点、且不是词尾或模板规则挂载点的节点合并为一条边
+      let label = String.fromCodePoint(cp);
+      let child = node.children.get(cp);
+      while (child.value === -1 && !child.rules && child.children.size === 1) {
+        const [[nextCp, next]] = child.children;
+        label += String.fromCodePoint(nextCp);
+        child = next;
+      }
+      packed.push(label, queue.length);
+      queue.push(child);
+    }
+    nodes.push(packed);
+  }
+  
+  return { values, scopes, sections, rules, templates, nodes };
+}
 
-  ["SIGINT", "SIGTERM", "SIGHUP"].forEach((sig) => {
-    process.on(sig, () => forwardSignal(sig));
-  });
-} else {
-  // 非翻译命令，完全透明传递
-  const child = spawn(binaryPath, process.argv.slice(2), {
-    stdio: "inherit",
-    env: { ...process.env, PATH: updatedPath, CODEX_MANAGED_BY_NPM: "1" },
-  });
+// 预编译翻译数据文件（与 codex.original.js 放在同一目录）
+const TRANSLATION_ARTIFACT_NAME = 'codex-zh-translations.json';
+const TRANSLATION_ARTIFACT_FORMAT = 'codex-zh-trie';
+const TRANSLATION_ARTIFACT_VERSION = 3;
 
-  child.on("error", (err) => {
-    console.error(err);
-    process.exit(1);
-  });
+// 生成带格式版本和内容哈希的紧凑翻译数据
+function buildTranslationArtifact(translations, stats) {
+  const compiled = compileTranslationTrie(translations);
+  const hash = crypto.createHash('sha256')
+    .update(JSON.stringify(compiled))
+    .digest('hex')
+    .slice(0, 16);
+  return {
+    format: TRANSLATION_ARTIFACT_FORMAT,
+    version: TRANSLATION_ARTIFACT_VERSION,
+    hash,
+    stats,
+    values: compiled.values,
+    scopes: compiled.scopes,
+    sections: compiled.sections,
+    rules: compiled.rules,
+    templates: compiled.templates,
+    nodes: compiled.nodes,
+  };
+}
+
+// 包装脚本模板（与 codex-gui-simple/codex_patcher.py 共用）
+const WRAPPER_TEMPLATE_PATH = path.join(__dirname, 'codex-wrapper.template.js');
+
+// 生成的 codex.js 开头记录输入指纹，模板和词典都未变化时跳过重新生成
+const FINGERPRINT_PATTERN = /codex-zh-fingerprint: ([0-9a-f]{16})/;
+const FINGERPRINT_HEADER_BYTES = 512;
+
+// 计算模板和词典的指纹（与 codex_patcher.py 的 compute_fingerprint 一致）
+function computeFingerprint(template, runtime) {
+  return crypto.createHash('sha256')
+    .update(template)
+    .update('\n')
+    .update(`${TRANSLATION_ARTIFACT_FORMAT}/${TRANSLATION_ARTIFACT_VERSION}`)
+    .update('\n')
+    .update(JSON.stringify({ sourceEntries: runtime.sourceEntries, pack: runtime.pack, translations: runtime.translations }))
+    .digest('hex')
+    .slice(0, 16);
+}
+
+// 读取已安装 codex.js 开头的指纹，不是汉化版时返回 null
+function readInstalledFingerprint(codexJsPath) {
+  let fd;
+  try {
+    fd = fs.openSync(codexJsPath, 'r');
+    const buffer = Buffer.alloc(FINGERPRINT_HEADER_BYTES);
+    const size = fs.readSync(fd, buffer, 0, buffer.length, 0);
+    const match = FINGERPRINT_PATTERN.exec(buffer.toString('utf8', 0, size));
+    return match ? match[1] : null;
+  } catch {
+    return null;
+  } finally {
+    if (fd !== undefined) {
+      fs.closeSync(fd);
+    }
+  }
+}
 
-  const forwardSignal = (signal) => {
-    if (child.killed) {
-      return;
+// 用翻译数据的信息填充包装脚本模板
+function renderWrapperTemplate(template, artifact, fingerprint) {
+  return template
+    .replaceAll('__CODEX_ZH_FINGERPRINT__', fingerprint)
+    .replaceAll('__CODEX_ZH_ARTIFACT_NAME__', TRANSLATION_ARTIFACT_NAME)
+    .replaceAll('__CODEX_ZH_ARTIFACT_FORMAT__', TRANSLATION_ARTIFACT_FORMAT)
+    .replaceAll('__CODEX_ZH_ARTIFACT_VERSION__', String(TRANSLATION_ARTIFACT_VERSION))
+    .replaceAll('__CODEX_ZH_ARTIFACT_HASH__', artifact.hash);
+}
+
+// 原子写入：先写同目录的临时文件并刷盘，再重命名覆盖
+// 崩溃或并发启动 codex 时只会看到旧文件或新文件，不会读到写了一半的文件
+function writeFileAtomic(filePath, data, mode) {
+  if (mode === undefined) {
+    try {
+      mode = fs.statSync(filePath).mode & 0o777;
+    } catch {
+      mode = 0o644;
+    }
+  }
+  const tmpPath = `${filePath}.${process.pid}.tmp`;
+  try {
+    const fd = fs.openSync(tmpPath, 'w', mode);
+    try {
+      fs.writeFileSync(fd, data);
+      fs.fsyncSync(fd);
+    } finally {
+      fs.closeSync(fd);
     }
+    fs.chmodSync(tmpPath, mode);
+    fs.renameSync(tmpPath, filePath);
+  } catch (error) {
     try {
-      child.kill(signal);
+      fs.unlinkSync(tmpPath);
     } catch {
       /* ignore */
     }
-  };
-
-  ["SIGINT", "SIGTERM", "SIGHUP"].forEach((sig) => {
-    process.on(sig, () => forwardSignal(sig));
-  });
-
-  const childResult = await new Promise((resolve) => {
-    child.on("exit", (code, signal) => {
-      if (signal) {
-        resolve({ type: "signal", signal });
-      } else {
-        resolve({ type: "code", exitCode: code ?? 1 });
-      }
-    });
-  });
+    throw error;
+  }
+  
+  // 刷新目录项，确保重命名本身落盘（Windows 不支持，忽略）
+  try {
+    const dirFd = fs.openSync(path.dirname(filePath), 'r');
+    try {
+      fs.fsyncSync(dirFd);
+    } finally {
+      fs.closeSync(dirFd);
+    }
+  } catch {
+    /* ignore */
+  }
+}
 
-  if (childResult.type === "signal") {
-    process.kill(process.pid, childResult.signal);
-  } else {
-    process.exit(childResult.exitCode);
+// 备份原始文件（已经是汉化版的 codex.js 不会被当作原版备份）
+function backupOriginalFiles(codexPath) {
+  const binPath = path.join(codexPath, 'bin');
+  const codexJsPath = path.join(binPath, 'codex.js');
+  const backupJsPath = path.join(binPath, 'codex.original.js');
+  
+  if (fs.existsSync(codexJsPath) && !fs.existsSync(backupJsPath) && !readInstalledFingerprint(codexJsPath)) {
+    writeFileAtomic(backupJsPath, fs.readFileSync(codexJsPath), fs.statSync(codexJsPath).mode & 0o777);
+    console.log('✅ 已备份原始 codex.js 文件');
   }
 }
-`;
+
+// 创建最终去重汉化版本；模板和词典都未变化时跳过，返回是否重新生成
+function createFinalDedupLocalizedCodexJs(codexPath, options = {}) {
+  const binPath = path.join(codexPath, 'bin');
+  const codexJsPath = path.join(binPath, 'codex.js');
+  const backupJsPath = path.join(binPath, 'codex.original.js');
+  const artifactPath = path.join(binPath, TRANSLATION_ARTIFACT_NAME);
   
-  fs.writeFileSync(codexJsPath, finalDedupLocalizedCodexJs);
-  console.log('✅ 已创建最终去重汉化版本的 codex.js');
+  backupOriginalFiles(codexPath);
+  
+  const template = fs.readFileSync(WRAPPER_TEMPLATE_PATH, 'utf8');
+  const runtime = loadRuntimeTranslations(readPackageVersion(codexPath));
+  const fingerprint = computeFingerprint(template, runtime);
+  if (
+    !options.force &&
+    readInstalledFingerprint(codexJsPath) === fingerprint &&
+    fs.existsSync(artifactPath) &&
+    fs.existsSync(backupJsPath)
+  ) {
+    console.log(`✅ 汉化已是最新（指纹 ${fingerprint}），无需重新生成`);
+    return false;
+  }
+  
+  const normalized = normalizeTranslations(runtime.translations);
+  const phrases = normalized.translations.length;
+  const artifact = buildTranslationArtifact(normalized.translations, {
+    sourceEntries: runtime.sourceEntries,
+    phrases,
+    removed: runtime.sourceEntries - phrases,
+    pack: runtime.pack,
+  });
+  console.log('📦 翻译包:', runtime.pack || '无（仅使用基础词典）');
+  console.log(`📉 词典规范化: ${runtime.sourceEntries} 条 → ${phrases} 个唯一短语（去除 ${runtime.sourceEntries - phrases} 条）`);
+  // 先写翻译数据再替换 codex.js，新的 codex.js 生效时它引用的数据已经就位
+  writeFileAtomic(artifactPath, JSON.stringify(artifact), 0o644);
+  console.log('✅ 已生成预编译翻译数据:', TRANSLATION_ARTIFACT_NAME, `(${artifact.hash})`);
+  
+  writeFileAtomic(codexJsPath, renderWrapperTemplate(template, artifact, fingerprint));
+  console.log('✅ 已创建最终去重汉化版本的 codex.js', `(指纹 ${fingerprint})`);
+  return true;
 }
 
 // 恢复原始文件
@@ -691,10 +985,125 @@ function restoreOriginalFiles(codexPath) {
   const codexJsPath = path.join(binPath, 'codex.js');
   const backupJsPath = path.join(binPath, 'codex.original.js');
   
+  const artifactPath = path.join(binPath, TRANSLATION_ARTIFACT_NAME);
+  
   if (fs.existsSync(backupJsPath)) {
-    fs.copyFileSync(backupJsPath, codexJsPath);
+    writeFileAtomic(codexJsPath, fs.readFileSync(backupJsPath));
     console.log('✅ 已恢复原始 codex.js 文件');
   }
+  if (fs.existsSync(artifactPath)) {
+    fs.unlinkSync(artifactPath);
+    console.log('✅ 已删除预编译翻译数据');
+  }
+}
+
+// 快速启动器模板（与 codex-gui-simple/codex_patcher.py 共用）
+const LAUNCHER_TEMPLATE_PATH = path.join(__dirname, 'codex-launcher.template.sh');
+const LAUNCHER_NAME = 'codex-zh-launcher';
+
+// 快速启动器只支持 Linux：原生二进制文件名与 codex.js 选择的目标三元组一致
+const LAUNCHER_TRIPLES = {
+  x64: 'x86_64-unknown-linux-musl',
+  arm64: 'aarch64-unknown-linux-musl',
+};
+
+function getLauncherTriple() {
+  return process.platform === 'linux' ? LAUNCHER_TRIPLES[process.arch] || null : null;
+}
+
+// npm 全局安装时在 <前缀>/bin/codex 创建指向 bin/codex.js 的符号链接
+function getBinLinkPath(codexPath) {
+  return path.resolve(codexPath, '..', '..', '..', '..', 'bin', 'codex');
+}
+
+function realpathOrNull(filePath) {
+  try {
+    return fs.realpathSync(filePath);
+  } catch {
+    return null;
+  }
+}
+
+// 读取符号链接最终指向的文件，不是符号链接时返回 null
+function readBinLink(linkPath) {
+  try {
+    return fs.lstatSync(linkPath).isSymbolicLink() ? fs.realpathSync(linkPath) : null;
+  } catch {
+    return null;
+  }
+}
+
+// 原子地把符号链接改为指向 target（相对路径，与 npm 创建的链接形式相同）
+function pointBinLink(linkPath, target) {
+  const tmpPath = `${linkPath}.${process.pid}.tmp`;
+  fs.symlinkSync(path.relative(path.dirname(linkPath), target), tmpPath);
+  try {
+    fs.renameSync(tmpPath, linkPath);
+  } catch (error) {
+    try {
+      fs.unlinkSync(tmpPath);
+    } catch {
+      /* ignore */
+    }
+    throw error;
+  }
+}
+
+// 用安装路径填充快速启动器模板（路径放在 sh 单引号中）
+function renderLauncherTemplate(template, binPath, triple) {
+  return template
+    .replaceAll('__CODEX_ZH_BIN_DIR__', binPath.replaceAll("'", "'\\''"))
+    .replaceAll('__CODEX_ZH_TARGET_TRIPLE__', triple);
+}
+
+// 安装快速启动器：不需要翻译的命令由启动器直接 exec 原生二进制文件，返回是否已安装
+function installLauncher(codexPath) {
+  const triple = getLauncherTriple();
+  if (!triple) {
+    console.log(`⚠️ 快速启动器只支持 Linux x64/arm64，当前为 ${process.platform} ${process.arch}，已跳过`);
+    return false;
+  }
+  const binPath = path.join(codexPath, 'bin');
+  if (!fs.existsSync(path.join(binPath, `codex-${triple}`))) {
+    console.log(`⚠️ 未找到原生二进制文件 codex-${triple}，已跳过快速启动器`);
+    return false;
+  }
+  const launcherPath = path.join(binPath, LAUNCHER_NAME);
+  const linkPath = getBinLinkPath(codexPath);
+  const current = readBinLink(linkPath);
+  if (!current || (current !== realpathOrNull(path.join(binPath, 'codex.js')) && current !== realpathOrNull(launcherPath))) {
+    console.log(`⚠️ ${linkPath} 不是指向 codex.js 的符号链接，已跳过快速启动器`);
+    return false;
+  }
+  
+  const template = fs.readFileSync(LAUNCHER_TEMPLATE_PATH, 'utf8');
+  writeFileAtomic(launcherPath, renderLauncherTemplate(template, binPath, triple), 0o755);
+  if (current !== realpathOrNull(launcherPath)) {
+    pointBinLink(linkPath, launcherPath);
+  }
+  console.log('✅ 已安装快速启动器:', linkPath, '→', LAUNCHER_NAME);
+  return true;
+}
+
+// 删除快速启动器，符号链接改回指向 codex.js
+function removeLauncher(codexPath) {
+  const binPath = path.join(codexPath, 'bin');
+  const launcherPath = path.join(binPath, LAUNCHER_NAME);
+  if (!fs.existsSync(launcherPath)) {
+    return;
+  }
+  const linkPath = getBinLinkPath(codexPath);
+  if (readBinLink(linkPath) === realpathOrNull(launcherPath)) {
+    pointBinLink(linkPath, path.join(binPath, 'codex.js'));
+  }
+  fs.unlinkSync(launcherPath);
+  console.log('✅ 已删除快速启动器');
+}
+
+// 快速启动器是否已安装并生效
+function isLauncherInstalled(codexPath) {
+  const launcherPath = path.join(codexPath, 'bin', LAUNCHER_NAME);
+  return fs.existsSync(launcherPath) && readBinLink(getBinLinkPath(codexPath)) === realpathOrNull(launcherPath);
 }
 
 // 主函数
@@ -710,8 +1119,13 @@ function main() {
       console.log('🚀 开始注入最终去重版中文汉化...');
       console.log('🔄 已去除重复翻译条目，优化性能');
       console.log('📋 包含所有用户界面文本的翻译，包括交互命令');
-      backupOriginalFiles(codexPath);
-      createFinalDedupLocalizedCodexJs(codexPath);
+      const updated = createFinalDedupLocalizedCodexJs(codexPath, { force: args.includes('--force') });
+      if (args.includes('--launcher')) {
+        installLauncher(codexPath);
+      }
+      if (!updated) {
+        break;
+      }
       console.log('🎉 最终去重版中文汉化注入完成！');
       console.log('💡 现在可以运行 codex --help 查看完整汉化效果');
       console.log('💡 可以测试交互命令：/model /approvals /review /new /init /compact /diff /mention /status /mcp /logout');
@@ -719,6 +1133,7 @@ function main() {
       
     case 'restore':
       console.log('🔄 恢复原始文件...');
+      removeLauncher(codexPath);
       restoreOriginalFiles(codexPath);
       console.log('✅ 已恢复原始文件');
       break;
@@ -726,18 +1141,25 @@ function main() {
     case 'status':
       const binPath = path.join(codexPath, 'bin');
       const hasBackup = fs.existsSync(path.join(binPath, 'codex.original.js'));
+      const hasArtifact = fs.existsSync(path.join(binPath, TRANSLATION_ARTIFACT_NAME));
       
       console.log('📊 汉化状态:');
       console.log('  备份文件:', hasBackup ? '✅ 存在' : '❌ 不存在');
+      console.log('  翻译数据:', hasArtifact ? '✅ 存在' : '❌ 不存在');
+      console.log('  快速启动器:', isLauncherInstalled(codexPath) ? '✅ 已启用' : '❌ 未启用');
       console.log('  汉化类型: 最终去重版本');
-      console.log('  翻译数量:', finalTranslations.length, '条');
+      const runtime = loadRuntimeTranslations(readPackageVersion(codexPath));
+      console.log('  翻译包:', runtime.pack || '无（仅使用基础词典）');
+      const normalized = normalizeTranslations(runtime.translations);
+      console.log('  翻译数量:', normalized.translations.length, '个唯一短语（原始', runtime.sourceEntries, '条）');
       console.log('  特点: 去除重复条目，优化性能');
       break;
       
     default:
-      console.log('用法: node inject-chinese-final-dedup.js [inject|restore|status]');
-      console.log('  inject  - 注入最终去重版中文汉化（默认）');
-      console.log('  restore - 恢复原始文件');
+      console.log('用法: node inject-chinese-final-dedup.js [inject|restore|status] [--force] [--launcher]');
+      console.log('  inject  - 注入最终去重版中文汉化（默认，已是最新时跳过，--force 强制重新生成）');
+      console.log('            --launcher 同时安装快速启动器（仅 Linux），不需要翻译的命令不再启动 Node.js');
+      console.log('  restore - 恢复原始文件（同时删除快速启动器）');
       console.log('  status  - 查看汉化状态');
       break;
   }